@@ -1,61 +1,192 @@
-from flask import Flask, render_template_string, request, session, redirect, url_for
+import click
 import json
+from flask import (Flask, Response, abort, jsonify, render_template, request, session, redirect,
+                   stream_with_context, url_for)
 import os
+import queue
 import random
+from collections import OrderedDict
 from datetime import timedelta
 import secrets
+import threading
+import time
 
-app = Flask(__name__)
-# Generar una clave secreta fuerte para la sesión
-app.secret_key = secrets.token_hex(16)
+from locales import LocaleCatalogs
+import catalog_import
+from catalog_manifest import StaleCatalogError
+from catalog_pack import build_pack, pack_path
+from text_index import NEAR_DUPLICATE_THRESHOLD, TextIndex, leaks
+import hint_scores
+import deck
+import round_seed
+import round_bundle
+import large_rounds
+from history import HistoryStore
+import static_assets
+from rooms import DROPPED_EVENT, RoomChanged, RoomError, RoomHub, format_sse
+from metrics import Metrics
+from ratelimit import RateLimiter, parse_rules
+from compression import CachedPage, Compressor
+import profiling
+from sessions import MemorySessionBackend, create_backend, create_session_interface
+
+# Los estáticos los sirve la ruta /static/<archivo con huella> (ver static_assets.py)
+app = Flask(__name__, static_folder=None)
+# Generar una clave secreta fuerte para la sesión. Con varios procesos todos deben usar la misma
+# (UNDERCOVER_SECRET_KEY): también deriva las rondas a partir de su semilla (ver round_seed.py)
+app.secret_key = os.environ.get('UNDERCOVER_SECRET_KEY') or secrets.token_hex(16)
 app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(hours=2)
+# El estado de la ronda se guarda en el servidor y la cookie sólo lleva un id (ver sessions.py).
+# 'memory' sirve para un solo proceso, 'sqlite' para varios procesos y 'cookie' usa la cookie firmada de Flask
+app.config['SESSION_BACKEND'] = os.environ.get('UNDERCOVER_SESSION_BACKEND', 'memory')
+app.session_interface = create_session_interface(app)
+# Token para los endpoints de administración (Authorization: Bearer ...); sin token quedan desactivados
+app.config['ADMIN_TOKEN'] = os.environ.get('UNDERCOVER_ADMIN_TOKEN')
+# Rondas creadas por la API JSON: mismo almacén que las sesiones (o uno en memoria si se usa la cookie)
+round_store = create_backend(app) or MemorySessionBackend()
+
+# Directorio para archivos JSON de categorías: una subcarpeta por idioma (categorias/es, categorias/en...)
+CATEGORIES_DIR = os.environ.get('UNDERCOVER_CATEGORIES_DIR', 'categorias')
+# Idioma que se carga al arrancar y que se usa si no se pide otro (ver locales.py)
+DEFAULT_LOCALE = os.environ.get('UNDERCOVER_DEFAULT_LOCALE', 'es')
+# Cada cuántos segundos, como mucho, se revisa si cambió algún JSON
+CATALOG_CHECK_INTERVAL = 2.0
+# Con cientos de categorías: al arrancar sólo se leen las cabeceras y las palabras se
+# cargan al sortearlas, con una caché limitada a CATALOG_CACHE_MB (ver catalog_manifest.py)
+CATALOG_LAZY = os.environ.get('UNDERCOVER_CATALOG_LAZY', '0') == '1'
+CATALOG_CACHE_MB = int(os.environ.get('UNDERCOVER_CATALOG_CACHE_MB', '64'))
+
+# Un catálogo por idioma, compartido por todo el proceso: el idioma por defecto se carga al
+# arrancar, los demás al pedirlos por primera vez, y después sólo se recargan los archivos
+# que cambiaron (ver locales.py y catalog.py)
+locales = LocaleCatalogs(CATEGORIES_DIR, DEFAULT_LOCALE, check_interval=CATALOG_CHECK_INTERVAL,
+                         lazy=CATALOG_LAZY, cache_budget=CATALOG_CACHE_MB * 1024 * 1024)
+default_shard = locales.shard()
+# Catálogo y pistas del idioma por defecto (los que usan los comandos sin --locale)
+catalog = default_shard.catalog
+# Pistas separadas por dificultad, calculadas con `flask score-hints` (ver hint_scores.py)
+hint_bands = default_shard.hint_bands
+
+# Métricas por ruta y por fase interna, expuestas en /metrics (ver metrics.py)
+metrics = Metrics()
+metrics.init_app(app)
+
+def _catalog_metrics():
+    shards = sorted(locales.loaded().items())
+
+    def per_locale(value):
+        return [((('locale', locale),), value(shard.catalog)) for locale, shard in shards]
+
+    yield ('undercover_catalog_reloads_total', 'counter', 'Recargas del catálogo',
+           per_locale(lambda c: c.reload_count))
+    yield ('undercover_catalog_parse_errors_total', 'counter', 'Archivos JSON de categorías con errores',
+           per_locale(lambda c: c.parse_errors))
+    yield ('undercover_catalog_version', 'gauge', 'Versión del catálogo en memoria',
+           per_locale(lambda c: c.current.version))
+    yield ('undercover_catalog_categories', 'gauge', 'Categorías cargadas',
+           per_locale(lambda c: len(c.current.categories)))
+    yield ('undercover_catalog_words', 'gauge', 'Palabras cargadas', per_locale(lambda c: c.current.word_count))
+    yield ('undercover_catalog_load_seconds', 'gauge', 'Duración de la última recarga del catálogo',
+           per_locale(lambda c: f'{c.current.load_time:.6f}'))
+    if locales.cache is not None:
+        cache = locales.cache
+        yield ('undercover_catalog_cache_lookups_total', 'counter', 'Búsquedas en la caché de categorías',
+               [((('result', 'hit'),), cache.hits), ((('result', 'miss'),), cache.misses)])
+        yield ('undercover_catalog_cache_evictions_total', 'counter', 'Categorías expulsadas de la caché',
+               [((), cache.evictions)])
+        yield ('undercover_catalog_cache_bytes', 'gauge', 'Memoria estimada de las categorías en caché',
+               [((), cache.used_bytes)])
+
+metrics.register_collector(_catalog_metrics)
 
-# Directorio para archivos JSON de categorías
-CATEGORIES_DIR = 'categorias'
+# Límite de peticiones por IP y por sesión en las rutas caras (ver ratelimit.py).
+# Formato: 'MÉTODO /ruta=N/S, ...' (ráfagas de N peticiones, N nuevas cada S segundos); vacío lo desactiva
+app.config['RATE_LIMITS'] = parse_rules(os.environ.get(
+    'UNDERCOVER_RATE_LIMITS',
+    'POST /setup=20/60, POST /api/v1/rounds=30/60, POST /api/v1/rounds/batch=5/60, POST /room/new=10/60, '
+    'POST /round/complete=30/60'))
+rate_limiter = RateLimiter()
+rate_limiter.init_app(app, metrics)
+metrics.register_collector(rate_limiter.collect)
+
+# HTML comprimido con gzip/deflate a partir de COMPRESS_MIN_BYTES bytes (ver compression.py)
+app.config['COMPRESS_MIN_BYTES'] = int(os.environ.get('UNDERCOVER_COMPRESS_MIN_BYTES', '1024'))
+app.config['COMPRESS_LEVEL'] = int(os.environ.get('UNDERCOVER_COMPRESS_LEVEL', '6'))
+compressor = Compressor()
+compressor.init_app(app, metrics)
+
+# Perfilado con cProfile bajo demanda (ver profiling.py): hace falta la carpeta y la cabecera
+# X-Undercover-Profile con el secreto o una tasa de muestreo; si no, no se instala nada
+app.config['PROFILE_DIR'] = os.environ.get('UNDERCOVER_PROFILE_DIR', '')
+app.config['PROFILE_SECRET'] = os.environ.get('UNDERCOVER_PROFILE_SECRET')
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('UNDERCOVER_PROFILE_SAMPLE_RATE', '0'))
+app.config['PROFILE_KEEP'] = int(os.environ.get('UNDERCOVER_PROFILE_KEEP', str(profiling.PROFILE_KEEP)))
+profiler = profiling.RequestProfiler(app.config['PROFILE_DIR'], app.config['PROFILE_SECRET'],
+                                     app.config['PROFILE_SAMPLE_RATE'], app.config['PROFILE_KEEP'])
+if profiler.init_app(app):
+    metrics.register_collector(profiler.collect)
+
+# Historial de rondas en SQLite, escrito por lotes en un hilo de fondo (ver history.py). Hay que indicar
+# la ruta (p. ej. instance/history.sqlite3); sin ella, importar la aplicación no crea ni escribe nada
+app.config['HISTORY_PATH'] = os.environ.get('UNDERCOVER_HISTORY_DB', '')
+history = None
+if app.config['HISTORY_PATH']:
+    os.makedirs(os.path.dirname(app.config['HISTORY_PATH']) or '.', exist_ok=True)
+    history = HistoryStore(app.config['HISTORY_PATH'])
+    metrics.register_collector(history.collect)
+
+# CSS y JS de las plantillas: minificados, con huella y comprimidos al arrancar (ver static_assets.py)
+ASSETS_DIR = os.path.join(app.root_path, 'assets')
+assets = static_assets.StaticAssets(ASSETS_DIR).load()
+app.jinja_env.globals['asset_url'] = lambda name: url_for('asset', filename=assets.filename(name))
+
+# Salas multijugador en tiempo real (ver rooms.py)
+room_hub = RoomHub()
+# Eventos pendientes por conexión SSE antes de considerar al cliente demasiado lento
+ROOM_EVENT_QUEUE_SIZE = 100
+# Duración por defecto de la cuenta atrás del debate en las salas
+ROOM_TIMER_SECONDS = 120
+# Intentos de iniciar una ronda si la sala cambia mientras se prepara
+ROOM_START_ATTEMPTS = 3
 
 # --- FUNCIÓN DE UTILIDAD: Generar color brillante/encendido aleatorio (SÓLIDO) ---
-def generate_random_pastel_color():
+def generate_random_pastel_color(rng=random):
     """
     Genera un color hexadecimal brillante/encendido aleatorio (sólido),
     que contrasta bien con el texto blanco. (Cambiado de pastel a brillante)
+    Con `rng` (un random.Random) el color es reproducible.
     """
     # Inicializa los canales RGB con valores bajos (oscuros, 0 a 150)
-    r = random.randint(0, 150)
-    g = random.randint(0, 150)
-    b = random.randint(0, 150)
+    r = rng.randint(0, 150)
+    g = rng.randint(0, 150)
+    b = rng.randint(0, 150)
 
     # Elige uno de los canales para forzarlo a ser alto (brillante, 200 a 255)
-    choice = random.choice(['r', 'g', 'b'])
+    choice = rng.choice(['r', 'g', 'b'])
 
     if choice == 'r':
-        r = random.randint(200, 255)
+        r = rng.randint(200, 255)
     elif choice == 'g':
-        g = random.randint(200, 255)
+        g = rng.randint(200, 255)
     else: # choice == 'b'
-        b = random.randint(200, 255)
+        b = rng.randint(200, 255)
 
     return f'#{r:02x}{g:02x}{b:02x}'
 
 
 def load_categories():
-    """Carga todas las categorías desde los archivos JSON"""
-    categories = {}
-    if not os.path.exists(CATEGORIES_DIR):
-        os.makedirs(CATEGORIES_DIR)
-        return categories
-    
-    for filename in os.listdir(CATEGORIES_DIR):
-        if filename.endswith('.json'):
-            try:
-                with open(os.path.join(CATEGORIES_DIR, filename), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    categories[data['categoria']] = data
-            except Exception as e:
-                print(f"Error cargando {filename}: {e}")
-    return categories
+    """Devuelve las categorías del catálogo en memoria (recargando los JSON que cambiaron)"""
+    return catalog.snapshot().categories
+
+def request_shard(requested=None):
+    """Catálogo del idioma de la petición: `requested` o ?lang=, después Accept-Language y si no el de por defecto"""
+    return locales.shard(locales.negotiate(requested or request.args.get('lang'), request.accept_languages))
 
 def select_word_and_hints(categories_data, selected_categories):
-    """Selecciona una palabra aleatoria y sus pistas de las categorías seleccionadas"""
+    """
+    Selecciona una palabra aleatoria y sus pistas de las categorías seleccionadas.
+    (Implementación de referencia: las rutas usan el índice del catálogo, ver word_index.py)
+    """
     available_words = []
     
     for cat_name in selected_categories:
@@ -83,141 +214,8 @@ MAIN_TEMPLATE = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Juego del Underconver - Royer Blackberry</title>
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            padding: 20px;
-        }
-        .container {
-            background: white;
-            border-radius: 20px;
-            padding: 10px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            max-width: 600px;
-            width: 100%;
-        }
-        h1 { color: #667eea; text-align: center; margin-bottom: 30px; font-size: 2.5em; }
-        h2 { color: #764ba2; margin-bottom: 20px; }
-        .form-group { margin-bottom: 20px; }
-        label { display: block; margin-bottom: 8px; color: #333; font-weight: 600; }
-        input[type="number"], input[type="text"], select { 
-            width: 100%; padding: 12px; border: 2px solid #e0e0e0;
-            border-radius: 8px; font-size: 16px; transition: border-color 0.3s;
-        }
-        input[type="number"]:focus, input[type="text"]:focus, select:focus { outline: none; border-color: #667eea; }
-        
-        /* ESTILOS DE CHECKBOX MODERNOS Y GRANDES */
-        .checkbox-group {
-            background: #f8f9fa; padding: 15px; border-radius: 8px;
-            min-height: 300px; 
-            max-height: 400px; /* Reducido un poco para consistencia */
-            overflow-y: auto;
-        }
-        .checkbox-item { 
-            margin-bottom: 12px; 
-            display: flex; 
-            align-items: center;
-        }
-        .checkbox-item input[type="checkbox"] { 
-            width: 22px; 
-            height: 22px;
-            min-width: 22px; 
-            margin-right: 15px; 
-            cursor: pointer;
-            border: 2px solid #667eea;
-            appearance: none; 
-            border-radius: 6px; /* Más suave */
-            position: relative;
-        }
-        .checkbox-item input[type="checkbox"]:checked {
-            background-color: #667eea;
-            border-color: #667eea;
-        }
-        .checkbox-item input[type="checkbox"]:checked::before {
-            content: '✓';
-            display: block;
-            color: white;
-            font-size: 18px; /* Tamaño del check */
-            line-height: 1;
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            font-weight: bold;
-        }
-        .checkbox-item label { 
-            margin-bottom: 0; 
-            line-height: 1.2;
-            cursor: pointer;
-            font-weight: 400; /* Menos negrita en el texto del elemento */
-        }
-        /* FIN ESTILOS CHECKBOX */
-
-        button {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white; border: none; padding: 15px 30px; font-size: 18px;
-            border-radius: 8px; cursor: pointer; width: 100%;
-            transition: transform 0.2s; font-weight: 600;
-        }
-        button:hover { transform: translateY(-2px); }
-        button:active { transform: translateY(0); }
-        /* ESTILO DE LA TARJETA DEL JUGADOR - USA COLOR SÓLIDO */
-        .player-card {
-            background: #667eea; /* Color por defecto, será sobreescrito por inline style */
-            color: white; padding: 10px; border-radius: 15px;
-            text-align: center; margin-bottom: 20px;
-            transition: background 0.5s ease-in-out; 
-        }
-        .player-card h2 { color: white; margin-bottom: 15px; }
-        
-        .word-display {
-            padding: 20px;
-            border-radius: 10px; 
-            font-weight: bold; 
-            margin: 20px 0;
-            cursor: pointer;
-            user-select: none;
-            transition: color 0.1s ease-out, background 0.1s ease-out, font-size 0.1s ease-out, max-height 0.3s ease-out; 
-            
-            min-height: 220px; 
-            overflow: hidden; 
-            font-size: 2em; 
-        }
-        .impostor-display-final {
-            background: #ff6b6b;
-            font-size: 1.5em;
-            cursor: default;
-        }
-
-        .hint-box {
-            background: #fff3cd; border: 2px solid #ffc107; padding: 15px;
-            border-radius: 8px; margin-top: 15px; text-align: left;
-        }
-        .hint-box p { color: #856404; margin: 5px 0; }
-        .category-badge {
-            background: #764ba2; color: white; padding: 5px 15px;
-            border-radius: 20px; display: inline-block; margin-bottom: 10px;
-        }
-        .btn-secondary { 
-            background: #6c757d; 
-            margin-top: 10px; 
-            background: linear-gradient(135deg, #6c757d 0%, #495057 100%);
-        }
-        .warning {
-            background: #fff3cd; border-left: 4px solid #ffc107;
-            padding: 15px; margin-bottom: 20px; border-radius: 4px;
-        }
-        .info {
-            background: #d1ecf1; border-left: 4px solid #0c5460;
-            padding: 15px; margin-bottom: 20px; border-radius: 4px; color: #0c5460;
-        }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('base.css') }}">
+    {% block head %}{% endblock %}
 </head>
 <body>
     <div class="container">
@@ -226,11 +224,20 @@ MAIN_TEMPLATE = '''
 </body>
 </html>
 '''
-
 # Template de Configuración (MODIFICADO para Diseño Moderno)
-SETUP_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
+SETUP_TEMPLATE = MAIN_TEMPLATE.replace('{% block head %}{% endblock %}', '''
+    <script src="{{ asset_url('setup.js') }}" defer></script>
+''').replace('{% block content %}{% endblock %}', '''
         <h1>🎭 Configuración de Ronda</h1>
         
+        {% if locales|length > 1 %}
+        <p style="text-align: center;">
+            {% for code in locales %}
+            {% if code == locale %}<strong>{{ code }}</strong>{% else %}<a href="{{ url_for('setup', lang=code) }}">{{ code }}</a>{% endif %}{% if not loop.last %} · {% endif %}
+            {% endfor %}
+        </p>
+        {% endif %}
+        
         {% if error %}
         <div class="warning">
             <strong>⚠️ {{ error }}</strong>
@@ -238,10 +245,17 @@ SETUP_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
         {% endif %}
         
         <form method="POST" action="{{ url_for('setup') }}">
+            <input type="hidden" name="lang" value="{{ locale }}">
             <div class="form-group">
                 <label for="player_names">Nombres de jugadores (Separados por coma):</label>
                 <input type="text" id="player_names" name="player_names" 
-                       placeholder="Ej: Ana, Carlos, Diego, Eva" required>
+                       placeholder="Ej: Ana, Carlos, Diego, Eva">
+            </div>
+            
+            <div class="form-group">
+                <label for="num_players">Sala grande sin nombres: número de jugadores</label>
+                <input type="number" id="num_players" name="num_players" min="{{ min_players }}" max="{{ large_max_players }}"
+                       placeholder="Sólo con «Sala grande»: se llamarán Jugador 1, Jugador 2...">
             </div>
             
             <div class="form-group">
@@ -250,6 +264,10 @@ SETUP_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
                     <option value="1">1 impostor</option>
                     <option value="2">2 impostores</option>
                     <option value="3">3 impostores</option>
+                    <option value="5" data-large-room hidden disabled>5 impostores (sala grande)</option>
+                    <option value="10" data-large-room hidden disabled>10 impostores (sala grande)</option>
+                    <option value="25" data-large-room hidden disabled>25 impostores (sala grande)</option>
+                    <option value="50" data-large-room hidden disabled>50 impostores (sala grande)</option>
                 </select>
             </div>
             
@@ -261,7 +279,7 @@ SETUP_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
                     <div class="checkbox-item">
                         <input type="checkbox" id="cat_{{ loop.index }}" name="selected_categories" value="{{ cat_name }}" checked>
                         <label for="cat_{{ loop.index }}" style="display: inline;">
-                            {{ cat_name }} ({{ categories[cat_name].palabras|length }} palabras)
+                            {{ cat_name }} ({{ categories[cat_name] }} palabras)
                         </label>
                     </div>
                     {% endfor %}
@@ -279,82 +297,40 @@ SETUP_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
                     <input type="checkbox" id="hints_enabled" name="hints_enabled" checked>
                     <label for="hints_enabled" style="display: inline;">Activar pistas (Solo visibles para el impostor)</label>
                 </div>
+                <label for="hint_difficulty">Dificultad de la pista:</label>
+                <select id="hint_difficulty" name="hint_difficulty">
+                    <option value="">Cualquiera</option>
+                    <option value="facil">Fácil (casi delata la palabra)</option>
+                    <option value="media">Media</option>
+                    <option value="dificil">Difícil (muy ambigua)</option>
+                </select>
+                <div class="checkbox-item">
+                    <input type="checkbox" id="deck_mode" name="deck_mode" checked>
+                    <label for="deck_mode" style="display: inline;">No repetir palabras hasta agotar las categorías</label>
+                </div>
+                <div class="checkbox-item">
+                    <input type="checkbox" id="single_page" name="single_page">
+                    <label for="single_page" style="display: inline;">Ronda en una sola página (funciona sin conexión una vez cargada)</label>
+                </div>
+                <div class="checkbox-item">
+                    <input type="checkbox" id="large_room" name="large_room">
+                    <label for="large_room" style="display: inline;">Sala grande (hasta {{ large_max_players }} jugadores: cada uno abre su tarjeta en su teléfono)</label>
+                </div>
             </div>
             
             <button type="submit">🚀 Iniciar Juego</button>
-        </form><br/>Royer Blackberry - <a href="https://github.com/RBlackby/undercover-game" target="_blank">Repositorio del Juego Undercover</a> - 2025
+            <button type="submit" class="btn-secondary" formaction="{{ url_for('create_room') }}" formnovalidate>📱 Crear sala (cada jugador en su teléfono)</button>
+        </form>
+        <p style="margin-top: 15px; text-align: center;"><a href="{{ url_for('join_room') }}">¿Tienes un código? Únete a una sala</a></p>
+        <br/>Royer Blackberry - <a href="https://github.com/RBlackby/undercover-game" target="_blank">Repositorio del Juego Undercover</a> - 2025
 '''
 )
 
 # Template de Vista de Jugador
-PLAYER_VIEW_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
-        <script>
-            // Función para revelar u ocultar la información (palabra o rol)
-            function revealInfo(isPressed, isImpostor) {
-                const card = document.getElementById('secret-info-display');
-                const hintBox = document.getElementById('impostor-hint-box'); // Nuevo
-                
-                if (card) {
-                    if (isPressed) {
-                        // REVELAR
-                        card.style.color = card.getAttribute('data-revealed-color'); 
-                        
-                        if (isImpostor) {
-                            // Si es impostor: cambia fondo a rojo y quita el límite de altura
-                            card.style.background = '#ff6b6b'; 
-                            card.style.fontSize = '1.5em'; 
-                            card.style.maxHeight = '500px'; 
-                            if (hintBox) {
-                                hintBox.style.display = 'block'; // Muestra la pista
-                            }
-                        } else {
-                            // Civil
-                            card.style.background = 'white';
-                            card.style.fontSize = '2em'; 
-                        }
-                    } else {
-                        // OCULTAR
-                        setTimeout(() => {
-                            card.style.color = card.getAttribute('data-hidden-color');
-                            
-                            // Ambas tarjetas deben volver al estado visual de camuflaje
-                            card.style.background = 'white';
-                            card.style.fontSize = '2em'; 
-                            
-                            if (isImpostor) {
-                                // Restablece la altura máxima y oculta la pista
-                                card.style.maxHeight = '140px'; 
-                                if (hintBox) {
-                                    hintBox.style.display = 'none'; // Oculta la pista
-                                }
-                            }
-                        }, 50); 
-                    }
-                }
-            }
-        </script>
-        <style>
-            /* Estilo para asegurar el camuflaje del contenido */
-            .word-display {
-                padding: 20px;
-                border-radius: 10px; 
-                font-weight: bold; 
-                margin: 20px 0;
-                cursor: pointer;
-                user-select: none;
-                transition: color 0.1s ease-out, background 0.1s ease-out, font-size 0.1s ease-out, max-height 0.3s ease-out; 
-                
-                max-height: 140px; 
-                overflow: hidden; 
-                font-size: 2em; 
-            }
-            
-            /* Asegurarse de que la pista inicie oculta para el camuflaje */
-            .hint-box.hidden {
-                display: none;
-            }
-        </style>
-        
+PLAYER_VIEW_TEMPLATE = MAIN_TEMPLATE.replace('{% block head %}{% endblock %}', '''
+    <link rel="stylesheet" href="{{ asset_url('player.css') }}">
+    <script src="{{ asset_url('player.js') }}" defer></script>
+''').replace('{% block content %}{% endblock %}', '''
         <h1>Juego del Impostor</h1>
         
         {# SE INYECTA EL ESTILO DE COLOR SÓLIDO Y BRILLANTE #}
@@ -417,7 +393,9 @@ PLAYER_VIEW_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}'
             
         </div>
         
-        <form method="POST" action="{{ url_for('next_player') }}">
+        {# Sala grande: next_url lleva el número en la URL; standalone es la tarjeta en el teléfono de cada jugador #}
+        {% if not standalone %}
+        <form method="{{ 'GET' if next_url else 'POST' }}" action="{{ next_url or url_for('next_player') }}">
             {% if current_player < total_players %}
             <button type="submit">Siguiente Jugador →</button>
             {% else %}
@@ -427,166 +405,17 @@ PLAYER_VIEW_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}'
         
         <form method="POST" action="{{ url_for('reset') }}" style="margin-top: 10px;">
             <button type="submit" class="btn-secondary">Cancelar y Volver al Inicio</button>
-        </form><br/>Royer Blackberry - <a href="https://github.com/RBlackby/undercover-game">Repositorio del Juego Undercover</a> - 2025
+        </form>
+        {% endif %}<br/>Royer Blackberry - <a href="https://github.com/RBlackby/undercover-game">Repositorio del Juego Undercover</a> - 2025
 '''
 )
 
 
 # Template de Juego Completo (MODIFICADO para Diseño Moderno)
-GAME_COMPLETE_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
-    <script>
-        // 1. Variable global para almacenar el ID del intervalo del temporizador
-        let countdownInterval;
-
-        // Función para mostrar la información del impostor y ocultar el botón
-        function mostrarImpostores() {
-            // DETENER EL TEMPORIZADOR AQUI
-            if (countdownInterval) {
-                clearInterval(countdownInterval);
-                const display = document.getElementById('countdown');
-                // Si el tiempo no había terminado, muestra un mensaje de detención
-                if (display && display.textContent.includes(":")) { 
-                    display.textContent = "00:00 - ¡DETENIDO!";
-                }
-            }
-
-            const infoDiv = document.getElementById('impostor-info');
-            const btn = document.getElementById('mostrar-btn');
-            
-            if (infoDiv) {
-                // Se usa scrollHeight para la animación de revelación
-                infoDiv.style.maxHeight = infoDiv.scrollHeight + "px"; 
-                infoDiv.style.opacity = '1';
-            }
-            if (btn) {
-                btn.style.display = 'none'; // Oculta el botón después de presionar
-            }
-        }
-        
-        // FUNCIÓN DE CUENTA REGRESIVA
-        function iniciarCuentaRegresiva(duracion, display) {
-            let timer = duracion, minutos, segundos;
-            
-            // 2. Almacenar el intervalo en la variable global
-            countdownInterval = setInterval(function () { 
-                minutos = parseInt(timer / 60, 10);
-                segundos = parseInt(timer % 60, 10);
-
-                minutos = minutos < 10 ? "0" + minutos : minutos;
-                segundos = segundos < 10 ? "0" + segundos : segundos;
-
-                display.textContent = minutos + ":" + segundos;
-
-                if (--timer < 0) {
-                    clearInterval(countdownInterval); // Limpia la variable global al terminar
-                    display.textContent = "¡Tiempo terminado!";
-                    // Opcional: habilitar el botón de 'Mostrar Impostores' si estaba deshabilitado
-                }
-            }, 1000);
-        }
-
-        // --- PUNTO CLAVE: UNIFICAR LA INICIALIZACIÓN ---
-        document.addEventListener('DOMContentLoaded', function() {
-            // Inicializar la cuenta regresiva de 3 minutos (180 segundos)
-            const tresMinutos = 60 * 3;
-            const display = document.getElementById('countdown');
-            if (display) {
-                iniciarCuentaRegresiva(tresMinutos, display);
-            }
-        });
-    </script>
-    <style>
-    
-
-        /* --- ESTILO DE TEMPORIZADOR AÑADIDO/AJUSTADO --- */
-        #countdown-container {
-            text-align: center;
-            margin: 30px auto;
-            padding: 20px;
-            border-radius: 15px;
-            background: linear-gradient(135deg, #764ba2 0%, #667eea 100%);
-            color: white;
-            box-shadow: 0 8px 25px rgba(0,0,0,0.2);
-        }
-        #countdown-container h3 {
-            color: #ffe3e3;
-            margin-bottom: 10px;
-            font-size: 0.8em;
-        }
-        #countdown {
-    font-size: 2em;
-    font-weight: 900;
-    letter-spacing: 0px;
-    display: block;
-    text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.3);
-}
-        /* -------------------------------------- */
-       /* Estilo para las tarjetas de resultado */
-            .result-card {
-                background: #f7f9fc;
-                padding: 25px;
-                border-radius: 12px;
-                box-shadow: 0 4px 15px rgba(0,0,0,0.08);
-                margin-bottom: 20px;
-                text-align: center;
-                border-left: 5px solid #667eea; /* Color primario */
-            }
-            .result-card h3 {
-                color: #764ba2;
-                margin-bottom: 15px;
-                font-size: 1.6em;
-            }
-            .result-card strong {
-                font-weight: 700;
-                color: #333;
-            }
-            /* Estilo específico para la información secreta (Impostor/Palabra) */
-            #impostor-info {
-                background: #ffe3e3; /* Fondo más suave para la revelación */
-                border-left-color: #ff6b6b; /* Rojo para Impostor */
-                transition: max-height 0.5s ease-in-out, opacity 0.5s ease-in-out; 
-                max-height: 0; /* Inicia oculto */
-                opacity: 0;
-                overflow: hidden;
-            }
-            #impostor-info h3 {
-                color: #ff6b6b; /* Título rojo */
-            }
-            .word-of-the-game {
-                font-size: 2.5em;
-                font-weight: bold;
-                color: #667eea;
-                margin-top: 10px;
-                display: block;
-                padding: 10px;
-                border-radius: 8px;
-                background: #e9ecef;
-            }
-            .player-list {
-                font-size: 1.2em;
-                margin-top: 10px;
-                line-height: 1.6;
-            }
-            .start-player-info {
-                background: #d1ecf1;
-                border: 1px solid #bee5eb;
-                color: #0c5460;
-                padding: 15px;
-                border-radius: 10px;
-                font-size: 1.2em;
-                font-weight: 600;
-                margin-bottom: 20px;
-                text-align: center;
-            }
-            .start-player-info span {
-                color: #764ba2;
-                font-size: 1.4em;
-                font-weight: bold;
-                display: block;
-                margin-top: 5px;
-            }
-    </style>
-
+GAME_COMPLETE_TEMPLATE = MAIN_TEMPLATE.replace('{% block head %}{% endblock %}', '''
+    <link rel="stylesheet" href="{{ asset_url('complete.css') }}">
+    <script src="{{ asset_url('complete.js') }}" defer></script>
+''').replace('{% block content %}{% endblock %}', '''
     <h1>🎉 ¡A jugar!</h1>
 
     {# --- CONTENEDOR DEL TEMPORIZADOR --- #}
@@ -649,16 +478,358 @@ GAME_COMPLETE_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %
 '''
 )
 
+# Template del modo una sola petición: la ronda entera en un paquete que se juega en el navegador
+ROUND_BUNDLE_TEMPLATE = MAIN_TEMPLATE.replace('{% block head %}{% endblock %}', '''
+    <link rel="stylesheet" href="{{ asset_url('player.css') }}">
+    <link rel="stylesheet" href="{{ asset_url('complete.css') }}">
+    <script src="{{ asset_url('player.js') }}" defer></script>
+    <script src="{{ asset_url('complete.js') }}" defer></script>
+    <script src="{{ asset_url('round.js') }}" data-complete-url="{{ url_for('round_bundle_complete') }}" defer></script>
+''').replace('{% block content %}{% endblock %}', '''
+    <script type="application/json" id="round-bundle">{{ bundle|tojson }}</script>
+
+    <div id="pass-view">
+        <h1>Juego del Impostor</h1>
+        <div class="player-card" id="round-card">
+            <h2 id="round-player"></h2>
+            <div class="word-display" id="secret-info-display" data-hidden-color="white"
+                 data-revealed-color="white" style="color: white; background: white;">
+                <span id="card-text"></span>
+                <div id="card-hint" class="hint-box hidden" style="margin-top: 20px; background: rgba(255, 255, 255, 0.8); color: #856404;"></div>
+            </div>
+            <p style="margin-top: 15px;">**¡Mantén presionado sobre la caja para revelar tu rol/palabra!**</p>
+        </div>
+        <button id="next-btn" type="button">Siguiente Jugador →</button>
+    </div>
+
+    <div id="complete-view" style="display: none;">
+        <h1>🎉 ¡A jugar!</h1>
+        <div id="countdown-container">
+            <h3>Tiempo de Discusión</h3>
+            <span id="countdown" data-autostart="false"></span>
+        </div>
+        <div class="result-card">
+            <p><strong>Total de jugadores:</strong> {{ bundle.players|length }}</p>
+            <p><strong>Número de Impostores:</strong> {{ bundle.num_impostors }}</p>
+        </div>
+        <div class="start-player-info">
+            Inicia el juego:
+            <span id="start-player"></span>
+        </div>
+        <button id="mostrar-btn" type="button" style="margin-top: 10px; margin-bottom: 20px;">
+            Mostrar Impostor{{ "es" if bundle.num_impostors > 1 else "" }} y Palabra Secreta
+        </button>
+        <div id="impostor-info" class="result-card">
+            <h3>Terminó el juego</h3>
+            <h4>🎭 Impostor{{ "es" if bundle.num_impostors > 1 else "" }}</h4>
+            <div class="player-list" id="result-impostors"></div>
+            <hr style="margin: 20px 0; border: 0; border-top: 1px solid #ccc;"/>
+            <h4>Categoría:</h4> <span id="result-category"></span>
+            <span class="word-of-the-game" id="result-word"></span>
+        </div>
+    </div>
+
+    <form method="POST" action="{{ url_for('reset') }}" style="margin-top: 10px;">
+        <button type="submit" class="btn-secondary">🔁 Nuevo Juego</button>
+    </form><br/>Royer Blackberry - <a href="https://github.com/RBlackby/undercover-game" target="_blank">Repositorio del Juego Undercover</a> - 2025
+'''
+)
+
+# Template del anfitrión de una sala grande: jugadores paginados con el enlace a la tarjeta de cada uno
+LARGE_ROUND_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
+        <h1>👥 Sala grande</h1>
+
+        <div class="info">
+            <strong>{{ total_players }}</strong> jugadores y <strong>{{ num_impostors }}</strong> impostores.
+            Cada jugador abre su enlace en su teléfono (reparto en paralelo), o se pasa este teléfono
+            empezando por el jugador 1.
+        </div>
+
+        <form method="GET" action="{{ url_for('large_round_player', round_id=round_id, number=1) }}">
+            <button type="submit">📱 Pasar el teléfono desde el jugador 1</button>
+        </form>
+        <form method="GET" action="{{ url_for('large_round_complete', round_id=round_id) }}" style="margin-top: 10px;">
+            <button type="submit" class="btn-secondary">Terminar el reparto y empezar a jugar</button>
+        </form>
+
+        <h2 style="margin-top: 20px;">Jugadores {{ first }}–{{ last }} de {{ total_players }}</h2>
+        <ol start="{{ first }}" style="margin-left: 30px;">
+            {% for player in players %}
+            <li>{{ player.name }}: <a href="{{ player.url }}">{{ player.url }}</a></li>
+            {% endfor %}
+        </ol>
+        <p style="margin-top: 15px; text-align: center;">
+            {% if page > 1 %}<a href="{{ url_for('large_round', round_id=round_id, page=page - 1) }}">← Anteriores</a>{% endif %}
+            Página {{ page }} de {{ pages }}
+            {% if page < pages %}<a href="{{ url_for('large_round', round_id=round_id, page=page + 1) }}">Siguientes →</a>{% endif %}
+        </p>
+
+        <form method="POST" action="{{ url_for('reset') }}" style="margin-top: 10px;">
+            <button type="submit" class="btn-secondary">Cancelar y Volver al Inicio</button>
+        </form>
+'''
+)
+
+# Página final de una sala grande: la misma que la normal, con la lista de impostores enviada por partes
+LARGE_COMPLETE_TEMPLATE = GAME_COMPLETE_TEMPLATE.replace(
+    '{{ impostor_names }}',
+    '{% for name in impostor_names %}{{ name }}{% if not loop.last %}, {% endif %}{% endfor %}')
+
+# Template para unirse a una sala con su código
+ROOM_JOIN_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
+        <h1>📱 Unirse a una Sala</h1>
+
+        {% if error %}
+        <div class="warning">
+            <strong>⚠️ {{ error }}</strong>
+        </div>
+        {% endif %}
+
+        <form method="POST" action="{{ url_for('join_room') }}">
+            <div class="form-group">
+                <label for="code">Código de la sala:</label>
+                <input type="text" id="code" name="code" value="{{ code or '' }}" maxlength="5"
+                       style="text-transform: uppercase;" required>
+            </div>
+            <div class="form-group">
+                <label for="name">Tu nombre:</label>
+                <input type="text" id="name" name="name" maxlength="40" required>
+            </div>
+            <button type="submit">Entrar</button>
+        </form>
+
+        <form method="GET" action="{{ url_for('setup') }}" style="margin-top: 10px;">
+            <button type="submit" class="btn-secondary">Volver al Inicio</button>
+        </form>
+'''
+)
+
+# Template de Sala: vista del anfitrión y de cada jugador, actualizada por Server-Sent Events
+ROOM_TEMPLATE = MAIN_TEMPLATE.replace('{% block content %}{% endblock %}', '''
+        <h1>📱 Sala {{ code }}</h1>
+
+        {% if error %}
+        <div class="warning">
+            <strong>⚠️ {{ error }}</strong>
+        </div>
+        {% endif %}
+
+        <div class="info">
+            Para unirse, entra en <strong>{{ url_for('join_room', _external=True) }}</strong>
+            con el código <strong>{{ code }}</strong>.
+        </div>
+
+        <div class="info">
+            <h2>Jugadores (<span id="player-count">{{ players|length }}</span>)</h2>
+            <ul id="players" style="margin-left: 20px;">
+                {% for name in players %}<li>{{ name }}</li>{% endfor %}
+            </ul>
+        </div>
+
+        {% if is_player %}
+        <div class="player-card" id="card-box" style="display: none; margin-top: 20px;">
+            <h2 id="card-title"></h2>
+            <div class="word-display" id="secret-info-display" style="color: white; background: white;"
+                 onpointerdown="showCard(true)" onpointerup="showCard(false)" onpointerleave="showCard(false)">
+                <span id="card-text"></span>
+                <div id="card-hint" class="hint-box" style="display: none;"></div>
+            </div>
+            <p>**¡Mantén presionado sobre la caja para revelar tu rol/palabra!**</p>
+        </div>
+        {% else %}
+        <form method="POST" action="{{ url_for('join_room') }}">
+            <input type="hidden" name="code" value="{{ code }}">
+            <div class="form-group">
+                <label for="name">Tu nombre (para jugar desde este dispositivo):</label>
+                <input type="text" id="name" name="name" maxlength="40" required>
+            </div>
+            <button type="submit">Entrar a la sala</button>
+        </form>
+        {% endif %}
+
+        <div id="results" class="warning" style="display: none; margin-top: 20px;">
+            <h3>Resultados</h3>
+            <p><strong>Inicia el juego:</strong> <span id="result-start"></span></p>
+            <p><strong>Impostor(es):</strong> <span id="result-impostors"></span></p>
+            <p><strong>Categoría:</strong> <span id="result-category"></span></p>
+            <p><strong>Palabra:</strong> <span id="result-word"></span></p>
+        </div>
+
+        {% if is_host %}
+        <form method="POST" action="{{ url_for('room_start', code=code) }}" style="margin-top: 20px;">
+            <button type="submit">🚀 Nueva Ronda</button>
+        </form>
+        <form method="POST" action="{{ url_for('room_timer', code=code) }}" style="margin-top: 10px;">
+            <input type="hidden" name="seconds" value="{{ timer_seconds }}">
+            <button type="submit" class="btn-secondary">⏱️ Cuenta atrás del debate ({{ timer_seconds // 60 }} min)</button>
+        </form>
+        <form method="POST" action="{{ url_for('room_reveal', code=code) }}" style="margin-top: 10px;">
+            <button type="submit" class="btn-secondary">Mostrar Impostores y Palabra</button>
+        </form>
+        {% endif %}
+
+        <p id="timer-label" style="margin-top: 15px; text-align: center; font-size: 2em; font-weight: bold;"></p>
+        <p id="round-label" style="margin-top: 15px; text-align: center;"></p>
+        <br/>Royer Blackberry - <a href="https://github.com/RBlackby/undercover-game" target="_blank">Repositorio del Juego Undercover</a> - 2025
+
+        <script src="{{ asset_url('room.js') }}" data-events-url="{{ url_for('room_events', code=code) }}"></script>
+'''
+)
+
+# --- PLANTILLAS COMPILADAS ---
+
+# Se compilan una sola vez al arrancar en lugar de en cada petición
+setup_template = app.jinja_env.from_string(SETUP_TEMPLATE)
+player_view_template = app.jinja_env.from_string(PLAYER_VIEW_TEMPLATE)
+game_complete_template = app.jinja_env.from_string(GAME_COMPLETE_TEMPLATE)
+round_bundle_template = app.jinja_env.from_string(ROUND_BUNDLE_TEMPLATE)
+large_round_template = app.jinja_env.from_string(LARGE_ROUND_TEMPLATE)
+large_complete_template = app.jinja_env.from_string(LARGE_COMPLETE_TEMPLATE)
+room_join_template = app.jinja_env.from_string(ROOM_JOIN_TEMPLATE)
+room_template = app.jinja_env.from_string(ROOM_TEMPLATE)
+
+def render_setup(shard, snapshot, error=None):
+    return render_template(setup_template, categories=snapshot.word_counts, error=error,
+                           locale=shard.locale, locales=locales.available(),
+                           min_players=MIN_PLAYERS, large_max_players=large_rounds.LARGE_ROUND_MAX_PLAYERS)
+
+def render_setup_page(shard, snapshot):
+    """
+    Sirve la página de configuración sin error, renderizada (y comprimida) una vez por idioma
+    y versión del catálogo, con ETag para que los clientes que ya la tienen reciban un 304
+    """
+    key = (snapshot.version, request.script_root, tuple(locales.available()))
+    page = shard.setup_pages.get(key)
+    if page is None:
+        page = CachedPage(render_setup(shard, snapshot).encode('utf-8'))
+        # Sólo interesa la versión vigente del catálogo
+        shard.setup_pages.clear()
+        shard.setup_pages[key] = page
+    response = compressor.page_response(page)
+    response.vary.add('Accept-Language')
+    return response
+
+# --- LÓGICA DE RONDA ---
+
+MIN_PLAYERS = 3
+MAX_PLAYERS = 20
+# Impostores como máximo fuera de una sala grande
+MAX_IMPOSTORS = 3
+# Cuenta atrás del debate en el modo una sola petición (la misma que la página final clásica)
+ROUND_COUNTDOWN_SECONDS = 180
+# Semillas de rondas de una sola página ya guardadas en el historial, para no contar dos veces un aviso repetido
+RECORDED_BUNDLES_MAX = 10000
+recorded_bundles = OrderedDict()
+recorded_bundles_lock = threading.Lock()
+
+def remember_bundle(seed):
+    """True la primera vez que se ve la ronda `seed` en este proceso"""
+    with recorded_bundles_lock:
+        if seed in recorded_bundles:
+            return False
+        recorded_bundles[seed] = True
+        if len(recorded_bundles) > RECORDED_BUNDLES_MAX:
+            recorded_bundles.popitem(last=False)
+        return True
+
+class RoundConfigError(ValueError):
+    """Configuración de ronda inválida; el mensaje se muestra al usuario"""
+
+def validate_round_config(player_names, selected_categories):
+    """Valida jugadores y categorías de una ronda (formulario, salas y API)"""
+    if len(player_names) < MIN_PLAYERS or len(player_names) > MAX_PLAYERS:
+        raise RoundConfigError(f"Debes ingresar entre {MIN_PLAYERS} y {MAX_PLAYERS} nombres de jugadores.")
+    if not selected_categories:
+        raise RoundConfigError("Debes seleccionar al menos una categoría")
+
+def pick_word(snapshot, selected_categories, deck_mode=False, deck_state=None, rng=random):
+    """
+    Sortea la palabra de una ronda.
+    Devuelve (posición en snapshot.index.records o None, estado del mazo).
+    """
+    with metrics.phase('select_word'):
+        total = snapshot.index.count(selected_categories)
+        if not total:
+            return None, deck_state
+        if deck_mode:
+            # Modo mazo: la siguiente palabra de una permutación de las disponibles (ver deck.py)
+            position, deck_state = deck.draw(
+                deck_state, deck.fingerprint(snapshot.version, selected_categories), total, rng)
+        else:
+            position = rng.randrange(total)
+        return snapshot.index.global_position(selected_categories, position), deck_state
+
+def pick_round(snapshot, num_players, num_impostors, selected_categories, deck_mode=False, deck_state=None):
+    """
+    Sortea la palabra y los impostores de una ronda.
+    Devuelve (datos de la palabra o None, índices de impostores, estado del mazo).
+    """
+    position, deck_state = pick_word(snapshot, selected_categories, deck_mode, deck_state)
+    if position is None:
+        return None, [], deck_state
+
+    # Ajustar el número de impostores (asegura al menos 1 civil)
+    num_impostors = max(1, min(num_impostors, num_players - 1))
+    # Seleccionar impostores aleatoriamente (índices basados en 0)
+    impostor_indices = random.sample(range(0, num_players), num_impostors)
+    return snapshot.index.records[position], impostor_indices, deck_state
+
+def seeded_round():
+    """
+    Estado derivado de la ronda local de la sesión (ver round_seed.py): la sesión
+    sólo guarda semilla, jugadores, referencia de la palabra y opciones.
+    """
+    key = round_seed.round_key(app.secret_key)
+    seed = session['seed']
+    word_ref = session['word_ref']
+    shard = locales.shard(session.get('locale'))
+    word_data = shard.catalog.snapshot().index.resolve(word_ref)
+    if word_data is None:
+        # La palabra ya no está en el catálogo: la ronda sigue sin pistas
+        word_data = {'categoria': word_ref[0], 'palabra': word_ref[2], 'pistas': []}
+    num_players = len(session['player_names'])
+    return {'key': key, 'seed': seed, 'word': word_data, 'shard': shard,
+            'impostor_indices': round_seed.impostor_indices(key, seed, num_players, session['num_impostors'])}
+
+def player_hint(round_state, index, difficulty):
+    """Pista del impostor `index`: la misma en cada recarga"""
+    rng = round_seed.round_rng(round_state['key'], round_state['seed'], 'hint', index)
+    return round_state['shard'].hint_bands.choose(round_state['word'], difficulty, rng=rng)
+
+def player_color(round_state, index):
+    return generate_random_pastel_color(round_seed.round_rng(round_state['key'], round_state['seed'], 'color', index))
+
 # --- RUTAS DE FLASK ---
 
+@app.errorhandler(StaleCatalogError)
+def stale_catalog(e):
+    """Modo perezoso: una categoría cambió mientras se sorteaba; la siguiente petición ve el catálogo recargado"""
+    message = "El catálogo se está actualizando. Inténtalo de nuevo."
+    if request.path.startswith('/api/'):
+        response = jsonify({'error': message})
+    else:
+        response = Response(message, mimetype='text/plain')
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+def clear_round():
+    """Borra la ronda de la sesión, conservando el mazo de palabras del grupo"""
+    deck_state = session.get('deck')
+    session.clear()
+    if deck_state:
+        session['deck'] = deck_state
+
 @app.route('/')
 def index():
-    session.clear()
+    clear_round()
     return redirect(url_for('setup'))
 
 @app.route('/setup', methods=['GET', 'POST'])
 def setup():
-    categories = load_categories()
+    with metrics.phase('catalog'):
+        shard = request_shard(request.form.get('lang') if request.method == 'POST' else None)
+        snapshot = shard.catalog.snapshot()
     
     if request.method == 'POST':
         try:
@@ -666,64 +837,108 @@ def setup():
             
             # Limpiar y obtener nombres
             player_names = [name.strip() for name in player_names_raw.split(',') if name.strip()]
-            num_players = len(player_names)
             
             # Obtener y validar el número de impostores
             num_impostors = int(request.form.get('num_impostors', 1))
             selected_categories = request.form.getlist('selected_categories')
             hints_enabled = 'hints_enabled' in request.form
+            hint_difficulty = request.form.get('hint_difficulty') or None
+            deck_mode = 'deck_mode' in request.form
+            single_page = 'single_page' in request.form
             
+            if 'large_room' in request.form:
+                try:
+                    return start_large_round(shard, snapshot, player_names, request.form.get('num_players'),
+                                             num_impostors, selected_categories, hints_enabled, hint_difficulty,
+                                             deck_mode)
+                except RoundConfigError as e:
+                    return render_setup(shard, snapshot, error=str(e))
+
             # Validaciones
-            if num_players < 3 or num_players > 20:
-                error = "Debes ingresar entre 3 y 20 nombres de jugadores."
-                return render_template_string(SETUP_TEMPLATE, categories=categories, error=error)
-            
-            if not selected_categories:
-                error = "Debes seleccionar al menos una categoría"
-                return render_template_string(SETUP_TEMPLATE, categories=categories, error=error)
+            try:
+                validate_round_config(player_names, selected_categories)
+                if num_impostors > MAX_IMPOSTORS:
+                    raise RoundConfigError(f"Más de {MAX_IMPOSTORS} impostores sólo en una sala grande")
+            except RoundConfigError as e:
+                return render_setup(shard, snapshot, error=str(e))
+            # Una ronda grande anterior de esta sesión ya no es la ronda en curso
+            session.pop('large_round', None)
 
-            # Ajustar y validar número de impostores (asegura al menos 1 civil)
-            num_impostors = max(1, min(num_impostors, num_players - 1))
-            
-            # Seleccionar palabra y pistas
-            word_data = select_word_and_hints(categories, selected_categories)
-            if not word_data:
+            # Seleccionar la palabra; impostores, pistas y colores salen de la semilla (ver round_seed.py)
+            seed = round_seed.new_seed()
+            word_rng = round_seed.round_rng(round_seed.round_key(app.secret_key), seed, 'word')
+            position, deck_state = pick_word(snapshot, selected_categories, deck_mode, session.get('deck'), word_rng)
+            if position is None:
                 error = "No hay palabras disponibles en las categorías seleccionadas"
-                return render_template_string(SETUP_TEMPLATE, categories=categories, error=error)
-            
-            # Seleccionar impostores aleatoriamente (índices basados en 0)
-            impostor_indices = random.sample(range(0, num_players), num_impostors)
-            
-            # Inicializar el diccionario de colores
-            session['player_colors'] = {} 
+                return render_setup(shard, snapshot, error=error)
+            if deck_mode:
+                session['deck'] = deck_state
+            if single_page:
+                return render_round_bundle(shard, snapshot, seed, position, player_names, num_impostors,
+                                           hints_enabled, hint_difficulty)
             
             # Guardar en sesión
+            session['seed'] = seed
+            session['locale'] = shard.locale
+            session['word_ref'] = snapshot.index.word_ref(position)
             session['player_names'] = player_names
-            session['num_players'] = num_players
             session['current_player_index'] = 0 # Usamos índice base 0
-            session['palabra'] = word_data['palabra']
-            session['categoria'] = word_data['categoria']
-            session['pistas'] = word_data['pistas']
             session['hints_enabled'] = hints_enabled
-            session['impostor_indices'] = impostor_indices # Guardamos índices
+            session['hint_difficulty'] = hint_difficulty
             session['num_impostors'] = num_impostors
+            session['started_at'] = time.time()
+            session['round_recorded'] = False
             
             return redirect(url_for('show_player'))
             
         except Exception as e:
             error = f"Error al configurar el juego: {str(e)}"
-            return render_template_string(SETUP_TEMPLATE, categories=categories, error=error)
+            return render_setup(shard, snapshot, error=error)
     
-    return render_template_string(SETUP_TEMPLATE, categories=categories, error=None)
+    return render_setup_page(shard, snapshot)
+
+def render_round_bundle(shard, snapshot, seed, position, player_names, num_impostors, hints_enabled,
+                        hint_difficulty):
+    """Página del modo una sola petición: la ronda completa en un paquete firmado (ver round_bundle.py)"""
+    key = round_seed.round_key(app.secret_key)
+    round_state = {'key': key, 'seed': seed, 'word': snapshot.index.records[position], 'shard': shard,
+                   'impostor_indices': round_seed.impostor_indices(key, seed, len(player_names), num_impostors)}
+    hints = {}
+    if hints_enabled:
+        hints = {i: player_hint(round_state, i, hint_difficulty) for i in round_state['impostor_indices']}
+    bundle = round_bundle.build_bundle(round_bundle.bundle_key(app.secret_key), seed, player_names,
+                                       round_state['impostor_indices'], round_state['word'], hints,
+                                       ROUND_COUNTDOWN_SECONDS, time.time(), hints_enabled)
+    response = Response(render_template(round_bundle_template, bundle=bundle), mimetype='text/html')
+    # La página lleva los secretos de la ronda: que no la guarde ninguna caché
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/round/complete', methods=['POST'])
+def round_bundle_complete():
+    """Aviso (sendBeacon) de que terminó una ronda del modo una sola petición, para el historial"""
+    bundle = request.get_json(silent=True)
+    # Un paquete sólo vale mientras duraría la sesión de una ronda normal
+    if not round_bundle.verify(round_bundle.bundle_key(app.secret_key), bundle,
+                               max_age=app.permanent_session_lifetime.total_seconds()):
+        return api_error("Paquete de ronda inválido o caducado")
+    # remember_bundle evita ir a la cola en este proceso; el índice único de la semilla en el
+    # historial cubre los avisos repetidos en otros procesos o tras un reinicio
+    if history is not None and remember_bundle(bundle['seed']):
+        results = round_bundle.unseal(bundle['results'])
+        history.record('bundle', results['categoria'], results['palabra'], len(bundle['players']),
+                       bundle['num_impostors'], bundle['hints_enabled'], bundle['started_at'], time.time(),
+                       seed=bundle['seed'])
+    return '', 204
 
 @app.route('/player')
 def show_player():
-    if 'num_players' not in session:
+    if 'seed' not in session:
         return redirect(url_for('setup'))
     
     current_index = session.get('current_player_index', 0)
-    total = session.get('num_players', 0)
     player_names = session.get('player_names', [])
+    total = len(player_names)
     
     if current_index >= total:
         return redirect(url_for('game_complete'))
@@ -732,34 +947,29 @@ def show_player():
     current_player_name = player_names[current_index]
     current_player_number = current_index + 1
     
-    # LÓGICA DE COLOR ALEATORIO POR JUGADOR
-    player_colors = session.get('player_colors', {})
-    
-    # Asignar un color si el jugador aún no tiene uno (usando la función de color BRILLANTE)
-    if current_player_name not in player_colors:
-        player_colors[current_player_name] = generate_random_pastel_color()
-        session['player_colors'] = player_colors # Guardar el diccionario actualizado
-    
+    round_state = seeded_round()
+    word_data = round_state['word']
+
+    # LÓGICA DE COLOR ALEATORIO POR JUGADOR (el mismo en cada recarga, usando la función de color BRILLANTE)
+    color = player_color(round_state, current_index)
     # Crear el estilo CSS en línea para la tarjeta (color sólido)
-    color = player_colors[current_player_name]
     player_card_style = f"background: {color};" 
     
     # Comprobar si es impostor (usando el índice base 0)
-    is_impostor = current_index in session.get('impostor_indices', [])
+    is_impostor = current_index in round_state['impostor_indices']
     hints_enabled = session.get('hints_enabled', False)
-    hints_list = session.get('pistas', [])
     
     # Lógica de Pista Única
     single_hint = None
-    if is_impostor and hints_enabled and hints_list:
-        single_hint = random.choice(hints_list)
+    if is_impostor and hints_enabled:
+        single_hint = player_hint(round_state, current_index, session.get('hint_difficulty'))
 
-    return render_template_string(PLAYER_VIEW_TEMPLATE,
+    return render_template(player_view_template,
                                  current_player=current_player_number, # Número de turno
                                  current_player_name=current_player_name, # Nombre real
                                  total_players=total,
-                                 palabra=session.get('palabra', ''),
-                                 categoria=session.get('categoria', ''),
+                                 palabra=word_data['palabra'],
+                                 categoria=word_data['categoria'],
                                  single_hint=single_hint, 
                                  is_impostor=is_impostor,
                                  player_card_style=player_card_style) # <-- PASAR EL ESTILO
@@ -774,12 +984,13 @@ def next_player():
 
 @app.route('/complete')
 def game_complete():
-    if 'num_players' not in session or 'impostor_indices' not in session:
+    if 'seed' not in session:
         return redirect(url_for('setup'))
     
     # Recalcular los nombres de los impostores para la pantalla final
+    round_state = seeded_round()
     player_names = session.get('player_names', [])
-    impostor_indices = session.get('impostor_indices', [])
+    impostor_indices = round_state['impostor_indices']
     
     # Asegurarse de que los índices sean válidos
     impostor_names = [
@@ -787,18 +998,27 @@ def game_complete():
     ]
     
     # Obtener la palabra secreta
-    palabra_secreta = session.get('palabra', 'N/A')
+    palabra_secreta = round_state['word']['palabra']
+    categoria = round_state['word']['categoria']
+
+    # Guardar la ronda en el historial una sola vez (la página puede recargarse)
+    if history is not None and not session.get('round_recorded', True):
+        history.record('local', categoria, palabra_secreta, len(player_names),
+                       len(impostor_indices), session.get('hints_enabled', False),
+                       session.get('started_at', time.time()), time.time(), seed=session['seed'])
+        session['round_recorded'] = True
 
-    # --- NUEVA LÓGICA: SELECCIONAR JUGADOR INICIAL ALEATORIO ---
+    # --- NUEVA LÓGICA: SELECCIONAR JUGADOR INICIAL ALEATORIO (derivado de la semilla) ---
     jugador_inicial = "Nadie (Error)"
     if player_names:
-        jugador_inicial = random.choice(player_names)
+        jugador_inicial = player_names[round_seed.starting_player(round_state['key'], round_state['seed'],
+                                                                  len(player_names))]
     # --- FIN NUEVA LÓGICA ---
 
-    return render_template_string(GAME_COMPLETE_TEMPLATE,
-                                 total_players=session.get('num_players', 0),
-                                 num_impostors=session.get('num_impostors', 1),
-                                 categoria=session.get('categoria', 'N/A'),
+    return render_template(game_complete_template,
+                                 total_players=len(player_names),
+                                 num_impostors=len(impostor_indices),
+                                 categoria=categoria,
                                  palabra=palabra_secreta, 
                                  impostor_names=", ".join(impostor_names),
                                  # --- PASAR NUEVA VARIABLE ---
@@ -809,9 +1029,768 @@ def game_complete():
 
 @app.route('/reset', methods=['POST'])
 def reset():
-    session.clear()
+    clear_round()
     return redirect(url_for('setup'))
 
+# --- SALAS GRANDES (ver large_rounds.py) ---
+
+# Fragmentos de la plantilla que se juntan antes de enviar cada parte de la página final
+LARGE_STREAM_BUFFER = 64
+
+large_round_store = large_rounds.LargeRoundStore(round_store, app.permanent_session_lifetime.total_seconds())
+
+def start_large_round(shard, snapshot, player_names, num_players, num_impostors, selected_categories,
+                      hints_enabled, hint_difficulty, deck_mode):
+    """Sortea una ronda grande, la guarda en el almacén de rondas y deja en la sesión sólo su id"""
+    num_players = len(player_names) or int(num_players or 0)
+    max_players = large_rounds.LARGE_ROUND_MAX_PLAYERS
+    if num_players < MIN_PLAYERS or num_players > max_players:
+        raise RoundConfigError(f"Una sala grande admite entre {MIN_PLAYERS} y {max_players} jugadores.")
+    if not selected_categories:
+        raise RoundConfigError("Debes seleccionar al menos una categoría")
+    deck_state = session.get('deck')
+    clear_round()
+    key = round_seed.round_key(app.secret_key)
+    seed = round_seed.new_seed()
+    position, deck_state = pick_word(snapshot, selected_categories, deck_mode, deck_state,
+                                     round_seed.round_rng(key, seed, 'word'))
+    if position is None:
+        raise RoundConfigError("No hay palabras disponibles en las categorías seleccionadas")
+    if deck_mode:
+        session['deck'] = deck_state
+    impostor_indices = round_seed.impostor_indices(key, seed, num_players, num_impostors)
+    round_id = large_round_store.create({
+        'seed': seed,
+        'locale': shard.locale,
+        'word_ref': snapshot.index.word_ref(position),
+        'num_players': num_players,
+        'num_impostors': len(impostor_indices),
+        'impostors': large_rounds.impostor_bitmap(impostor_indices, num_players),
+        'hints_enabled': hints_enabled,
+        'hint_difficulty': hint_difficulty,
+        'started_at': time.time(),
+    }, player_names)
+    session['large_round'] = round_id
+    session['round_recorded'] = False
+    return redirect(url_for('large_round', round_id=round_id))
+
+def large_round_state(round_id, host=False):
+    """(ronda guardada, estado derivado de la semilla como en seeded_round); 404 si no existe"""
+    round_data = large_round_store.get(round_id)
+    if round_data is None:
+        abort(404)
+    if host and session.get('large_round') != round_id:
+        abort(403)
+    shard = locales.shard(round_data['locale'])
+    word_ref = round_data['word_ref']
+    word_data = shard.catalog.snapshot().index.resolve(word_ref)
+    if word_data is None:
+        word_data = {'categoria': word_ref[0], 'palabra': word_ref[2], 'pistas': []}
+    return round_data, {'key': round_seed.round_key(app.secret_key), 'seed': round_data['seed'],
+                        'word': word_data, 'shard': shard}
+
+def render_large_card(round_id, round_data, round_state, index, **extra):
+    """Tarjeta del jugador `index` (base 0): un bit del mapa de impostores y un bloque de nombres"""
+    is_impostor = large_rounds.is_impostor(round_data['impostors'], index)
+    single_hint = None
+    if is_impostor and round_data['hints_enabled']:
+        single_hint = player_hint(round_state, index, round_data['hint_difficulty'])
+    return render_template(player_view_template,
+                           current_player=index + 1,
+                           current_player_name=large_round_store.name(round_id, round_data, index),
+                           total_players=round_data['num_players'],
+                           palabra=round_state['word']['palabra'],
+                           categoria=round_state['word']['categoria'],
+                           single_hint=single_hint,
+                           is_impostor=is_impostor,
+                           player_card_style=f"background: {player_color(round_state, index)};",
+                           **extra)
+
+@app.route('/large/<round_id>')
+def large_round(round_id):
+    """Vista del anfitrión: jugadores de una página con el enlace a su tarjeta"""
+    round_data, round_state = large_round_state(round_id, host=True)
+    total = round_data['num_players']
+    pages = (total + large_rounds.PAGE_SIZE - 1) // large_rounds.PAGE_SIZE
+    page = min(max(request.args.get('page', 1, type=int), 1), pages)
+    start = (page - 1) * large_rounds.PAGE_SIZE
+    indices = range(start, min(start + large_rounds.PAGE_SIZE, total))
+    players = [{'name': name,
+                'url': url_for('large_round_card', round_id=round_id, number=index + 1, _external=True,
+                               t=large_rounds.card_token(round_state['key'], round_id, index))}
+               for index, name in zip(indices, large_round_store.names(round_id, round_data, indices))]
+    return render_template(large_round_template, round_id=round_id, players=players, page=page, pages=pages,
+                           first=start + 1, last=start + len(players), total_players=total,
+                           num_impostors=round_data['num_impostors'])
+
+@app.route('/large/<round_id>/player/<int:number>')
+def large_round_player(round_id, number):
+    """Reparto pasando el teléfono: el número de jugador va en la URL, no en la sesión"""
+    round_data, round_state = large_round_state(round_id, host=True)
+    if not 1 <= number <= round_data['num_players']:
+        return redirect(url_for('large_round_complete', round_id=round_id))
+    if number < round_data['num_players']:
+        next_url = url_for('large_round_player', round_id=round_id, number=number + 1)
+    else:
+        next_url = url_for('large_round_complete', round_id=round_id)
+    return render_large_card(round_id, round_data, round_state, number - 1, next_url=next_url)
+
+@app.route('/large/<round_id>/card/<int:number>')
+def large_round_card(round_id, number):
+    """Tarjeta de un jugador en su propio teléfono (reparto en paralelo), con el enlace firmado"""
+    round_data, round_state = large_round_state(round_id)
+    index = number - 1
+    if not 0 <= index < round_data['num_players'] or not large_rounds.check_card_token(
+            round_state['key'], round_id, index, request.args.get('t')):
+        abort(404)
+    response = Response(render_large_card(round_id, round_data, round_state, index, standalone=True),
+                        mimetype='text/html')
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/large/<round_id>/complete')
+def large_round_complete(round_id):
+    """Página final; la lista de impostores se va enviando mientras se recorre el mapa de bits"""
+    round_data, round_state = large_round_state(round_id, host=True)
+    total = round_data['num_players']
+    word_data = round_state['word']
+    if history is not None and not session.get('round_recorded', True):
+        history.record('large', word_data['categoria'], word_data['palabra'], total, round_data['num_impostors'],
+                       round_data['hints_enabled'], round_data['started_at'], time.time(), seed=round_data['seed'])
+        session['round_recorded'] = True
+    starting = round_seed.starting_player(round_state['key'], round_state['seed'], total)
+    context = {
+        'total_players': total,
+        'num_impostors': round_data['num_impostors'],
+        'categoria': word_data['categoria'],
+        'palabra': word_data['palabra'],
+        'impostor_names': large_round_store.names(round_id, round_data,
+                                                  large_rounds.impostor_positions(round_data['impostors'])),
+        'jugador_inicial': large_round_store.name(round_id, round_data, starting),
+    }
+    app.update_template_context(context)
+    stream = large_complete_template.stream(context)
+    stream.enable_buffering(LARGE_STREAM_BUFFER)
+    return Response(stream_with_context(stream), mimetype='text/html')
+
+# --- API JSON v1 (clientes sin HTML: kioscos, bots) ---
+
+# Máximo de rondas por petición a /api/v1/rounds/batch
+API_MAX_BATCH = 500
+
+def api_error(message, status=400):
+    return jsonify(error=message), status
+
+def api_round_config():
+    """Lee y valida la configuración de ronda del cuerpo JSON de la petición"""
+    data = request.get_json(silent=True) or {}
+    players = data.get('players', [])
+    if isinstance(players, str):
+        players = players.split(',')
+    if not isinstance(players, list):
+        raise RoundConfigError("'players' debe ser una lista de nombres")
+    players = [str(name).strip() for name in players if str(name).strip()]
+    categories = data.get('categories', [])
+    if not isinstance(categories, list):
+        raise RoundConfigError("'categories' debe ser una lista de nombres de categoría")
+    validate_round_config(players, categories)
+    try:
+        num_impostors = int(data.get('num_impostors', 1))
+    except (TypeError, ValueError):
+        raise RoundConfigError("'num_impostors' debe ser un número")
+    if num_impostors > MAX_IMPOSTORS:
+        raise RoundConfigError(f"'num_impostors' no puede ser mayor que {MAX_IMPOSTORS}")
+    hint_difficulty = data.get('hint_difficulty')
+    if hint_difficulty is not None and hint_difficulty not in hint_scores.BANDS:
+        raise RoundConfigError(f"'hint_difficulty' debe ser uno de: {', '.join(hint_scores.BANDS)}")
+    return {'players': players, 'categories': categories, 'num_impostors': num_impostors,
+            'hints_enabled': bool(data.get('hints_enabled', True)), 'hint_difficulty': hint_difficulty,
+            'shard': request_shard(data.get('lang'))}
+
+def create_api_round(snapshot, config):
+    """Sortea una ronda del catálogo del idioma de `config`, la guarda en el almacén y devuelve (id, ronda)"""
+    players = config['players']
+    word_data, impostor_indices, _ = pick_round(snapshot, len(players), config['num_impostors'],
+                                                config['categories'])
+    if not word_data:
+        raise RoundConfigError("No hay palabras disponibles en las categorías seleccionadas")
+    hints = {}
+    if config['hints_enabled'] and word_data['pistas']:
+        hints = {str(i): config['shard'].hint_bands.choose(word_data, config['hint_difficulty'])
+                 for i in impostor_indices}
+    api_round = {
+        'players': players,
+        'palabra': word_data['palabra'],
+        'categoria': word_data['categoria'],
+        'impostor_indices': impostor_indices,
+        'hints': hints,
+        'jugador_inicial': random.choice(players),
+    }
+    round_id = secrets.token_urlsafe(16)
+    round_store.set('api-round:' + round_id, api_round, app.permanent_session_lifetime.total_seconds())
+    if history is not None:
+        # La API no sabe cuándo termina la ronda: se guarda sin completed_at
+        history.record('api', api_round['categoria'], api_round['palabra'], len(players),
+                       len(impostor_indices), config['hints_enabled'], time.time())
+    return round_id, api_round
+
+def api_card(api_round, index):
+    """Tarjeta del jugador `index` (base 0): su palabra o, si es impostor, su pista"""
+    is_impostor = index in api_round['impostor_indices']
+    return {
+        'player_number': index + 1,
+        'player': api_round['players'][index],
+        'total_players': len(api_round['players']),
+        'is_impostor': is_impostor,
+        'palabra': None if is_impostor else api_round['palabra'],
+        'hint': api_round['hints'].get(str(index)) if is_impostor else None,
+    }
+
+def api_results(api_round):
+    return {
+        'palabra': api_round['palabra'],
+        'categoria': api_round['categoria'],
+        'impostor_names': [api_round['players'][i] for i in api_round['impostor_indices']],
+        'jugador_inicial': api_round['jugador_inicial'],
+    }
+
+@app.route('/api/v1/categories')
+def api_categories():
+    shard = request_shard()
+    snapshot = shard.catalog.snapshot()
+    response = jsonify(version=snapshot.version, locale=shard.locale, locales=locales.available(),
+                       categories=[{'name': name, 'words': count} for name, count in snapshot.word_counts.items()])
+    response.vary.add('Accept-Language')
+    return response
+
+@app.route('/api/v1/stats')
+def api_stats():
+    """Palabras más jugadas, popularidad de las categorías y rondas por hora (del historial)"""
+    if history is None:
+        return api_error("El historial de rondas está desactivado", 404)
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 1000)
+        hours = min(max(int(request.args.get('hours', 24)), 1), 24 * 366)
+    except ValueError:
+        return api_error("'limit' y 'hours' deben ser números")
+    return jsonify(dict(history.stats(limit=limit, hours=hours), pending=history.pending()))
+
+# Índice de palabras normalizadas (ver text_index.py), construido una vez por versión del catálogo
+_text_index_cache = {}
+_text_index_lock = threading.Lock()
+
+def build_text_index(snapshot):
+    records = snapshot.index.records
+    # En modo perezoso se leen los JSON de uno en uno: recorrer los registros cargaría todas
+    # las categorías en la caché LRU y expulsaría las que se están jugando
+    scan = getattr(records, 'scan', None)
+    return TextIndex(records, rows=scan() if scan else None)
+
+def text_index_for(shard, snapshot):
+    with _text_index_lock:
+        index = _text_index_cache.get((shard.locale, snapshot.version))
+        if index is None:
+            index = build_text_index(snapshot)
+            # Sólo la versión vigente de cada idioma
+            for key in [key for key in _text_index_cache if key[0] == shard.locale]:
+                del _text_index_cache[key]
+            _text_index_cache[(shard.locale, snapshot.version)] = index
+    return index
+
+@app.route('/api/v1/words/lookup')
+def api_word_lookup():
+    """Palabras del catálogo iguales o parecidas a `q`, y qué pistas de `hints` la delatarían"""
+    text = request.args.get('q', '').strip()
+    if not text:
+        return api_error("Falta el parámetro q")
+    try:
+        threshold = float(request.args.get('threshold', NEAR_DUPLICATE_THRESHOLD))
+    except ValueError:
+        return api_error("threshold debe ser un número")
+    if not 0 < threshold <= 1:
+        return api_error("threshold debe estar entre 0 y 1")
+    hints = [hint.strip() for hint in request.args.get('hints', '').split(',') if hint.strip()]
+    shard = request_shard()
+    snapshot = shard.catalog.snapshot()
+    index = text_index_for(shard, snapshot)
+    matches = [{'palabra': index.records[position]['palabra'], 'categoria': index.records[position]['categoria'],
+                'score': round(score, 3), 'exact': score == 1.0}
+               for score, position in index.lookup(text, threshold)]
+    return jsonify(query=text, locale=shard.locale, catalog_version=snapshot.version, matches=matches,
+                   leaking_hints=[hint for hint in hints if leaks(text, hint)])
+
+@app.route('/api/v1/rounds', methods=['POST'])
+def api_create_round():
+    try:
+        config = api_round_config()
+        round_id, api_round = create_api_round(config['shard'].catalog.snapshot(), config)
+    except RoundConfigError as e:
+        return api_error(str(e))
+    return jsonify(round_id=round_id,
+                   players=api_round['players'],
+                   num_impostors=len(api_round['impostor_indices']),
+                   card_urls=[url_for('api_player_card', round_id=round_id, number=n)
+                              for n in range(1, len(api_round['players']) + 1)],
+                   results_url=url_for('api_round_results', round_id=round_id)), 201
+
+@app.route('/api/v1/rounds/<round_id>/players/<int:number>')
+def api_player_card(round_id, number):
+    api_round = round_store.get('api-round:' + round_id)
+    if api_round is None:
+        return api_error("La ronda no existe o ya expiró", 404)
+    if not 1 <= number <= len(api_round['players']):
+        return api_error("Número de jugador fuera de rango", 404)
+    return jsonify(api_card(api_round, number - 1))
+
+@app.route('/api/v1/rounds/<round_id>/results')
+def api_round_results(round_id):
+    api_round = round_store.get('api-round:' + round_id)
+    if api_round is None:
+        return api_error("La ronda no existe o ya expiró", 404)
+    return jsonify(api_results(api_round))
+
+@app.route('/api/v1/rounds/batch', methods=['POST'])
+def api_create_rounds_batch():
+    """Crea K rondas y las devuelve en JSON Lines (una por línea, con todas sus tarjetas)"""
+    try:
+        config = api_round_config()
+    except RoundConfigError as e:
+        return api_error(str(e))
+    try:
+        count = int((request.get_json(silent=True) or {}).get('count', 1))
+    except (TypeError, ValueError):
+        return api_error("'count' debe ser un número")
+    if not 1 <= count <= API_MAX_BATCH:
+        return api_error(f"'count' debe estar entre 1 y {API_MAX_BATCH}")
+    snapshot = config['shard'].catalog.snapshot()
+    # Se valida que haya palabras antes de empezar a transmitir
+    if not snapshot.index.count(config['categories']):
+        return api_error("No hay palabras disponibles en las categorías seleccionadas")
+
+    def generate():
+        for _ in range(count):
+            round_id, api_round = create_api_round(snapshot, config)
+            line = {'round_id': round_id,
+                    'cards': [api_card(api_round, i) for i in range(len(api_round['players']))],
+                    'results': api_results(api_round)}
+            yield json.dumps(line, ensure_ascii=False) + '\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
+
+# Importaciones de palabras: una a la vez para no reescribir el mismo archivo en paralelo
+import_lock = threading.Lock()
+
+def admin_authorized():
+    """Comprueba el token de administración de la cabecera Authorization"""
+    token = app.config.get('ADMIN_TOKEN')
+    header = request.headers.get('Authorization', '')
+    return bool(token) and header.startswith('Bearer ') and secrets.compare_digest(header[7:], token)
+
+def run_import(stream, fmt, dry_run=False, shard=None):
+    """Importa palabras a la carpeta de un idioma (ver catalog_import.py) y recarga sólo los archivos que cambiaron"""
+    shard = shard or default_shard
+    with import_lock:
+        result = catalog_import.import_rows(catalog_import.iter_rows(stream, fmt), shard.directory,
+                                            shard.catalog.category_files(), dry_run=dry_run)
+        if not dry_run and not result['error_count']:
+            result['catalog_version'] = shard.catalog.reload().version
+    result['locale'] = shard.locale
+    return result
+
+def locale_shard(locale):
+    """Catálogo de un idioma pedido explícitamente (administración y comandos); ValueError si no existe"""
+    locale = locale or DEFAULT_LOCALE
+    if locale not in locales.available():
+        raise ValueError(f"Idioma desconocido: {locale} (disponibles: {', '.join(locales.available())})")
+    return locales.shard(locale)
+
+@app.route('/api/v1/admin/import', methods=['POST'])
+def api_import_words():
+    """Importa palabras desde el cuerpo (o el campo `file` de un formulario) en JSON, JSON Lines o CSV"""
+    if not app.config.get('ADMIN_TOKEN'):
+        return api_error("No encontrado", 404)
+    if not admin_authorized():
+        return api_error("No autorizado", 401)
+    try:
+        shard = locale_shard(request.args.get('lang'))
+    except ValueError as e:
+        return api_error(str(e))
+    upload = request.files.get('file')
+    if upload is not None:
+        stream, filename, content_type = upload.stream, upload.filename, upload.mimetype
+    else:
+        stream, filename, content_type = request.stream, None, request.mimetype
+    fmt = request.args.get('format') or catalog_import.detect_format(filename, content_type)
+    if fmt not in catalog_import.FORMATS:
+        return api_error(f"Formato no soportado: {fmt}")
+    result = run_import(stream, fmt, dry_run=request.args.get('dry_run') == '1', shard=shard)
+    return jsonify(result), 400 if result['error_count'] else 200
+
+@app.route('/api/v1/admin/profiles')
+def api_profiles():
+    """Perfiles guardados, del más reciente al más antiguo"""
+    if not app.config.get('ADMIN_TOKEN') or not profiler.enabled:
+        return api_error("No encontrado", 404)
+    if not admin_authorized():
+        return api_error("No autorizado", 401)
+    return jsonify(profiles=profiler.list())
+
+@app.route('/api/v1/admin/profiles/<profile_id>')
+def api_profile(profile_id):
+    """Descarga un perfil: ?format=pstats (por defecto), text o collapsed (pilas para flamegraph)"""
+    if not app.config.get('ADMIN_TOKEN') or not profiler.enabled:
+        return api_error("No encontrado", 404)
+    if not admin_authorized():
+        return api_error("No autorizado", 401)
+    path = profiler.path(profile_id)
+    if path is None:
+        return api_error("Perfil no encontrado", 404)
+    fmt = request.args.get('format', 'pstats')
+    if fmt == 'pstats':
+        with open(path, 'rb') as f:
+            body = f.read()
+        return Response(body, mimetype='application/octet-stream',
+                        headers={'Content-Disposition': f'attachment; filename={profile_id}.prof'})
+    if fmt == 'text':
+        return Response(profiling.stats_text(path, sort=request.args.get('sort', 'cumulative')),
+                        mimetype='text/plain')
+    if fmt == 'collapsed':
+        return Response(profiling.collapsed_stacks(path), mimetype='text/plain',
+                        headers={'Content-Disposition': f'attachment; filename={profile_id}.folded'})
+    return api_error("Formato desconocido (pstats, text o collapsed)")
+
+# --- SALAS MULTIJUGADOR (ver rooms.py) ---
+
+def room_membership(code):
+    """Tokens de anfitrión/jugador de esta sesión para la sala `code` ({} si no pertenece)"""
+    membership = session.get('room') or {}
+    return membership if membership.get('code') == code else {}
+
+@app.route('/room/new', methods=['POST'])
+def create_room():
+    shard = request_shard(request.form.get('lang'))
+    selected_categories = request.form.getlist('selected_categories')
+    if not selected_categories:
+        return render_setup(shard, shard.catalog.snapshot(), error="Debes seleccionar al menos una categoría")
+    try:
+        num_impostors = int(request.form.get('num_impostors', 1))
+    except ValueError:
+        return render_setup(shard, shard.catalog.snapshot(), error="El número de impostores debe ser un número")
+    if num_impostors > MAX_IMPOSTORS:
+        return render_setup(shard, shard.catalog.snapshot(), error=f"Como máximo {MAX_IMPOSTORS} impostores por sala")
+    settings = {
+        'locale': shard.locale,
+        'num_impostors': num_impostors,
+        'selected_categories': selected_categories,
+        'hints_enabled': 'hints_enabled' in request.form,
+        'hint_difficulty': request.form.get('hint_difficulty') or None,
+        'deck_mode': 'deck_mode' in request.form,
+    }
+    code, host_token = room_hub.call(room_hub.create_room, settings)
+    session['room'] = {'code': code, 'host': host_token}
+    return redirect(url_for('room', code=code))
+
+@app.route('/room', methods=['GET', 'POST'])
+def join_room():
+    if request.method == 'GET':
+        return render_template(room_join_template, code=request.args.get('code'), error=None)
+    code = request.form.get('code', '').strip().upper()
+    try:
+        token = room_hub.call(room_hub.join, code, request.form.get('name', ''))
+    except RoomError as e:
+        return render_template(room_join_template, code=code, error=str(e))
+    # Si este dispositivo es el anfitrión, también puede jugar
+    membership = dict(room_membership(code), code=code, player=token)
+    session['room'] = membership
+    return redirect(url_for('room', code=code))
+
+@app.route('/room/<code>')
+def room(code, error=None):
+    code = code.upper()
+    membership = room_membership(code)
+    try:
+        info = room_hub.call(room_hub.room_info, code)
+    except RoomError as e:
+        return render_template(room_join_template, code=code, error=str(e))
+    if not membership:
+        return render_template(room_join_template, code=code, error=None)
+    return render_template(room_template, code=code, players=info['players'], error=error,
+                           is_host='host' in membership, is_player='player' in membership,
+                           timer_seconds=ROOM_TIMER_SECONDS)
+
+@app.route('/room/<code>/start', methods=['POST'])
+def room_start(code):
+    code = code.upper()
+    try:
+        settings = room_hub.call(room_hub.room_info, code)['settings']
+    except RoomError as e:
+        return render_template(room_join_template, code=code, error=str(e))
+    shard = locales.shard(settings['locale'])
+    snapshot = shard.catalog.snapshot()
+
+    def build_round(num_players, deck_state):
+        word_data, impostor_indices, deck_state = pick_round(
+            snapshot, num_players, settings['num_impostors'], settings['selected_categories'],
+            settings['deck_mode'], deck_state)
+        if not word_data:
+            raise RoomError("No hay palabras disponibles en las categorías seleccionadas")
+        hints = {}
+        if settings['hints_enabled'] and word_data['pistas']:
+            # Cada impostor recibe una pista fija para toda la ronda
+            hints = {i: shard.hint_bands.choose(word_data, settings['hint_difficulty']) for i in impostor_indices}
+        return word_data, impostor_indices, hints, deck_state
+
+    host_token = room_membership(code).get('host')
+    try:
+        for attempt in range(ROOM_START_ATTEMPTS):
+            # Se sortea en este hilo y no en el bucle del hub (con asgi.py, el del servidor):
+            # en modo perezoso puede leer y parsear una categoría entera
+            num_players, deck_state, deck_version = room_hub.call(room_hub.round_state, code, host_token)
+            prepared = build_round(num_players, deck_state)
+            try:
+                room_hub.call(room_hub.start_round, code, host_token, num_players, deck_version, *prepared)
+                break
+            except RoomChanged:
+                if attempt == ROOM_START_ATTEMPTS - 1:
+                    raise
+    except RoomError as e:
+        return room(code, error=str(e))
+    return redirect(url_for('room', code=code))
+
+@app.route('/room/<code>/reveal', methods=['POST'])
+def room_reveal(code):
+    code = code.upper()
+    try:
+        finished = room_hub.call(room_hub.reveal, code, room_membership(code).get('host'))
+        if finished and history is not None:
+            settings = room_hub.call(room_hub.room_info, code)['settings']
+            history.record('room', finished['categoria'], finished['palabra'], finished['num_players'],
+                           finished['num_impostors'], settings['hints_enabled'], finished['started_at'],
+                           time.time())
+    except RoomError as e:
+        return room(code, error=str(e))
+    return redirect(url_for('room', code=code))
+
+@app.route('/room/<code>/timer', methods=['POST'])
+def room_timer(code):
+    code = code.upper()
+    try:
+        seconds = int(request.form.get('seconds', ROOM_TIMER_SECONDS))
+        room_hub.call(room_hub.start_timer, code, room_membership(code).get('host'), seconds)
+    except ValueError:
+        return room(code, error="Duración de la cuenta atrás no válida")
+    except RoomError as e:
+        return room(code, error=str(e))
+    return redirect(url_for('room', code=code))
+
+@app.route('/room/<code>/events')
+def room_events(code):
+    code = code.upper()
+    membership = room_membership(code)
+    # El jugador recibe su tarjeta; el anfitrión que no juega sólo recibe el estado de la sala
+    token = membership.get('player') or membership.get('host')
+    events = queue.Queue(maxsize=ROOM_EVENT_QUEUE_SIZE)
+    try:
+        room_hub.call(room_hub.subscribe, code, token, events)
+    except RoomError as e:
+        return Response(format_sse('error', {'error': str(e)}), status=403, mimetype='text/event-stream')
+
+    def stream():
+        try:
+            while True:
+                try:
+                    event, data = events.get(timeout=15)
+                except queue.Empty:
+                    # Comentario SSE para mantener viva la conexión
+                    yield ': ping\n\n'
+                    continue
+                if event == DROPPED_EVENT:
+                    # Dado de baja por lento: al cerrar, EventSource reconecta y recibe el estado actual
+                    break
+                yield format_sse(event, data)
+                if event == 'closed':
+                    break
+        finally:
+            room_hub.call_soon(room_hub.unsubscribe, code, events)
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/metrics')
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/static/<filename>')
+def asset(filename):
+    """CSS/JS con huella (ver static_assets.py): la variante comprimida que acepte el cliente, cacheable un año"""
+    found = assets.get(filename)
+    if found is None:
+        abort(404)
+    encoding = found.negotiate(request.accept_encodings)
+    response = Response(found.variants[encoding], content_type=found.content_type)
+    if encoding != 'identity':
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = static_assets.CACHE_CONTROL
+    response.set_etag(f'{found.etag}-{encoding}')
+    return response.make_conditional(request)
+
+@app.route('/healthz')
+def healthz():
+    snapshot = catalog.snapshot()
+    return jsonify(status='ok',
+                   catalog_version=snapshot.version,
+                   catalog_source=catalog.source,
+                   catalog_loaded_at=snapshot.loaded_at,
+                   catalog_load_seconds=snapshot.load_time,
+                   categories=len(snapshot.categories),
+                   words=snapshot.word_count,
+                   default_locale=DEFAULT_LOCALE,
+                   locales=locales.available(),
+                   loaded_locales=sorted(locales.loaded()))
+
+def cli_shard(locale):
+    try:
+        return locale_shard(locale)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+@app.cli.command('build-catalog')
+@click.option('--locale', help='Idioma del catálogo (por defecto UNDERCOVER_DEFAULT_LOCALE)')
+def build_catalog_command(locale):
+    """Valida los JSON de categorías y los compila en un paquete binario (ver catalog_pack.py)"""
+    shard = cli_shard(locale)
+    categories, sources, errors = shard.catalog.load_sources()
+    if errors:
+        for error in errors:
+            click.echo(f"Error: {error}", err=True)
+        raise click.ClickException(f"{len(errors)} error(es) en los JSON de categorías; no se generó el paquete")
+    output = pack_path(shard.directory)
+    build_pack(categories, sources, output)
+    words = sum(len(cat['palabras']) for cat in categories.values())
+    click.echo(f"Paquete generado en {output}: {len(categories)} categorías, {words} palabras")
+
+@app.cli.command('catalog-report')
+@click.option('--threshold', type=float, default=NEAR_DUPLICATE_THRESHOLD, show_default=True,
+              help='Similitud mínima (Dice sobre trigramas) para considerar dos palabras casi iguales')
+@click.option('--json', 'as_json', is_flag=True, help='Salida en JSON')
+@click.option('--locale', help='Idioma del catálogo (por defecto UNDERCOVER_DEFAULT_LOCALE)')
+def catalog_report_command(threshold, as_json, locale):
+    """Informe de palabras repetidas o casi iguales entre categorías y de pistas que delatan la palabra"""
+    index = build_text_index(cli_shard(locale).catalog.reload())
+    records = index.records
+
+    def describe(position):
+        return {'palabra': records[position]['palabra'], 'categoria': records[position]['categoria']}
+
+    report = {
+        'duplicates': [[describe(p) for p in group] for group in index.duplicates()],
+        'near_duplicates': [{'score': round(score, 3), 'a': describe(i), 'b': describe(j)}
+                            for score, i, j in index.near_duplicates(threshold)],
+        'hint_leaks': [dict(describe(p), pista=hint) for p, hint in index.hint_leaks()],
+    }
+    if as_json:
+        click.echo(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    click.echo(f"Palabras repetidas ({len(report['duplicates'])}):")
+    for group in report['duplicates']:
+        click.echo('  ' + ' = '.join(f"{w['palabra']} [{w['categoria']}]" for w in group))
+    click.echo(f"\nPalabras casi iguales ({len(report['near_duplicates'])}):")
+    for pair in report['near_duplicates']:
+        click.echo(f"  {pair['score']:.2f}  {pair['a']['palabra']} [{pair['a']['categoria']}] ~ "
+                   f"{pair['b']['palabra']} [{pair['b']['categoria']}]")
+    click.echo(f"\nPistas que delatan la palabra ({len(report['hint_leaks'])}):")
+    for leak in report['hint_leaks']:
+        click.echo(f"  {leak['palabra']} [{leak['categoria']}]: {leak['pista']}")
+
+@app.cli.command('score-hints')
+@click.option('--seed', type=int, default=0, show_default=True, help='Semilla de la proyección aleatoria')
+@click.option('--locale', help='Idioma del catálogo (por defecto UNDERCOVER_DEFAULT_LOCALE)')
+def score_hints_command(seed, locale):
+    """Puntúa la ambigüedad de todas las pistas y guarda las bandas de dificultad (requiere NumPy)"""
+    shard = cli_shard(locale)
+    snapshot = shard.catalog.reload()
+    started = time.perf_counter()
+    try:
+        scores, thresholds = hint_scores.score_hints(snapshot.index.records, seed=seed)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    output = hint_scores.scores_path(shard.directory)
+    hint_scores.save_scores(output, scores, thresholds)
+    click.echo(f"Puntuaciones de {sum(len(h) for h in scores.values())} pistas de {len(scores)} palabras "
+               f"guardadas en {output} ({time.perf_counter() - started:.1f} s); "
+               f"umbrales de las bandas: {thresholds[0]:.4f} / {thresholds[1]:.4f}")
+
+@app.cli.command('replay-round')
+@click.argument('seed', type=int)
+@click.option('--players', required=True, help='Nombres de los jugadores separados por comas, en orden')
+@click.option('--impostors', type=int, default=1, show_default=True)
+@click.option('--category', 'categories', multiple=True, help='Categorías seleccionadas (se repite)')
+@click.option('--word-ref', help='Referencia de la palabra guardada en la sesión: "categoría:posición:palabra"')
+@click.option('--hints', is_flag=True, help='La ronda tenía pistas para los impostores')
+@click.option('--difficulty', type=click.Choice(hint_scores.BANDS), help='Dificultad de las pistas')
+@click.option('--locale', help='Idioma del catálogo (por defecto UNDERCOVER_DEFAULT_LOCALE)')
+def replay_round_command(seed, players, impostors, categories, word_ref, hints, difficulty, locale):
+    """
+    Reproduce una ronda local a partir de su semilla (requiere la misma UNDERCOVER_SECRET_KEY).
+    La palabra sale de --word-ref o, si no se usó el modo mazo, de la semilla y --category.
+    """
+    shard = cli_shard(locale)
+    snapshot = shard.catalog.reload()
+    key = round_seed.round_key(app.secret_key)
+    if word_ref:
+        categoria, offset, palabra = word_ref.split(':', 2)
+        ref = [categoria, int(offset), palabra]
+    elif categories:
+        position, _ = pick_word(snapshot, categories, rng=round_seed.round_rng(key, seed, 'word'))
+        if position is None:
+            raise click.ClickException("No hay palabras en las categorías indicadas")
+        ref = snapshot.index.word_ref(position)
+    else:
+        raise click.ClickException("Indica --word-ref o al menos una --category")
+    player_names = [name.strip() for name in players.split(',') if name.strip()]
+    word_data = snapshot.index.resolve(ref) or {'categoria': ref[0], 'palabra': ref[2], 'pistas': []}
+    round_state = {'key': key, 'seed': seed, 'word': word_data, 'shard': shard,
+                   'impostor_indices': round_seed.impostor_indices(key, seed, len(player_names), impostors)}
+    click.echo(f"Palabra: {word_data['palabra']} [{word_data['categoria']}] (ref {':'.join(map(str, ref))})")
+    for index, name in enumerate(player_names):
+        line = f"  {index + 1}. {name}  {player_color(round_state, index)}"
+        if index in round_state['impostor_indices']:
+            line += f"  IMPOSTOR (pista: {player_hint(round_state, index, difficulty)})" if hints else "  IMPOSTOR"
+        click.echo(line)
+    click.echo(f"Empieza: {player_names[round_seed.starting_player(key, seed, len(player_names))]}")
+
+@app.cli.command('build-assets')
+@click.option('--output', default=os.path.join(app.root_path, 'static'), show_default=True,
+              help='Carpeta de salida (para servirla desde un proxy o una CDN)')
+def build_assets_command(output):
+    """Escribe los CSS/JS minificados y con huella, con sus variantes .gz (y .br si hay brotli)"""
+    manifest = assets.load().write(output)
+    for name, asset in assets.by_name.items():
+        sizes = ' / '.join(f"{encoding} {len(body)} B" for encoding, body in asset.variants.items())
+        click.echo(f"  {name} -> {asset.filename} ({sizes})")
+    click.echo(f"{len(manifest)} archivos en {output}")
+
+@app.cli.command('import-words')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(catalog_import.FORMATS),
+              help='Formato del archivo (por defecto se deduce de la extensión)')
+@click.option('--dry-run', is_flag=True, help='Sólo valida, sin escribir nada')
+@click.option('--locale', help='Idioma del catálogo (por defecto UNDERCOVER_DEFAULT_LOCALE)')
+def import_words_command(source, fmt, dry_run, locale):
+    """Importa palabras desde un JSON, JSON Lines o CSV a la carpeta de categorías"""
+    result = run_import(source, fmt or catalog_import.detect_format(source.name), dry_run=dry_run,
+                        shard=cli_shard(locale))
+    for error in result['errors']:
+        click.echo(f"Error: {error}", err=True)
+    if result['error_count']:
+        raise click.ClickException(f"{result['error_count']} error(es) en {result['rows']} filas; no se importó nada")
+    for name, stats in result['categories'].items():
+        click.echo(f"{stats['file']}: {name}: +{stats['added']} palabras "
+                   f"({stats['duplicates']} repetidas, {stats['total']} en total)")
+    verb = 'Se importarían' if dry_run else 'Importadas'
+    click.echo(f"{verb} {result['added']} palabras de {result['rows']} filas")
+
 if __name__ == '__main__':
     # Asegúrate de tener la carpeta 'categorias' con archivos JSON
     app.run(debug=True, port=5000)
\ No newline at end of file
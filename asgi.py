@@ -0,0 +1,270 @@
+"""
+Punto de entrada ASGI para servir el juego con muchas conexiones simultáneas.
+
+    uvicorn asgi:asgi --host 0.0.0.0 --port 8000
+    hypercorn asgi:asgi --bind 0.0.0.0:8000
+
+Las vistas de Flask (app.py) se ejecutan tal cual en un grupo de hilos, así que
+el bucle de eventos nunca se bloquea con la sesión, el catálogo o las
+plantillas. El cuerpo de la petición se lee bajo demanda desde el hilo (las
+importaciones grandes no se cargan enteras en memoria) y la respuesta se envía
+trozo a trozo, con las respuestas en streaming (JSON Lines) incluidas.
+
+Lo que sí es nativo de asyncio son las conexiones de larga duración: el hub de
+salas se ejecuta en el bucle del servidor y cada conexión SSE de
+/room/<código>/events es sólo una `asyncio.Queue` y una corrutina, en lugar de
+un hilo bloqueado. Las cuentas atrás de las salas son tareas asyncio en ese
+mismo bucle (ver RoomHub.start_timer).
+"""
+import asyncio
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import ROOM_EVENT_QUEUE_SIZE, app, metrics, room_hub, room_membership
+from rooms import DROPPED_EVENT, RoomError, format_sse
+
+# Hilos para las vistas WSGI (cada uno atiende una petición a la vez)
+WSGI_THREADS = int(os.environ.get('UNDERCOVER_WSGI_THREADS', '64'))
+# Segundos sin eventos tras los que se envía un comentario SSE para mantener viva la conexión
+SSE_PING_SECONDS = 15
+SSE_HEADERS = [(b'content-type', b'text/event-stream; charset=utf-8'), (b'cache-control', b'no-cache'),
+               (b'x-accel-buffering', b'no')]
+
+
+class _BodyReader(io.RawIOBase):
+    """wsgi.input: lee el cuerpo de la petición ASGI desde el hilo de la vista"""
+
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._buffer = b''
+        self._more = True
+
+    def readable(self):
+        return True
+
+    def readinto(self, target):
+        while not self._buffer and self._more:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._more = False
+                break
+            self._buffer = message.get('body', b'')
+            self._more = message.get('more_body', False)
+        size = min(len(target), len(self._buffer))
+        target[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+class _ResponseWriter:
+    """start_response y envío del cuerpo al bucle, llamados desde el hilo de la vista"""
+
+    def __init__(self, send, loop):
+        self._send = send
+        self._loop = loop
+        self.status = None
+        self.headers = None
+        self.started = False
+        self.remaining = None
+
+    def start_response(self, status, headers, exc_info=None):
+        if exc_info and self.started:
+            raise exc_info[1].with_traceback(exc_info[2])
+        self.status = int(status.split(' ', 1)[0])
+        self.headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+        for name, value in self.headers:
+            if name == b'content-length':
+                self.remaining = int(value)
+        return self._write_legacy
+
+    def _write_legacy(self, data):
+        self.write(data)
+
+    def write(self, data, last=False):
+        """Envía un trozo; con Content-Length el último trozo cierra la respuesta sin un mensaje extra"""
+        messages = []
+        if not self.started:
+            messages.append({'type': 'http.response.start', 'status': self.status, 'headers': self.headers})
+            self.started = True
+        if self.remaining is not None:
+            self.remaining -= len(data)
+            last = last or self.remaining <= 0
+        if data or last:
+            messages.append({'type': 'http.response.body', 'body': data, 'more_body': not last})
+        if messages:
+            asyncio.run_coroutine_threadsafe(self._send_all(messages), self._loop).result()
+        return last
+
+    async def _send_all(self, messages):
+        for message in messages:
+            await self._send(message)
+
+
+class UndercoverASGI:
+    """Aplicación ASGI: rutas nativas de asyncio y el resto de la app Flask en un grupo de hilos"""
+
+    def __init__(self, wsgi_app, hub, threads=WSGI_THREADS):
+        self.wsgi_app = wsgi_app
+        self.hub = hub
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+        self.routes = [('GET', re.compile(r'/room/(?P<code>[^/]+)/events'), self.room_events)]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise RuntimeError(f"Tipo de conexión no soportado: {scope['type']}")
+        self._attach_hub()
+        path = scope['path'][len(scope.get('root_path', '')):]
+        # Las rutas nativas sólo sirven si el hub de salas vive en este mismo bucle
+        if self.hub.loop is asyncio.get_running_loop():
+            for method, pattern, handler in self.routes:
+                match = pattern.fullmatch(path)
+                if match and scope['method'] == method:
+                    return await handler(scope, receive, send, **match.groupdict())
+        await self.call_wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self._attach_hub()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _attach_hub(self):
+        if self.hub.loop is None:
+            self.hub.attach(asyncio.get_running_loop())
+
+    # --- Puente WSGI ---
+
+    def environ(self, scope, body):
+        """Entorno WSGI (PEP 3333) equivalente a una petición ASGI"""
+        root_path = scope.get('root_path', '')
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+            'PATH_INFO': scope['path'][len(root_path):].encode('utf-8').decode('latin-1'),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+            'SERVER_NAME': server[0],
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+            'REMOTE_ADDR': client[0],
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            # El cuerpo termina donde termina la petición ASGI, aunque no haya Content-Length
+            'wsgi.input_terminated': True,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin-1').upper().replace('-', '_')
+            value = value.decode('latin-1')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = 'HTTP_' + name
+            environ[name] = f'{environ[name]},{value}' if name in environ else value
+        return environ
+
+    async def call_wsgi(self, scope, receive, send):
+        loop = asyncio.get_running_loop()
+        body = io.BufferedReader(_BodyReader(receive, loop))
+        writer = _ResponseWriter(send, loop)
+        await loop.run_in_executor(self.executor, self._run_wsgi, self.environ(scope, body), writer)
+
+    def _run_wsgi(self, environ, writer):
+        """Ejecuta la vista e itera su respuesta en el mismo hilo (el contexto de Flask es por hilo)"""
+        result = self.wsgi_app(environ, writer.start_response)
+        try:
+            finished = False
+            for chunk in result:
+                if chunk and writer.write(chunk):
+                    finished = True
+                    break
+            if not finished:
+                writer.write(b'', last=True)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    # --- Rutas nativas ---
+
+    def _membership(self, environ, code):
+        with app.request_context(environ):
+            return room_membership(code)
+
+    async def room_events(self, scope, receive, send, code):
+        """Igual que la vista room_events de app.py, con una asyncio.Queue por conexión"""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        code = code.upper()
+        # La sesión se abre en un hilo: el backend puede ser SQLite
+        membership = await loop.run_in_executor(self.executor, self._membership,
+                                                self.environ(scope, io.BytesIO()), code)
+        token = membership.get('player') or membership.get('host')
+        events = asyncio.Queue(maxsize=ROOM_EVENT_QUEUE_SIZE)
+        try:
+            self.hub.subscribe(code, token, events)
+        except RoomError as e:
+            await send({'type': 'http.response.start', 'status': 403, 'headers': SSE_HEADERS})
+            await send({'type': 'http.response.body', 'body': format_sse('error', {'error': str(e)}).encode('utf-8')})
+            self._record(scope, started, '403')
+            return
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+        disconnected = loop.create_task(self._wait_disconnect(receive))
+        try:
+            while True:
+                next_event = loop.create_task(events.get())
+                done, _ = await asyncio.wait({next_event, disconnected}, timeout=SSE_PING_SECONDS,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if next_event not in done:
+                    next_event.cancel()
+                    if disconnected in done:
+                        break
+                    # Comentario SSE para mantener viva la conexión
+                    await send({'type': 'http.response.body', 'body': b': ping\n\n', 'more_body': True})
+                    continue
+                event, data = next_event.result()
+                if event == DROPPED_EVENT:
+                    # Dado de baja por lento: al cerrar, EventSource reconecta y recibe el estado actual
+                    await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+                    break
+                closed = event == 'closed'
+                await send({'type': 'http.response.body', 'body': format_sse(event, data).encode('utf-8'),
+                            'more_body': not closed})
+                if closed:
+                    break
+        except OSError:
+            # El cliente cerró la conexión mientras se enviaba
+            pass
+        finally:
+            disconnected.cancel()
+            self.hub.unsubscribe(code, events)
+            self._record(scope, started, '200')
+
+    async def _wait_disconnect(self, receive):
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    def _record(self, scope, started, status):
+        """Mismas métricas que el middleware WSGI (ver metrics.py)"""
+        labels = (('route', '/room/<code>/events'), ('method', scope['method']))
+        metrics.observe('undercover_request_duration_seconds', labels, time.perf_counter() - started)
+        metrics.inc('undercover_requests_total', labels + (('status', status),))
+
+
+asgi = UndercoverASGI(app.wsgi_app, room_hub)
@@ -0,0 +1,60 @@
+// 1. Variable global para almacenar el ID del intervalo del temporizador
+let countdownInterval;
+
+// Función para mostrar la información del impostor y ocultar el botón
+function mostrarImpostores() {
+    // DETENER EL TEMPORIZADOR AQUI
+    if (countdownInterval) {
+        clearInterval(countdownInterval);
+        const display = document.getElementById('countdown');
+        // Si el tiempo no había terminado, muestra un mensaje de detención
+        if (display && display.textContent.includes(":")) {
+            display.textContent = "00:00 - ¡DETENIDO!";
+        }
+    }
+
+    const infoDiv = document.getElementById('impostor-info');
+    const btn = document.getElementById('mostrar-btn');
+
+    if (infoDiv) {
+        // Se usa scrollHeight para la animación de revelación
+        infoDiv.style.maxHeight = infoDiv.scrollHeight + "px";
+        infoDiv.style.opacity = '1';
+    }
+    if (btn) {
+        btn.style.display = 'none'; // Oculta el botón después de presionar
+    }
+}
+
+// FUNCIÓN DE CUENTA REGRESIVA
+function iniciarCuentaRegresiva(duracion, display) {
+    let timer = duracion, minutos, segundos;
+
+    // 2. Almacenar el intervalo en la variable global
+    countdownInterval = setInterval(function () {
+        minutos = parseInt(timer / 60, 10);
+        segundos = parseInt(timer % 60, 10);
+
+        minutos = minutos < 10 ? "0" + minutos : minutos;
+        segundos = segundos < 10 ? "0" + segundos : segundos;
+
+        display.textContent = minutos + ":" + segundos;
+
+        if (--timer < 0) {
+            clearInterval(countdownInterval); // Limpia la variable global al terminar
+            display.textContent = "¡Tiempo terminado!";
+            // Opcional: habilitar el botón de 'Mostrar Impostores' si estaba deshabilitado
+        }
+    }, 1000);
+}
+
+// --- PUNTO CLAVE: UNIFICAR LA INICIALIZACIÓN ---
+document.addEventListener('DOMContentLoaded', function() {
+    // Inicializar la cuenta regresiva de 3 minutos (180 segundos)
+    const tresMinutos = 60 * 3;
+    const display = document.getElementById('countdown');
+    // data-autostart="false": la inicia otro script (modo una sola petición, ver round.js)
+    if (display && display.dataset.autostart !== 'false') {
+        iniciarCuentaRegresiva(tresMinutos, display);
+    }
+});
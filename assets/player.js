@@ -0,0 +1,43 @@
+// Función para revelar u ocultar la información (palabra o rol)
+function revealInfo(isPressed, isImpostor) {
+    const card = document.getElementById('secret-info-display');
+    const hintBox = document.getElementById('impostor-hint-box'); // Nuevo
+
+    if (card) {
+        if (isPressed) {
+            // REVELAR
+            card.style.color = card.getAttribute('data-revealed-color');
+
+            if (isImpostor) {
+                // Si es impostor: cambia fondo a rojo y quita el límite de altura
+                card.style.background = '#ff6b6b';
+                card.style.fontSize = '1.5em';
+                card.style.maxHeight = '500px';
+                if (hintBox) {
+                    hintBox.style.display = 'block'; // Muestra la pista
+                }
+            } else {
+                // Civil
+                card.style.background = 'white';
+                card.style.fontSize = '2em';
+            }
+        } else {
+            // OCULTAR
+            setTimeout(() => {
+                card.style.color = card.getAttribute('data-hidden-color');
+
+                // Ambas tarjetas deben volver al estado visual de camuflaje
+                card.style.background = 'white';
+                card.style.fontSize = '2em';
+
+                if (isImpostor) {
+                    // Restablece la altura máxima y oculta la pista
+                    card.style.maxHeight = '140px';
+                    if (hintBox) {
+                        hintBox.style.display = 'none'; // Oculta la pista
+                    }
+                }
+            }, 50);
+        }
+    }
+}
@@ -0,0 +1,65 @@
+let currentCard = null;
+
+function showCard(isPressed) {
+    const box = document.getElementById('secret-info-display');
+    const hint = document.getElementById('card-hint');
+    if (!box || !currentCard) return;
+    if (isPressed) {
+        box.style.background = currentCard.is_impostor ? '#ff6b6b' : 'white';
+        box.style.color = currentCard.is_impostor ? 'white' : '#667eea';
+        if (hint && currentCard.hint) hint.style.display = 'block';
+    } else {
+        box.style.background = 'white';
+        box.style.color = 'white';
+        if (hint) hint.style.display = 'none';
+    }
+}
+
+// La URL del stream viene del atributo data-events-url de la etiqueta <script>
+const events = new EventSource(document.currentScript.dataset.eventsUrl);
+events.addEventListener('players', function (e) {
+    const data = JSON.parse(e.data);
+    const list = document.getElementById('players');
+    list.innerHTML = '';
+    data.players.forEach(function (name) {
+        const item = document.createElement('li');
+        item.textContent = name;
+        list.appendChild(item);
+    });
+    document.getElementById('player-count').textContent = data.players.length;
+});
+events.addEventListener('round', function (e) {
+    const data = JSON.parse(e.data);
+    document.getElementById('round-label').textContent =
+        'Ronda ' + data.round + ' en curso (' + data.total_players + ' jugadores)';
+    document.getElementById('results').style.display = 'none';
+});
+events.addEventListener('card', function (e) {
+    currentCard = JSON.parse(e.data);
+    document.getElementById('card-box').style.display = 'block';
+    document.getElementById('card-title').textContent = currentCard.player + ' (ronda ' + currentCard.round + ')';
+    document.getElementById('card-text').textContent =
+        currentCard.is_impostor ? 'ERES EL IMPOSTOR' : currentCard.palabra;
+    const hint = document.getElementById('card-hint');
+    hint.textContent = currentCard.hint ? '💡 Pista de apoyo: ' + currentCard.hint : '';
+    showCard(false);
+});
+events.addEventListener('results', function (e) {
+    const data = JSON.parse(e.data);
+    document.getElementById('result-start').textContent = data.jugador_inicial;
+    document.getElementById('result-impostors').textContent = data.impostor_names.join(', ');
+    document.getElementById('result-category').textContent = data.categoria;
+    document.getElementById('result-word').textContent = data.palabra;
+    document.getElementById('results').style.display = 'block';
+});
+events.addEventListener('timer', function (e) {
+    const remaining = JSON.parse(e.data).remaining;
+    const minutes = Math.floor(remaining / 60);
+    const seconds = String(remaining % 60).padStart(2, '0');
+    document.getElementById('timer-label').textContent =
+        remaining > 0 ? '⏱️ ' + minutes + ':' + seconds : '⏱️ ¡Tiempo! A votar';
+});
+events.addEventListener('closed', function () {
+    events.close();
+    document.getElementById('round-label').textContent = 'La sala se cerró por inactividad.';
+});
@@ -0,0 +1,104 @@
+// Modo una sola petición: la ronda entera viene en #round-bundle (ver round_bundle.py)
+// y se juega aquí sin volver a llamar al servidor. Usa revealInfo() de player.js e
+// iniciarCuentaRegresiva()/mostrarImpostores() de complete.js.
+const bundle = JSON.parse(document.getElementById('round-bundle').textContent);
+const completeUrl = document.currentScript.dataset.completeUrl;
+const box = document.getElementById('secret-info-display');
+const cardText = document.getElementById('card-text');
+// Se guarda la referencia porque su id cambia al abrir la tarjeta (ver showCard)
+const cardHint = document.getElementById('card-hint');
+let currentPlayer = 0;
+let currentCard = null;
+
+function randomInt(min, max) {
+    const values = new Uint32Array(1);
+    crypto.getRandomValues(values);
+    return min + (values[0] % (max - min + 1));
+}
+
+// Mismo criterio que generate_random_pastel_color() en app.py: canales oscuros y uno brillante
+function brightColor() {
+    const rgb = [randomInt(0, 150), randomInt(0, 150), randomInt(0, 150)];
+    rgb[randomInt(0, 2)] = randomInt(200, 255);
+    return '#' + rgb.map(function (c) { return c.toString(16).padStart(2, '0'); }).join('');
+}
+
+const colors = bundle.players.map(brightColor);
+
+// Tarjeta sellada: JSON XOR una clave del mismo tamaño, ambos en base64
+function unseal(sealed) {
+    const data = atob(sealed.data);
+    const pad = atob(sealed.pad);
+    const bytes = new Uint8Array(data.length);
+    for (let i = 0; i < data.length; i++) {
+        bytes[i] = data.charCodeAt(i) ^ pad.charCodeAt(i);
+    }
+    return JSON.parse(new TextDecoder().decode(bytes));
+}
+
+function showPlayer() {
+    const total = bundle.players.length;
+    document.getElementById('round-card').style.background = colors[currentPlayer];
+    document.getElementById('round-player').textContent =
+        bundle.players[currentPlayer].name + ' (' + (currentPlayer + 1) + '/' + total + ')';
+    document.getElementById('next-btn').textContent =
+        currentPlayer + 1 < total ? 'Siguiente Jugador →' : 'Comenzar a Jugar';
+}
+
+// La tarjeta sólo se abre mientras se mantiene pulsada la caja; al soltar se borra del DOM
+function showCard(isPressed) {
+    if (isPressed) {
+        currentCard = unseal(bundle.players[currentPlayer].card);
+        box.setAttribute('data-revealed-color', currentCard.is_impostor ? 'white' : '#667eea');
+        cardText.textContent = currentCard.is_impostor ? 'ERES EL IMPOSTOR' : currentCard.palabra;
+        cardHint.textContent = currentCard.hint ? '💡 Pista de apoyo: ' + currentCard.hint : '';
+        // revealInfo() sólo muestra la caja de la pista si existe un elemento con ese id
+        cardHint.id = currentCard.hint ? 'impostor-hint-box' : 'card-hint';
+        revealInfo(true, currentCard.is_impostor);
+    } else if (currentCard) {
+        revealInfo(false, currentCard.is_impostor);
+        currentCard = null;
+        setTimeout(function () {
+            cardText.textContent = '';
+            cardHint.textContent = '';
+            cardHint.style.display = 'none';
+            cardHint.id = 'card-hint';
+        }, 60);
+    }
+}
+
+function showComplete() {
+    document.getElementById('pass-view').style.display = 'none';
+    document.getElementById('complete-view').style.display = 'block';
+    document.getElementById('start-player').textContent =
+        bundle.players[randomInt(0, bundle.players.length - 1)].name;
+    iniciarCuentaRegresiva(bundle.countdown, document.getElementById('countdown'));
+    // Aviso al servidor para el historial; sin conexión se pierde y la ronda sigue igual
+    if (completeUrl && navigator.sendBeacon) {
+        navigator.sendBeacon(completeUrl, new Blob([JSON.stringify(bundle)], {type: 'application/json'}));
+    }
+}
+
+function revealResults() {
+    const results = unseal(bundle.results);
+    document.getElementById('result-impostors').textContent = results.impostor_names.join(', ');
+    document.getElementById('result-category').textContent = results.categoria;
+    document.getElementById('result-word').textContent = results.palabra;
+    mostrarImpostores();
+}
+
+box.addEventListener('pointerdown', function () { showCard(true); });
+['pointerup', 'pointerleave', 'pointercancel'].forEach(function (name) {
+    box.addEventListener(name, function () { showCard(false); });
+});
+document.getElementById('next-btn').addEventListener('click', function () {
+    showCard(false);
+    currentPlayer += 1;
+    if (currentPlayer < bundle.players.length) {
+        showPlayer();
+    } else {
+        showComplete();
+    }
+});
+document.getElementById('mostrar-btn').addEventListener('click', revealResults);
+showPlayer();
@@ -0,0 +1,13 @@
+// Las opciones de muchos impostores sólo se ofrecen con «Sala grande» marcada
+const largeRoom = document.getElementById('large_room');
+const impostorSelect = document.getElementById('num_impostors');
+
+function toggleLargeOptions() {
+    impostorSelect.querySelectorAll('option[data-large-room]').forEach(function (option) {
+        option.hidden = option.disabled = !largeRoom.checked;
+    });
+    if (impostorSelect.selectedOptions[0].disabled) impostorSelect.value = '1';
+}
+
+largeRoom.addEventListener('change', toggleLargeOptions);
+toggleLargeOptions();
@@ -0,0 +1,210 @@
+"""
+Benchmark de concurrencia: servidor WSGI con hilos frente al punto de entrada ASGI.
+
+Arranca cada servidor en un subproceso sobre un catálogo sintético y lanza
+--connections conexiones HTTP/1.1 simultáneas (keep-alive si el servidor lo
+admite) desde un único bucle asyncio, cada una pidiendo GET --path en bucle
+durante --seconds. Con --sse N
+se mantienen además N conexiones SSE abiertas (una sala por conexión), como
+jugadores esperando su tarjeta, mientras se mide.
+
+    wsgi   werkzeug con un hilo por conexión (python app.py)
+    asgi   uvicorn asgi:asgi (se omite si uvicorn no está instalado)
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_asgi.py [--connections 1000] [--seconds 10] [--sse 1000]
+"""
+import argparse
+import asyncio
+import importlib.util
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import write_corpus  # noqa: E402
+from benchmarks.load_test import percentile  # noqa: E402
+
+
+def raise_file_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def serve(server, port):
+    """Subproceso: sirve la aplicación con el servidor indicado"""
+    raise_file_limit()
+    if server == 'asgi':
+        import uvicorn
+        uvicorn.run('asgi:asgi', host='127.0.0.1', port=port, log_level='warning', backlog=4096)
+        return
+    from werkzeug.serving import WSGIRequestHandler, make_server
+    from app import app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    make_server('127.0.0.1', port, app, threaded=True, request_handler=QuietHandler).serve_forever()
+
+
+async def read_response(reader):
+    """Lee una respuesta HTTP/1.1 (Content-Length o chunked); devuelve (estado, cabeceras)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('conexión cerrada')
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.setdefault(name.strip().lower(), []).append(value.strip())
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length'][0]))
+    elif 'chunked' in headers.get('transfer-encoding', [''])[0]:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return int(status_line.split()[1]), headers
+
+
+async def request(reader, writer, method, path, headers=()):
+    lines = [f'{method} {path} HTTP/1.1', 'Host: 127.0.0.1', 'Content-Length: 0', *headers, '', '']
+    writer.write('\r\n'.join(lines).encode('latin-1'))
+    return await read_response(reader)
+
+
+async def wait_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            await request(reader, writer, 'GET', '/healthz')
+            writer.close()
+            return
+        except (OSError, ConnectionError):
+            await asyncio.sleep(0.2)
+    raise RuntimeError('el servidor no arrancó')
+
+
+async def open_sse(port):
+    """Crea una sala y abre su conexión de eventos; devuelve el writer para cerrarla después"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    form = 'selected_categories=Categoria+0'
+    writer.write((f'POST /room/new HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                  f'Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(form)}\r\n\r\n'
+                  f'{form}').encode('latin-1'))
+    status, headers = await read_response(reader)
+    writer.close()
+    if 'location' not in headers:
+        raise RuntimeError(f'POST /room/new respondió {status}')
+    path = headers['location'][0].split('127.0.0.1', 1)[-1].split(':', 1)[-1].lstrip('0123456789')
+    cookie = headers['set-cookie'][0].split(';', 1)[0]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'GET {path}/events HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {cookie}\r\n\r\n'.encode('latin-1'))
+    status_line = await reader.readline()
+    if b' 200 ' not in status_line:
+        raise RuntimeError(f'SSE respondió {status_line!r}')
+    return writer
+
+
+async def load(port, connections, seconds, path):
+    latencies, errors = [], 0
+    deadline = time.monotonic() + seconds
+
+    async def client():
+        nonlocal errors
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        except OSError:
+            errors += 1
+            return
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                if reader is None:
+                    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                status, headers = await request(reader, writer, 'GET', path)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError):
+                errors += 1
+                return
+            if status != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+            # El servidor de desarrollo de werkzeug no mantiene la conexión abierta
+            if headers.get('connection', [''])[0].lower() == 'close':
+                writer.close()
+                reader = None
+        if reader is not None:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def measure(port, args):
+    await wait_ready(port)
+    sse = await asyncio.gather(*(open_sse(port) for _ in range(args.sse)))
+    latencies, errors, elapsed = await load(port, args.connections, args.seconds, args.path)
+    for writer in sse:
+        writer.close()
+    latencies.sort()
+    return {'requests': len(latencies), 'rps': len(latencies) / elapsed, 'errors': errors,
+            'p50_ms': percentile(latencies, 0.50) * 1000, 'p99_ms': percentile(latencies, 0.99) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', type=int, default=1000)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--sse', type=int, default=0, help='conexiones SSE abiertas durante la medición')
+    parser.add_argument('--path', default='/healthz')
+    parser.add_argument('--words', type=int, default=1000)
+    parser.add_argument('--servers', default='wsgi,asgi')
+    parser.add_argument('--serve', nargs=2, metavar=('SERVIDOR', 'PUERTO'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.serve[0], int(args.serve[1]))
+
+    raise_file_limit()
+    print(f'conexiones={args.connections} sse={args.sse} ruta={args.path} segundos={args.seconds}')
+    print(f"{'servidor':<8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'errores':>8}")
+    with tempfile.TemporaryDirectory() as categories_dir:
+        write_corpus(categories_dir, args.words, 10)
+        # Sin límite de peticiones (todas las salas SSE se crean desde la misma IP) ni historial
+        env = dict(os.environ, UNDERCOVER_CATEGORIES_DIR=categories_dir, UNDERCOVER_RATE_LIMITS='',
+                   UNDERCOVER_HISTORY_DB='')
+        for server in args.servers.split(','):
+            if server == 'asgi' and importlib.util.find_spec('uvicorn') is None:
+                print(f'{server:<8} omitido: pip install uvicorn')
+                continue
+            port = free_port()
+            process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', server, str(port)],
+                                       cwd=ROOT, env=env)
+            try:
+                r = asyncio.run(measure(port, args))
+            finally:
+                process.terminate()
+                process.wait()
+            print(f"{server:<8} {r['rps']:>10.1f} {r['p50_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
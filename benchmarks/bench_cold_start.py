@@ -0,0 +1,81 @@
+"""
+Arranque en frío y memoria: JSON de categorías contra el paquete compilado.
+
+Para cada tamaño genera un catálogo sintético, lo compila con build_pack()
+y mide en un proceso nuevo (para que sea realmente "en frío") el tiempo de
+carga del catálogo, el primer sorteo y la memoria retenida.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_cold_start.py [--sizes 1000,10000,100000] [--categories 50]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import write_corpus  # noqa: E402
+
+
+def measure(directory, source):
+    """Se ejecuta en un subproceso: carga el catálogo y devuelve las medidas como JSON"""
+    from catalog import CategoryCatalog
+    from catalog_pack import pack_path
+
+    if source == 'json' and os.path.exists(pack_path(directory)):
+        os.remove(pack_path(directory))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    catalog = CategoryCatalog(directory)
+    snapshot = catalog.reload()
+    load_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    snapshot.index.choose(list(snapshot.word_counts))
+    first_draw_seconds = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    assert catalog.source == source, catalog.source
+    print(json.dumps({'load_ms': load_seconds * 1000, 'first_draw_ms': first_draw_seconds * 1000,
+                      'retained_mb': current / 1e6, 'peak_mb': peak / 1e6}))
+
+
+def run_measure(directory, source):
+    output = subprocess.check_output([sys.executable, __file__, '--measure', source, directory], cwd=ROOT)
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--measure', nargs=2, metavar=('FUENTE', 'DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure[1], args.measure[0])
+        return
+
+    from catalog import CategoryCatalog
+    from catalog_pack import build_pack, pack_path
+
+    print(f"{'palabras':>9} {'fuente':<6} {'carga ms':>10} {'1er sorteo ms':>14} {'retenida MB':>12} {'pico MB':>9}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        with tempfile.TemporaryDirectory() as directory:
+            write_corpus(directory, size, args.categories)
+            results = {'json': run_measure(directory, 'json')}
+            categories, sources, errors = CategoryCatalog(directory).load_sources()
+            build_pack(categories, sources, pack_path(directory))
+            results['pack'] = run_measure(directory, 'pack')
+        for source, r in results.items():
+            print(f"{size:>9} {source:<6} {r['load_ms']:>10.1f} {r['first_draw_ms']:>14.3f} "
+                  f"{r['retained_mb']:>12.2f} {r['peak_mb']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
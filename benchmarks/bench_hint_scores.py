@@ -0,0 +1,69 @@
+"""
+Benchmark del cálculo de ambigüedad de pistas (hint_scores.score_hints) y de
+la selección de pistas por banda en cada petición.
+
+Las pistas del catálogo sintético se sacan de un vocabulario con distribución
+de Pareto, para que haya pistas muy repetidas ("Grande") y pistas únicas.
+
+Uso (desde la raíz del repositorio, requiere NumPy):
+    python benchmarks/bench_hint_scores.py [--words 100000] [--categories 50]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import synthetic_categories  # noqa: E402
+import hint_scores  # noqa: E402
+from word_index import WordIndex  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--words', type=int, default=100000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--hints', type=int, default=8, help='pistas por palabra')
+    parser.add_argument('--draws', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    categories = synthetic_categories(args.words, args.categories, args.hints)
+    vocabulary = args.words // 2
+    for cat in categories.values():
+        for word_data in cat['palabras']:
+            word_data['pistas'] = [f'pista {int(rng.paretovariate(1.0)) % vocabulary}' for _ in range(args.hints)]
+    records = WordIndex(categories).records
+
+    started = time.perf_counter()
+    scores, thresholds = hint_scores.score_hints(records)
+    scoring = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = hint_scores.scores_path(directory)
+        started = time.perf_counter()
+        hint_scores.save_scores(path, scores, thresholds)
+        saving = time.perf_counter() - started
+        bands = hint_scores.HintBands(path)
+        started = time.perf_counter()
+        bands.reload()
+        loading = time.perf_counter() - started
+
+        sample = [records[rng.randrange(len(records))] for _ in range(1000)]
+        started = time.perf_counter()
+        for i in range(args.draws):
+            bands.choose(sample[i % len(sample)], hint_scores.BANDS[i % 3])
+        choosing = time.perf_counter() - started
+
+    print(f'palabras={args.words} pistas={args.words * args.hints}')
+    print(f'puntuación:        {scoring:8.2f} s')
+    print(f'guardar / cargar:  {saving:8.2f} s / {loading:.2f} s')
+    print(f'elegir una pista:  {choosing / args.draws * 1e6:8.2f} µs')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark del historial de rondas (history.HistoryStore).
+
+Encola --rounds rondas sintéticas como lo harían las vistas y mide el coste de
+`record()` en la petición, el ritmo de escritura del hilo de fondo y la
+latencia de las estadísticas con la tabla ya llena.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_history.py [--rounds 1000000] [--words 5000] [--categories 50]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from history import HistoryStore  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rounds', type=int, default=1000000)
+    parser.add_argument('--words', type=int, default=5000)
+    parser.add_argument('--categories', type=int, default=50)
+    parser.add_argument('--queries', type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    now = time.time()
+    # Ronda sintética: palabra con popularidad de Pareto, repartidas en los últimos 90 días
+    rounds = [(f'Categoria {w % args.categories}', f'palabra-{w}', rng.randint(3, 20))
+              for w in (int(rng.paretovariate(1.2)) % args.words for _ in range(args.rounds))]
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, 'history.sqlite3'), queue_size=args.rounds + 1)
+        record_seconds = 0.0
+        started = time.perf_counter()
+        for i, (categoria, palabra, players) in enumerate(rounds):
+            started_at = now - (args.rounds - i) * 90 * 86400 / args.rounds
+            t = time.perf_counter()
+            store.record('local', categoria, palabra, players, 1 + players // 6, True, started_at, started_at + 300)
+            record_seconds += time.perf_counter() - t
+        store.flush()
+        elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(args.queries):
+            stats = store.stats(limit=20, hours=24 * 7, now=now)
+        query = (time.perf_counter() - started) / args.queries
+        size = os.path.getsize(store.path) + os.path.getsize(store.path + '-wal')
+        store.close()
+
+    print(f"rondas={args.rounds} palabras={args.words} categorías={args.categories}")
+    print(f"record() en la petición: {record_seconds / args.rounds * 1e6:8.2f} µs")
+    print(f"escritura en segundo plano: {args.rounds / elapsed:8.0f} rondas/s")
+    print(f"estadísticas:            {query * 1000:8.2f} ms ({stats['total_rounds']} rondas)")
+    print(f"base de datos:           {size / 1e6:8.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark del hub de salas: conexiones simultáneas y latencia de difusión.
+
+Crea R salas con P jugadores cada una, con un suscriptor (asyncio.Queue) por
+jugador como los que usa una conexión SSE, e inicia una ronda en todas las
+salas a la vez. Mide cuánto tarda cada tarjeta en llegar a su suscriptor y la
+memoria que ocupa el hub. Todo ocurre en un solo bucle asyncio, sin HTTP.
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_rooms.py [--rooms 2000] [--players 8]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rooms import RoomHub  # noqa: E402
+
+WORD = {'palabra': 'Elefante', 'categoria': 'Animales', 'pistas': ['Trompa', 'Grande']}
+
+
+def build_round(num_players, deck_state):
+    return WORD, [0], {0: 'Trompa'}, deck_state
+
+
+async def consume(queue, arrivals):
+    """Lee eventos hasta recibir la tarjeta y anota su hora de llegada"""
+    while True:
+        event, data = await queue.get()
+        if event == 'card':
+            arrivals.append(time.perf_counter())
+            return
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * (len(values) - 1)))] if values else 0.0
+
+
+async def run(num_rooms, num_players):
+    hub = RoomHub()
+    hub.attach(asyncio.get_running_loop())
+
+    tracemalloc.start()
+    rooms, tasks, arrivals = [], [], []
+    for r in range(num_rooms):
+        code, host_token = hub.create_room({})
+        for p in range(num_players):
+            token = hub.join(code, f'Jugador {p}')
+            queue = asyncio.Queue(maxsize=100)
+            hub.subscribe(code, token, queue)
+            tasks.append(asyncio.ensure_future(consume(queue, arrivals)))
+        rooms.append((code, host_token))
+    await asyncio.sleep(0)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for code, host_token in rooms:
+        num_players, deck_state, deck_version = hub.round_state(code, host_token)
+        hub.start_round(code, host_token, num_players, deck_version, *build_round(num_players, deck_state))
+    published = time.perf_counter()
+    await asyncio.gather(*tasks)
+    finished = time.perf_counter()
+
+    latencies = [(t - started) * 1000 for t in arrivals]
+    connections = num_rooms * num_players
+    print(f'salas={num_rooms} jugadores/sala={num_players} conexiones={connections}')
+    print(f'memoria del hub (con colas):   {memory / 1e6:8.2f} MB ({memory / connections:.0f} B/conexión)')
+    print(f'publicación de todas las rondas: {(published - started) * 1000:8.2f} ms')
+    print(f'entrega de todas las tarjetas:   {(finished - started) * 1000:8.2f} ms '
+          f'({connections / (finished - started):.0f} tarjetas/s)')
+    print(f'latencia de difusión p50/p99:    {percentile(latencies, 0.5):8.2f} / {percentile(latencies, 0.99):.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rooms', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.rooms, args.players))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Micro-benchmark: select_word_and_hints() contra el índice plano (WordIndex).
+
+Uso (desde la raíz del repositorio):
+    python benchmarks/bench_word_selection.py [--sizes 100,10000,100000] [--categories 20]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from app import select_word_and_hints  # noqa: E402
+from benchmarks.corpus import synthetic_categories  # noqa: E402
+from word_index import WordIndex  # noqa: E402
+
+
+def bench(label, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=5))
+    per_call = best / number * 1e6
+    print(f'  {label:<28} {per_call:12.2f} µs/sorteo')
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100,10000,100000')
+    parser.add_argument('--categories', type=int, default=20)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(',')):
+        categories = synthetic_categories(size, args.categories)
+        # La mitad de las categorías seleccionadas, como en una ronda típica
+        selected = list(categories)[::2]
+        index = WordIndex(categories)
+        number = max(1, 200000 // max(size, 1))
+
+        print(f'{size} palabras, {len(selected)}/{len(categories)} categorías seleccionadas:')
+        legacy = bench('select_word_and_hints()', lambda: select_word_and_hints(categories, selected), number)
+        indexed = bench('WordIndex.choose()', lambda: index.choose(selected), max(number, 10000))
+        print(f'  {"aceleración":<28} {legacy / indexed:12.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Generación de catálogos sintéticos para los benchmarks.
+"""
+import json
+import os
+
+
+def synthetic_categories(num_words, num_categories, hints_per_word=5):
+    """Genera un catálogo en memoria con `num_words` palabras repartidas en categorías"""
+    categories = {}
+    for c in range(num_categories):
+        name = f'Categoria {c}'
+        count = num_words // num_categories + (1 if c < num_words % num_categories else 0)
+        categories[name] = {
+            'categoria': name,
+            'palabras': [{'palabra': f'palabra-{c}-{i}',
+                          'pistas': [f'pista-{c}-{i}-{j}' for j in range(hints_per_word)]}
+                         for i in range(count)]
+        }
+    return categories
+
+
+def write_corpus(directory, num_words, num_categories, hints_per_word=8):
+    """Escribe un catálogo sintético como archivos JSON (uno por categoría) en `directory`"""
+    os.makedirs(directory, exist_ok=True)
+    categories = synthetic_categories(num_words, num_categories, hints_per_word)
+    for c, data in enumerate(categories.values()):
+        with open(os.path.join(directory, f'categoria_{c}.json'), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return list(categories)
@@ -0,0 +1,233 @@
+"""
+Prueba de carga de una ronda completa.
+
+Recorre el flujo real del juego: GET /setup, POST /setup con N jugadores,
+N veces (GET /player, POST /next) y GET /complete. Informa, por ruta, el
+rendimiento (peticiones/s) y la latencia p50/p95/p99.
+
+Modos:
+    --mode client   cliente de pruebas de Flask, dentro del proceso (por defecto)
+    --mode http     servidor HTTP local (werkzeug, con hilos) y clientes concurrentes
+
+El catálogo se genera de forma sintética con el tamaño indicado (--words).
+
+Ejemplos (desde la raíz del repositorio):
+    python benchmarks/load_test.py --words 10000 --rounds 200
+    python benchmarks/load_test.py --mode http --workers 8 --save-baseline baseline.json
+    python benchmarks/load_test.py --baseline baseline.json --threshold 0.25
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import write_corpus  # noqa: E402
+
+ROUTES = ('GET /setup', 'POST /setup', 'GET /player', 'POST /next', 'GET /complete')
+
+
+class Recorder:
+    """Acumula latencias por ruta (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def add(self, route, seconds):
+        with self._lock:
+            self.samples[route].append(seconds)
+
+
+class FlaskClient:
+    """Adaptador sobre el cliente de pruebas de Flask"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None):
+        response = self.client.open(path, method=method, data=data)
+        response.close()
+        return response.status_code
+
+
+class HTTPClient:
+    """Cliente HTTP/1.1 mínimo con keep-alive y manejo de la cookie de sesión"""
+
+    def __init__(self, host, port):
+        self.conn = http.client.HTTPConnection(host, port, timeout=30)
+        self.cookies = {}
+
+    def request(self, method, path, data=None):
+        headers = {}
+        body = None
+        if data is not None:
+            body = urlencode(data, doseq=True)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f'{k}={v}' for k, v in self.cookies.items())
+        self.conn.request(method, path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        response.read()
+        for header in response.headers.get_all('Set-Cookie') or []:
+            pair, _, attributes = header.partition(';')
+            name, _, value = pair.partition('=')
+            if 'Max-Age=0' in attributes or not value:
+                self.cookies.pop(name.strip(), None)
+            else:
+                self.cookies[name.strip()] = value.strip()
+        return response.status
+
+
+def play_round(client, recorder, num_players, categories):
+    """Juega una ronda completa y registra la latencia de cada petición"""
+    def timed(route, method, path, data=None, expected=(200, 302)):
+        started = time.perf_counter()
+        status = client.request(method, path, data)
+        recorder.add(route, time.perf_counter() - started)
+        if status not in expected:
+            raise RuntimeError(f'{route} respondió {status}')
+
+    timed('GET /setup', 'GET', '/setup')
+    timed('POST /setup', 'POST', '/setup', {
+        'player_names': ', '.join(f'Jugador {i}' for i in range(num_players)),
+        'num_impostors': '2' if num_players > 4 else '1',
+        'selected_categories': categories,
+        'hints_enabled': 'on',
+    }, expected=(302,))
+    for _ in range(num_players):
+        timed('GET /player', 'GET', '/player', expected=(200,))
+        timed('POST /next', 'POST', '/next', expected=(302,))
+    timed('GET /complete', 'GET', '/complete', expected=(200,))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+def summarize(recorder, elapsed):
+    results = {}
+    for route in ROUTES:
+        values = sorted(recorder.samples.get(route, []))
+        results[route] = {
+            'count': len(values),
+            'throughput': len(values) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+        }
+    return results
+
+
+def print_report(results, config):
+    print(f"modo={config['mode']} palabras={config['words']} categorías={config['categories']} "
+          f"jugadores={config['players']} rondas={config['rounds']} workers={config['workers']}")
+    print(f"{'ruta':<15} {'n':>7} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, r in results.items():
+        print(f"{route:<15} {r['count']:>7} {r['throughput']:>10.1f} "
+              f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f}")
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """Devuelve la lista de rutas cuya p95 empeoró más de `threshold` respecto a la línea base"""
+    regressions = []
+    for route, r in results.items():
+        base = baseline.get('results', {}).get(route)
+        if not base or not base['p95_ms']:
+            continue
+        ratio = r['p95_ms'] / base['p95_ms']
+        if ratio > 1 + threshold:
+            regressions.append((route, base['p95_ms'], r['p95_ms'], ratio))
+    return regressions
+
+
+def run(args, categories_dir):
+    os.environ['UNDERCOVER_CATEGORIES_DIR'] = categories_dir
+    os.environ['UNDERCOVER_RATE_LIMITS'] = ''  # Todas las rondas salen de la misma IP
+    os.environ['UNDERCOVER_HISTORY_DB'] = ''  # Las rondas de prueba no van al historial
+    categories = write_corpus(categories_dir, args.words, args.categories)
+    from app import app  # El catálogo se carga al importar la aplicación
+
+    recorder = Recorder()
+    server = None
+    if args.mode == 'http':
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def worker(rounds):
+        client = HTTPClient('127.0.0.1', server.server_port) if server else FlaskClient(app)
+        for _ in range(rounds):
+            play_round(client, recorder, args.players, categories)
+
+    worker_rounds = [args.rounds // args.workers + (1 if i < args.rounds % args.workers else 0)
+                     for i in range(args.workers)]
+    # Calentamiento: una ronda fuera de la medición
+    play_round(HTTPClient('127.0.0.1', server.server_port) if server else FlaskClient(app),
+               Recorder(), args.players, categories)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.workers) as pool:
+        for future in [pool.submit(worker, n) for n in worker_rounds]:
+            future.result()
+    elapsed = time.perf_counter() - started
+
+    if server:
+        server.shutdown()
+    return summarize(recorder, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('client', 'http'), default='client')
+    parser.add_argument('--words', type=int, default=1000, help='palabras del catálogo sintético (10 a 100000)')
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--players', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--save-baseline', metavar='ARCHIVO', help='guarda los resultados como línea base JSON')
+    parser.add_argument('--baseline', metavar='ARCHIVO', help='compara con una línea base JSON guardada')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='empeoramiento máximo permitido de la p95 (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    config = {k: getattr(args, k) for k in ('mode', 'words', 'categories', 'players', 'rounds', 'workers')}
+    with tempfile.TemporaryDirectory() as categories_dir:
+        results = run(args, categories_dir)
+    print_report(results, config)
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump({'config': config, 'results': results}, f, indent=2)
+        print(f'Línea base guardada en {args.save_baseline}')
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.threshold)
+        for route, before, after, ratio in regressions:
+            print(f'REGRESIÓN {route}: p95 {before:.2f} ms -> {after:.2f} ms ({ratio:.2f}x)')
+        if regressions:
+            sys.exit(1)
+        print('Sin regresiones respecto a la línea base')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,304 @@
+"""
+Catálogo de categorías en memoria.
+
+Los archivos JSON de la carpeta de categorías se leen una sola vez al arrancar;
+después sólo se vuelven a leer los archivos cuyo tamaño o fecha de modificación
+cambiaron, como mucho una vez cada `check_interval` segundos (o cuando se llama
+explícitamente a `reload()`).
+
+Con `lazy=True` al arrancar sólo se leen las cabeceras de cada archivo
+(nombre y número de palabras, desde un manifiesto) y las palabras de cada
+categoría se cargan cuando se sortean (ver catalog_manifest.py).
+
+Los lectores siempre reciben un `CatalogSnapshot` completo: cada recarga
+construye un snapshot nuevo y lo publica con una sola asignación, así que una
+petición en curso nunca ve un catálogo a medio cargar.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from types import MappingProxyType
+
+from catalog_manifest import (CategoryCache, LazyCategories, LazyRecords, load_manifest, manifest_path,
+                              read_header, save_manifest)
+from catalog_pack import CatalogPack, PackCategories, PackRecords, pack_path
+from word_index import WordIndex
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogSnapshot:
+    """Vista inmutable y versionada del catálogo"""
+
+    __slots__ = ('version', 'categories', 'index', 'word_counts', 'loaded_at', 'load_time')
+
+    def __init__(self, version, categories, loaded_at, load_time, index=None):
+        self.version = version
+        # Nombre de categoría -> datos del JSON ({'categoria', 'palabras'})
+        self.categories = MappingProxyType(categories) if isinstance(categories, dict) else categories
+        # Índice plano para sortear palabras (ver word_index.py)
+        self.index = index if index is not None else WordIndex(categories)
+        # Nombre de categoría -> número de palabras (lo único que necesita la página de configuración)
+        self.word_counts = self.index.word_counts()
+        self.loaded_at = loaded_at
+        self.load_time = load_time
+
+    @property
+    def word_count(self):
+        return len(self.index)
+
+
+class CategoryCatalog:
+    """Catálogo compartido por todo el proceso con recarga incremental"""
+
+    def __init__(self, directory, check_interval=2.0, lazy=False, cache_budget=64 * 1024 * 1024, cache=None):
+        self.directory = directory
+        self.check_interval = check_interval
+        # Carga perezosa: cabeceras al arrancar y palabras bajo demanda en una caché LRU
+        # (`cache` permite compartir una sola caché entre catálogos, p. ej. uno por idioma)
+        self.lazy = lazy
+        self.cache = (cache if cache is not None else CategoryCache(cache_budget)) if lazy else None
+        self._headers = None
+        self._lock = threading.Lock()
+        # Nombre de archivo -> (firma (mtime, tamaño), datos o None si falló)
+        self._files = {}
+        self._snapshot = CatalogSnapshot(0, {}, time.time(), 0.0)
+        self._next_check = 0.0
+        # 'json', 'lazy' o 'pack' (paquete compilado con `flask build-catalog`, ver catalog_pack.py)
+        self.source = 'json'
+        self._pack_state = None
+        self.reload_count = 0
+        self.parse_errors = 0
+
+    def snapshot(self):
+        """Devuelve el snapshot actual, revisando cambios si ya tocaba"""
+        if time.monotonic() >= self._next_check:
+            # Si otro hilo ya está revisando, se sirve el snapshot vigente sin esperar
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._refresh()
+                finally:
+                    self._lock.release()
+        return self._snapshot
+
+    @property
+    def current(self):
+        """Snapshot vigente, sin revisar si cambió algún archivo"""
+        return self._snapshot
+
+    def reload(self):
+        """Fuerza una revisión inmediata de los archivos y devuelve el snapshot"""
+        with self._lock:
+            self._refresh()
+        return self._snapshot
+
+    def _scan(self):
+        """Lista los JSON de la carpeta con su firma (mtime, tamaño)"""
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+        signatures = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    stat = entry.stat()
+                    signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def _load_file(self, filename):
+        try:
+            with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if 'categoria' not in data:
+                raise KeyError('categoria')
+            return data
+        except Exception as e:
+            self.parse_errors += 1
+            logger.error("Error cargando %s: %s", filename, e)
+            return None
+
+    def _refresh(self):
+        started = time.perf_counter()
+        self._next_check = time.monotonic() + self.check_interval
+        signatures = self._scan()
+        if self._refresh_from_pack(signatures, started):
+            return
+        if self.lazy:
+            self._refresh_lazy(signatures, started)
+            return
+
+        changed = self.source != 'json'
+        files = {}
+        for filename in sorted(signatures):
+            signature = signatures[filename]
+            previous = self._files.get(filename)
+            if previous is not None and previous[0] == signature:
+                files[filename] = previous
+                continue
+            files[filename] = (signature, self._load_file(filename))
+            changed = True
+        if len(files) != len(self._files):
+            changed = True
+
+        if not changed and self.reload_count:
+            return
+
+        categories = {}
+        for signature, data in files.values():
+            if data is not None:
+                categories[data['categoria']] = data
+
+        index = None
+        if self.source == 'json' and isinstance(self._snapshot.index.records, list):
+            # Los archivos sin cambios conservan el mismo objeto: sólo se reindexan los demás
+            previous = self._snapshot.categories
+            changed = {name for name, data in categories.items() if previous.get(name) is not data}
+            index = self._snapshot.index.updated(categories, changed)
+        self._files = files
+        self.source = 'json'
+        self._publish(CatalogSnapshot(self._snapshot.version + 1, categories,
+                                      time.time(), time.perf_counter() - started, index=index))
+
+    def _refresh_from_pack(self, signatures, started):
+        """
+        Usa el paquete compilado si existe, es más reciente que todos los JSON y
+        se compiló con los mismos archivos. Devuelve False si hay que usar los JSON.
+        """
+        path = pack_path(self.directory)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_mtime_ns < max((mtime for mtime, size in signatures.values()), default=0):
+            return False
+
+        state = ((stat.st_mtime_ns, stat.st_size), sorted(signatures))
+        if self.source == 'pack' and state == self._pack_state:
+            return True
+        try:
+            pack = CatalogPack(path)
+        except Exception as e:
+            self.parse_errors += 1
+            logger.error("Error abriendo %s: %s", path, e)
+            return False
+        if pack.metadata.get('sources') != state[1]:
+            return False
+
+        ranges = pack.ranges()
+        index = WordIndex.from_records(PackRecords(pack, ranges), ranges)
+        self.source = 'pack'
+        self._pack_state = state
+        self._publish(CatalogSnapshot(self._snapshot.version + 1, PackCategories(pack, ranges),
+                                      time.time(), time.perf_counter() - started, index=index))
+        return True
+
+    def _refresh_lazy(self, signatures, started):
+        """Como _refresh, pero sólo con las cabeceras: parsea únicamente los archivos nuevos o modificados"""
+        path = manifest_path(self.directory)
+        if self._headers is None:
+            self._headers = load_manifest(path)
+        changed = self.source != 'lazy'
+        dirty = False
+        headers = {}
+        for filename in sorted(signatures):
+            signature = signatures[filename]
+            header = self._headers.get(filename)
+            if header is None or header['signature'] != signature:
+                try:
+                    header = read_header(os.path.join(self.directory, filename), signature)
+                except Exception as e:
+                    self.parse_errors += 1
+                    logger.error("Error cargando %s: %s", filename, e)
+                    # Se recuerda el error para no volver a parsear el archivo hasta que cambie
+                    header = {'signature': signature, 'error': str(e)}
+                dirty = changed = True
+            headers[filename] = header
+        if headers.keys() != self._headers.keys():
+            dirty = changed = True
+        if dirty:
+            save_manifest(path, headers)
+        self._headers = headers
+
+        if not changed and self.reload_count:
+            return
+
+        # Igual que con los JSON, si dos archivos tienen la misma categoría gana el último
+        by_name = {}
+        for filename, header in headers.items():
+            if 'error' not in header:
+                by_name[header['categoria']] = (filename, header)
+        entries, ranges, total = [], {}, 0
+        for name, (filename, header) in by_name.items():
+            entries.append((name, filename, header))
+            ranges[name] = (total, total + header['palabras'])
+            total += header['palabras']
+
+        records = LazyRecords(self.directory, entries, self.cache, on_stale=self._recheck_soon)
+        self.source = 'lazy'
+        self._publish(CatalogSnapshot(self._snapshot.version + 1, LazyCategories(records), time.time(),
+                                      time.perf_counter() - started, index=WordIndex.from_records(records, ranges)))
+
+    def _recheck_soon(self):
+        """Un archivo cambió después del último escaneo: se revisa en la próxima petición"""
+        self._next_check = 0.0
+
+    def _publish(self, snapshot):
+        self.reload_count += 1
+        # Publicación atómica del nuevo snapshot
+        self._snapshot = snapshot
+
+    def category_files(self):
+        """Nombre de categoría -> archivo JSON del que sale (el último si hay varios)"""
+        with self._lock:
+            if self.source == 'json' and self._files:
+                return {data['categoria']: filename for filename, (signature, data) in self._files.items()
+                        if data is not None}
+            if self.source == 'lazy':
+                return {header['categoria']: filename for filename, header in self._headers.items()
+                        if 'error' not in header}
+        files = {}
+        for filename, signature in sorted(self._scan().items()):
+            try:
+                files[read_header(os.path.join(self.directory, filename), signature)['categoria']] = filename
+            except Exception:
+                continue
+        return files
+
+    def load_sources(self):
+        """Lee todos los JSON de la carpeta (sin usar el paquete) y devuelve (categorías, archivos, errores)"""
+        categories, errors = {}, []
+        sources = sorted(self._scan())
+        for filename in sources:
+            try:
+                with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                errors.append(f"{filename}: {e}")
+                continue
+            problems = validate_category(data)
+            if problems:
+                errors.extend(f"{filename}: {problem}" for problem in problems)
+            else:
+                categories[data['categoria']] = data
+        return categories, sources, errors
+
+
+def validate_category(data):
+    """Comprueba que `data` siga el esquema {"categoria", "palabras": [{"palabra", "pistas"}]}"""
+    if not isinstance(data, dict):
+        return ['el archivo debe contener un objeto JSON']
+    problems = []
+    if not isinstance(data.get('categoria'), str) or not data['categoria'].strip():
+        problems.append("falta 'categoria' o no es texto")
+    palabras = data.get('palabras')
+    if not isinstance(palabras, list):
+        return problems + ["falta 'palabras' o no es una lista"]
+    for i, word_data in enumerate(palabras):
+        if not isinstance(word_data, dict) or not isinstance(word_data.get('palabra'), str):
+            problems.append(f"palabras[{i}]: falta 'palabra' o no es texto")
+            continue
+        pistas = word_data.get('pistas', [])
+        if not isinstance(pistas, list) or not all(isinstance(p, str) for p in pistas):
+            problems.append(f"palabras[{i}] ({word_data['palabra']}): 'pistas' debe ser una lista de textos")
+    return problems
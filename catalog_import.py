@@ -0,0 +1,421 @@
+"""
+Importación masiva de palabras a la carpeta de categorías.
+
+Acepta tres formatos y los lee fila a fila, con memoria acotada:
+
+    json   un objeto {"categoria", "palabras": [...]} o una lista de ellos
+           (o una lista de filas {"categoria", "palabra", "pistas"})
+    jsonl  una fila o una categoría completa por línea
+    csv    columnas categoria, palabra y pistas (separadas por "|"),
+           o columnas pista1, pista2, ...
+
+Todas las filas se validan antes de tocar nada: se vuelcan por categoría a
+archivos temporales y, sólo si no hubo errores, se escribe el JSON nuevo de
+cada categoría afectada (palabras existentes + nuevas, sin repetir palabras)
+junto al original. Las palabras ya vistas se recuerdan en una tabla SQLite
+temporal, así que la memoria no crece con el tamaño de las categorías. Los
+originales se sustituyen todos al final, cuando ya están escritos todos los
+nuevos; si falla una sustitución se restauran los anteriores. Después basta
+con recargar el catálogo, que sólo vuelve a leer los archivos que cambiaron.
+"""
+import contextlib
+import csv
+import io
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import unicodedata
+
+FORMATS = ('json', 'jsonl', 'csv')
+# Separador de pistas dentro de la columna "pistas" del CSV
+CSV_HINT_SEPARATOR = '|'
+# Errores que se guardan en el resultado (el resto sólo se cuentan)
+MAX_REPORTED_ERRORS = 50
+_READ_SIZE = 64 * 1024
+# Caché de páginas de la tabla de palabras vistas, en KiB (el resto queda en disco)
+SEEN_CACHE_KB = 2048
+_encode_string = json.encoder.encode_basestring
+_encode_compact = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def detect_format(filename=None, content_type=None):
+    """Deduce el formato por la extensión del archivo o el Content-Type"""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    if content_type in ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines'):
+        return 'jsonl'
+    extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension == 'csv':
+        return 'csv'
+    return 'json'
+
+
+# --- Lectura en streaming ---
+
+class _JsonReader:
+    """Lector JSON incremental: decodifica valor a valor sin cargar todo el documento"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.stream.read(_READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Siguiente carácter que no sea espacio ('' al final del documento)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"se esperaba '{char}' y se encontró '{found or 'fin del archivo'}'")
+        self.pos += 1
+
+    def value(self):
+        """Decodifica un valor JSON completo"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # Un número al final del búfer podría continuar en el siguiente bloque
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array(self):
+        """Recorre los elementos de una lista; entrega el lector posicionado en cada uno"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"se esperaba ',' o ']' y se encontró '{separator or 'fin del archivo'}'")
+
+
+def _row(categoria, word_data):
+    if isinstance(word_data, dict):
+        return {'categoria': categoria, 'palabra': word_data.get('palabra'), 'pistas': word_data.get('pistas', [])}
+    return {'categoria': categoria, 'palabra': word_data, 'pistas': []}
+
+
+def _object_rows(reader):
+    """
+    Filas de un objeto JSON: una por palabra si es una categoría ({"categoria", "palabras"})
+    o el propio objeto si es una fila suelta ({"categoria", "palabra", "pistas"})
+    """
+    reader.expect('{')
+    fields, spool, has_words = {}, None, False
+    while reader.peek() != '}':
+        key = reader.value()
+        reader.expect(':')
+        if key == 'palabras' and reader.peek() == '[':
+            has_words = True
+            if isinstance(fields.get('categoria'), str):
+                for item in reader.array():
+                    yield _row(fields['categoria'], item.value())
+            else:
+                # "palabras" antes que "categoria": se guardan en disco hasta conocer la categoría
+                spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+                for item in reader.array():
+                    spool.write(_encode_compact(item.value()) + '\n')
+        else:
+            fields[key] = reader.value()
+        if reader.peek() == ',':
+            reader.pos += 1
+    reader.pos += 1
+    if spool is not None:
+        with spool:
+            spool.seek(0)
+            for line in spool:
+                yield _row(fields.get('categoria'), json.loads(line))
+    elif not has_words:
+        yield _row(fields.get('categoria'), fields)
+
+
+def iter_json_rows(stream):
+    reader = _JsonReader(stream)
+    if reader.peek() == '[':
+        for item in reader.array():
+            if item.peek() == '{':
+                yield from _object_rows(item)
+            else:
+                yield _row(None, item.value())
+    else:
+        yield from _object_rows(reader)
+    if reader.peek():
+        raise ValueError("contenido extra después del documento JSON")
+
+
+def iter_jsonl_rows(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        data = json.loads(line)
+        if isinstance(data, dict) and isinstance(data.get('palabras'), list):
+            for word_data in data['palabras']:
+                yield _row(data.get('categoria'), word_data)
+        elif isinstance(data, dict):
+            yield _row(data.get('categoria'), data)
+        else:
+            yield _row(None, data)
+
+
+def iter_csv_rows(stream):
+    reader = csv.reader(stream)
+    columns = next(reader, [])
+    if 'categoria' not in columns or 'palabra' not in columns:
+        raise ValueError("el CSV debe tener las columnas 'categoria' y 'palabra'")
+    cat_column, word_column = columns.index('categoria'), columns.index('palabra')
+    hints_column = columns.index('pistas') if 'pistas' in columns else None
+    hint_columns = [i for i, c in enumerate(columns) if c != 'pistas' and c.startswith('pista')]
+    width = len(columns)
+    for record in reader:
+        if not record:
+            continue
+        if len(record) < width:
+            record += [''] * (width - len(record))
+        pistas = record[hints_column].split(CSV_HINT_SEPARATOR) if hints_column is not None and record[hints_column] else []
+        pistas.extend(record[i] for i in hint_columns if record[i])
+        yield {'categoria': record[cat_column], 'palabra': record[word_column], 'pistas': pistas}
+
+
+def iter_rows(stream, fmt):
+    """Filas {'categoria', 'palabra', 'pistas'} de `stream` (texto o binario UTF-8)"""
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        return iter_csv_rows(stream)
+    if fmt == 'jsonl':
+        return iter_jsonl_rows(stream)
+    return iter_json_rows(stream)
+
+
+# --- Validación y escritura ---
+
+def clean_row(row):
+    """Valida una fila con el esquema de las categorías y la normaliza; devuelve (fila, problema)"""
+    categoria, palabra, pistas = row.get('categoria'), row.get('palabra'), row.get('pistas')
+    if not isinstance(categoria, str) or not categoria.strip():
+        return None, "falta 'categoria' o no es texto"
+    if not isinstance(palabra, str) or not palabra.strip():
+        return None, "falta 'palabra' o no es texto"
+    if not isinstance(pistas, list) or not all(isinstance(p, str) for p in pistas):
+        return None, f"({palabra}): 'pistas' debe ser una lista de textos"
+    return {'categoria': categoria.strip(), 'palabra': palabra.strip(),
+            'pistas': [p.strip() for p in pistas if p.strip()]}, None
+
+
+def category_filename(name, taken):
+    """Nombre de archivo para una categoría nueva: 'Países y Ciudades' -> 'paises_y_ciudades.json'"""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    base = re.sub(r'[^a-z0-9]+', '_', ascii_name.lower()).strip('_') or 'categoria'
+    filename, n = f'{base}.json', 1
+    while filename in taken:
+        n += 1
+        filename = f'{base}_{n}.json'
+    return filename
+
+
+def _format_word(palabra, pistas):
+    """Una palabra con el mismo formato que los JSON del repositorio (indent=2), sin el codificador lento de indent"""
+    hints = '[\n' + ',\n'.join('        ' + _encode_string(p) for p in pistas) + '\n      ]' if pistas else '[]'
+    return '    {\n      "palabra": ' + _encode_string(palabra) + ',\n      "pistas": ' + hints + '\n    }'
+
+
+def _existing_words(path):
+    """Palabras de un JSON de categoría, leídas en streaming"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for row in iter_json_rows(f):
+            yield {'palabra': row['palabra'], 'pistas': row['pistas']}
+
+
+class _SeenWords:
+    """Palabras ya vistas por categoría (en minúsculas) en una tabla SQLite temporal"""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=OFF')
+        self.conn.execute('PRAGMA synchronous=OFF')
+        self.conn.execute(f'PRAGMA cache_size=-{SEEN_CACHE_KB}')
+        self.conn.execute('CREATE TABLE seen (categoria TEXT, palabra TEXT, PRIMARY KEY (categoria, palabra))'
+                          ' WITHOUT ROWID')
+
+    def add(self, categoria, palabra):
+        """Anota la palabra; devuelve False si ya estaba"""
+        cursor = self.conn.execute('INSERT OR IGNORE INTO seen VALUES (?, ?)', (categoria, palabra.casefold()))
+        return cursor.rowcount == 1
+
+    def close(self):
+        self.conn.close()
+
+
+def _replace_all(pending):
+    """
+    Sustituye cada archivo por su temporal ([(temporal, archivo)]). Si falla una
+    sustitución se restauran los originales de las anteriores y se relanza el error.
+    """
+    done = []
+    try:
+        for tmp_path, path in pending:
+            backup = None
+            if os.path.exists(path):
+                backup = path + '.bak'
+                os.replace(path, backup)
+            done.append((path, backup))
+            os.replace(tmp_path, path)
+    except OSError:
+        for path, backup in reversed(done):
+            if backup:
+                os.replace(backup, path)
+            elif os.path.exists(path):
+                os.remove(path)
+        raise
+    for path, backup in done:
+        if backup:
+            os.remove(backup)
+
+
+def import_rows(rows, directory, category_files, dry_run=False):
+    """
+    Valida e importa `rows` en `directory`. `category_files` es categoría -> archivo
+    existente. Si hay algún error no se escribe nada. Devuelve un resumen.
+    """
+    result = {'rows': 0, 'added': 0, 'duplicates': 0, 'categories': {}, 'errors': [], 'error_count': 0}
+
+    def error(message):
+        result['error_count'] += 1
+        if len(result['errors']) < MAX_REPORTED_ERRORS:
+            result['errors'].append(message)
+
+    with tempfile.TemporaryDirectory() as spool_dir:
+        spools = {}
+        try:
+            try:
+                for number, row in enumerate(rows, 1):
+                    result['rows'] = number
+                    row, problem = clean_row(row)
+                    if problem:
+                        error(f"fila {number}: {problem}")
+                        continue
+                    if result['error_count']:
+                        # Ya no se va a escribir nada: sólo se sigue validando
+                        continue
+                    spool = spools.get(row['categoria'])
+                    if spool is None:
+                        spool = spools[row['categoria']] = open(
+                            os.path.join(spool_dir, f'{len(spools)}.jsonl'), 'w+', encoding='utf-8')
+                    spool.write(_encode_compact([row['palabra'], row['pistas']]) + '\n')
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                error(f"fila {result['rows'] + 1}: {e}")
+            if result['error_count']:
+                return result
+
+            taken = set(os.listdir(directory)) if os.path.isdir(directory) else set()
+            seen = _SeenWords(os.path.join(spool_dir, 'seen.db'))
+            # (temporal, archivo) ya escritos y pendientes de sustituir
+            pending = []
+            try:
+                for name, spool in spools.items():
+                    filename = category_files.get(name)
+                    if filename is None:
+                        filename = category_filename(name, taken)
+                        taken.add(filename)
+                    path = os.path.join(directory, filename)
+                    tmp_path = None if dry_run else path + '.tmp'
+                    if tmp_path:
+                        pending.append((tmp_path, path))
+                    try:
+                        stats = _merge_category(name, spool, path, seen, tmp_path)
+                    except (ValueError, UnicodeDecodeError) as e:
+                        error(f"{filename}: no se pudo leer el archivo existente: {e}")
+                        return result
+                    result['categories'][name] = dict(stats, file=filename)
+                    result['added'] += result['categories'][name]['added']
+                    result['duplicates'] += result['categories'][name]['duplicates']
+                try:
+                    _replace_all(pending)
+                except OSError as e:
+                    error(f"no se pudieron sustituir los archivos (no se cambió ninguno): {e}")
+                    return result
+                pending = []
+            finally:
+                seen.close()
+                # Si algo falló, no queda ningún temporal a medias
+                for tmp_path, path in pending:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+        finally:
+            for spool in spools.values():
+                spool.close()
+    return result
+
+
+def _merge_category(name, spool, path, seen, tmp_path=None):
+    """
+    Escribe en `tmp_path` las palabras existentes de `path` más las de `spool` sin
+    repetir palabras, anotándolas en `seen` (_SeenWords). Sin `tmp_path` (simulación)
+    sólo se cuentan.
+    """
+    stats = {'added': 0, 'duplicates': 0, 'total': 0}
+    out = None if tmp_path is None else open(tmp_path, 'w', encoding='utf-8')
+    with out or contextlib.nullcontext():
+        if out:
+            out.write('{\n  "categoria": ' + _encode_string(name) + ',\n  "palabras": [')
+        separator = '\n'
+
+        def write(palabra, pistas):
+            nonlocal separator
+            stats['total'] += 1
+            if out:
+                out.write(separator + _format_word(palabra, pistas))
+                separator = ',\n'
+
+        for word_data in _existing_words(path):
+            seen.add(name, word_data['palabra'])
+            write(word_data['palabra'], word_data['pistas'])
+        spool.seek(0)
+        for line in spool:
+            palabra, pistas = json.loads(line)
+            if not seen.add(name, palabra):
+                stats['duplicates'] += 1
+                continue
+            stats['added'] += 1
+            write(palabra, pistas)
+        if out:
+            out.write('\n  ]\n}\n')
+    return stats
@@ -0,0 +1,188 @@
+"""
+Carga perezosa por categoría: cabeceras al arrancar, palabras bajo demanda.
+
+Al arrancar sólo se necesitan el nombre y el número de palabras de cada
+categoría (la página de configuración no muestra nada más). Esas cabeceras se
+guardan en un manifiesto pequeño junto a los JSON, indexado por la firma
+(mtime, tamaño) de cada archivo, así que un arranque con el manifiesto al día
+no parsea ningún JSON.
+
+Las palabras y pistas de una categoría se leen la primera vez que se sortea
+una palabra suya y se guardan en una caché LRU con un presupuesto de memoria;
+las categorías que nadie elige nunca llegan a cargarse.
+"""
+import bisect
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'catalogo.manifest'
+MANIFEST_VERSION = 1
+# Memoria aproximada de una categoría parseada respecto al tamaño de su JSON
+PARSED_SIZE_FACTOR = 5
+
+
+def manifest_path(directory):
+    return os.path.join(directory, MANIFEST_FILENAME)
+
+
+def load_manifest(path):
+    """Devuelve nombre de archivo -> cabecera, o {} si el manifiesto no existe o no es válido"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning("Manifiesto de categorías ignorado (%s): %s", path, e)
+        return {}
+    if data.get('version') != MANIFEST_VERSION:
+        return {}
+    return {filename: dict(header, signature=tuple(header['signature']))
+            for filename, header in data.get('files', {}).items()}
+
+
+def save_manifest(path, headers):
+    """Escribe el manifiesto de forma atómica (archivo temporal + os.replace)"""
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': headers}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # Sin permiso de escritura el catálogo funciona igual; sólo se pierde el arranque rápido
+        logger.warning("No se pudo guardar el manifiesto %s: %s", path, e)
+
+
+def read_header(path, signature):
+    """Parsea un JSON de categoría y devuelve su cabecera {'signature', 'categoria', 'palabras', 'hash'}"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    data = json.loads(raw)
+    if 'categoria' not in data:
+        raise KeyError('categoria')
+    return {'signature': signature, 'categoria': data['categoria'],
+            'palabras': len(data.get('palabras', [])),
+            'hash': hashlib.blake2b(raw, digest_size=16).hexdigest()}
+
+
+class StaleCatalogError(LookupError):
+    """Un archivo cambió de número de palabras desde el escaneo: hay que repetir con el catálogo recargado"""
+
+
+class CategoryCache:
+    """Caché LRU de categorías parseadas, limitada por una estimación de su memoria"""
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        # (carpeta, archivo, firma) -> (coste estimado, registros)
+        self._entries = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, cost, loader):
+        """Devuelve los registros de `key`, cargándolos con `loader()` si no están"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # Se carga fuera del lock: dos hilos pueden cargar la misma categoría a la vez, pero nadie espera
+        records = loader()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (cost, records)
+                self.used_bytes += cost
+            # Siempre se conserva al menos la categoría recién cargada
+            while self.used_bytes > self.budget_bytes and len(self._entries) > 1:
+                old_cost, _ = self._entries.popitem(last=False)[1]
+                self.used_bytes -= old_cost
+                self.evictions += 1
+        return records
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class LazyRecords:
+    """
+    Secuencia de registros {'categoria', 'palabra', 'pistas'} que carga cada
+    categoría sólo cuando se pide una de sus palabras.
+    """
+
+    def __init__(self, directory, entries, cache, on_stale=None):
+        self.directory = directory
+        # [(nombre, archivo, cabecera)] en el mismo orden que los rangos del índice
+        self.entries = entries
+        self._starts = []
+        total = 0
+        for name, filename, header in entries:
+            self._starts.append(total)
+            total += header['palabras']
+        self._total = total
+        self.cache = cache
+        # Se llama si un archivo cambió desde el último escaneo
+        self._on_stale = on_stale
+
+    def __len__(self):
+        return self._total
+
+    def __getitem__(self, position):
+        if not 0 <= position < self._total:
+            raise IndexError(position)
+        slot = bisect.bisect_right(self._starts, position) - 1
+        return self.category_records(slot)[position - self._starts[slot]]
+
+    def scan(self):
+        """Todos los registros en orden, leyendo cada archivo directamente sin pasar por la caché LRU"""
+        for name, filename, header in self.entries:
+            yield from self._load(name, filename, header)
+
+    def category_records(self, slot):
+        name, filename, header = self.entries[slot]
+        return self.cache.get((self.directory, filename, header['signature']),
+                              header['signature'][1] * PARSED_SIZE_FACTOR,
+                              lambda: self._load(name, filename, header))
+
+    def _load(self, name, filename, header):
+        with open(os.path.join(self.directory, filename), 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        records = [{'categoria': name, 'palabra': word_data['palabra'], 'pistas': word_data.get('pistas', [])}
+                   for word_data in data.get('palabras', [])]
+        if hashlib.blake2b(raw, digest_size=16).hexdigest() != header['hash'] and self._on_stale:
+            self._on_stale()
+        if len(records) != header['palabras']:
+            # Las posiciones del índice ya no corresponden a estas palabras: no se guarda en la caché
+            raise StaleCatalogError(f"{filename} cambió desde el último escaneo del catálogo")
+        return records
+
+
+class LazyCategories(Mapping):
+    """Vista de sólo lectura nombre -> datos de categoría, cargada bajo demanda"""
+
+    def __init__(self, records):
+        self._records = records
+        self._slots = {name: slot for slot, (name, filename, header) in enumerate(records.entries)}
+
+    def __getitem__(self, cat_name):
+        records = self._records.category_records(self._slots[cat_name])
+        return {'categoria': cat_name,
+                'palabras': [{'palabra': r['palabra'], 'pistas': r['pistas']} for r in records]}
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __len__(self):
+        return len(self._slots)
@@ -0,0 +1,181 @@
+"""
+Paquete binario compilado del catálogo (`flask build-catalog`).
+
+Guarda todas las categorías en un solo archivo compacto que se abre con `mmap`
+y se lee de forma perezosa: arrancar no exige parsear ningún JSON y sólo se
+decodifican las palabras que realmente se sortean.
+
+Formato (enteros sin signo little-endian):
+
+    cabecera   MAGIC, versión, nº de categorías, palabras, pistas y cadenas,
+               longitud de los metadatos y desplazamiento de cada sección
+    metadatos  JSON con los archivos de origen con los que se compiló
+    cadenas    (desplazamiento u32, longitud u32) por cadena + bytes UTF-8
+    categorías (cadena del nombre, primera palabra, nº de palabras) u32 x 3
+    palabras   (cadena de la palabra, primera pista, nº de pistas) u32 x 3
+    pistas     cadena de la pista u32
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+MAGIC = b'UCPK'
+FORMAT_VERSION = 1
+PACK_FILENAME = 'catalogo.pack'
+
+_HEADER = struct.Struct('<4sIIIIII6Q')
+_PAIR = struct.Struct('<II')
+_TRIPLE = struct.Struct('<III')
+_U32 = struct.Struct('<I')
+
+
+def pack_path(directory):
+    return os.path.join(directory, PACK_FILENAME)
+
+
+def _align(f):
+    """Rellena hasta múltiplo de 8 para que cada sección empiece alineada"""
+    padding = -f.tell() % 8
+    if padding:
+        f.write(b'\0' * padding)
+    return f.tell()
+
+
+def build_pack(categories, sources, output):
+    """
+    Compila `categories` (nombre -> {'categoria', 'palabras'}) en `output`.
+    `sources` es la lista de archivos JSON de origen, guardada en los metadatos.
+    """
+    strings, string_ids = [], {}
+
+    def intern(text):
+        string_id = string_ids.get(text)
+        if string_id is None:
+            string_id = string_ids[text] = len(strings)
+            strings.append(text.encode('utf-8'))
+        return string_id
+
+    category_rows, word_rows, hint_rows = [], [], []
+    for cat_name, cat in categories.items():
+        category_rows.append((intern(cat_name), len(word_rows), len(cat.get('palabras', []))))
+        for word_data in cat.get('palabras', []):
+            hints = word_data.get('pistas', [])
+            word_rows.append((intern(word_data['palabra']), len(hint_rows), len(hints)))
+            hint_rows.extend(intern(hint) for hint in hints)
+
+    metadata = json.dumps({'sources': sorted(sources)}, ensure_ascii=False).encode('utf-8')
+    tmp_path = output + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * _HEADER.size)
+        f.write(metadata)
+
+        strings_offset = _align(f)
+        position = 0
+        for data in strings:
+            f.write(_PAIR.pack(position, len(data)))
+            position += len(data)
+        string_data_offset = f.tell()
+        for data in strings:
+            f.write(data)
+
+        categories_offset = _align(f)
+        for row in category_rows:
+            f.write(_TRIPLE.pack(*row))
+        words_offset = _align(f)
+        for row in word_rows:
+            f.write(_TRIPLE.pack(*row))
+        hints_offset = _align(f)
+        for string_id in hint_rows:
+            f.write(_U32.pack(string_id))
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(category_rows), len(word_rows),
+                             len(hint_rows), len(strings), len(metadata),
+                             strings_offset, string_data_offset, categories_offset,
+                             words_offset, hints_offset, 0))
+    os.replace(tmp_path, output)
+
+
+class CatalogPack:
+    """Paquete abierto con mmap; las palabras se decodifican sólo al pedirlas"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.num_categories, self.num_words, self.num_hints, self.num_strings,
+         metadata_len, self._strings, self._string_data, self._categories, self._words,
+         self._hints, _) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path} no es un paquete de catálogo compatible')
+        self.metadata = json.loads(self._mm[_HEADER.size:_HEADER.size + metadata_len].decode('utf-8'))
+
+    def string(self, string_id):
+        offset, length = _PAIR.unpack_from(self._mm, self._strings + string_id * _PAIR.size)
+        start = self._string_data + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def category(self, position):
+        """Devuelve (nombre, primera palabra, nº de palabras) de la categoría `position`"""
+        name_id, first_word, count = _TRIPLE.unpack_from(self._mm, self._categories + position * _TRIPLE.size)
+        return self.string(name_id), first_word, count
+
+    def word(self, position):
+        """Devuelve (palabra, [pistas]) de la palabra número `position`"""
+        word_id, first_hint, count = _TRIPLE.unpack_from(self._mm, self._words + position * _TRIPLE.size)
+        base = self._hints + first_hint * _U32.size
+        hints = [self.string(_U32.unpack_from(self._mm, base + i * _U32.size)[0]) for i in range(count)]
+        return self.string(word_id), hints
+
+    def ranges(self):
+        """Categoría -> (inicio, fin) en el arreglo plano de palabras"""
+        ranges = {}
+        for position in range(self.num_categories):
+            name, first_word, count = self.category(position)
+            ranges[name] = (first_word, first_word + count)
+        return ranges
+
+
+class PackRecords:
+    """Secuencia perezosa de registros {'categoria', 'palabra', 'pistas'} leída del paquete"""
+
+    def __init__(self, pack, ranges):
+        self.pack = pack
+        # Inicio de cada categoría no vacía, para saber a cuál pertenece una palabra
+        starts = sorted((start, name) for name, (start, end) in ranges.items() if end > start)
+        self._starts = [start for start, name in starts]
+        self._names = [name for start, name in starts]
+
+    def __len__(self):
+        return self.pack.num_words
+
+    def __getitem__(self, position):
+        if not 0 <= position < self.pack.num_words:
+            raise IndexError(position)
+        palabra, pistas = self.pack.word(position)
+        cat_name = self._names[bisect.bisect_right(self._starts, position) - 1]
+        return {'categoria': cat_name, 'palabra': palabra, 'pistas': pistas}
+
+
+class PackCategories(Mapping):
+    """Vista de sólo lectura nombre -> datos de categoría, decodificada bajo demanda"""
+
+    def __init__(self, pack, ranges):
+        self.pack = pack
+        self._ranges = ranges
+
+    def __getitem__(self, cat_name):
+        start, end = self._ranges[cat_name]
+        palabras = []
+        for position in range(start, end):
+            palabra, pistas = self.pack.word(position)
+            palabras.append({'palabra': palabra, 'pistas': pistas})
+        return {'categoria': cat_name, 'palabras': palabras}
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self):
+        return len(self._ranges)
@@ -0,0 +1,119 @@
+"""
+Compresión de las páginas HTML y respuestas condicionales.
+
+Después de cada petición, el HTML de más de COMPRESS_MIN_BYTES se comprime
+con gzip o deflate según Accept-Encoding. Las páginas que son iguales para
+todos (la de configuración) se guardan ya renderizadas en un `CachedPage`:
+su ETag fuerte es el hash del contenido y cada variante comprimida se calcula
+una sola vez, así que servirla no cuesta ni renderizar ni comprimir, y un
+cliente que ya la tiene recibe un 304 sin cuerpo.
+"""
+import gzip
+import hashlib
+import zlib
+
+from flask import Response, request
+
+# Por debajo de este tamaño la compresión no compensa
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+COMPRESS_MIMETYPES = frozenset({'text/html'})
+ENCODINGS = ('gzip', 'deflate')
+
+
+def negotiate(accept_encodings):
+    """Codificación preferida por el cliente entre gzip y deflate (werkzeug Accept), o 'identity'"""
+    best, best_quality = 'identity', 0
+    for encoding in ENCODINGS:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding, level=COMPRESS_LEVEL):
+    if encoding == 'gzip':
+        return gzip.compress(body, level, mtime=0)
+    # 'deflate' en HTTP es el formato zlib (RFC 1950), no deflate sin cabecera
+    return zlib.compress(body, level)
+
+
+class CachedPage:
+    """Página ya renderizada con su ETag; las variantes comprimidas se calculan la primera vez que se piden"""
+
+    __slots__ = ('body', 'mimetype', 'etag', 'variants')
+
+    def __init__(self, body, mimetype='text/html'):
+        self.body = body
+        self.mimetype = mimetype
+        # El hash del contenido cubre el catálogo, la plantilla y los estáticos que enlaza, y coincide
+        # en todos los procesos (la versión del catálogo es un contador de cada proceso)
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.variants = {'identity': body}
+
+    def variant(self, encoding, level=COMPRESS_LEVEL):
+        body = self.variants.get(encoding)
+        if body is None:
+            # Sin lock: dos hilos a la vez sólo comprimirían dos veces lo mismo
+            body = self.variants[encoding] = compress(self.body, encoding, level)
+        return body
+
+
+class Compressor:
+    """Comprime el HTML de las respuestas y sirve las CachedPage con ETag y 304"""
+
+    def __init__(self, min_bytes=COMPRESS_MIN_BYTES, level=COMPRESS_LEVEL, mimetypes=COMPRESS_MIMETYPES):
+        self.min_bytes = min_bytes
+        self.level = level
+        self.mimetypes = mimetypes
+        self.metrics = None
+
+    def init_app(self, app, metrics=None):
+        """Usa app.config['COMPRESS_MIN_BYTES'] y ['COMPRESS_LEVEL'] y comprime después de cada petición"""
+        self.min_bytes = app.config.get('COMPRESS_MIN_BYTES', self.min_bytes)
+        self.level = app.config.get('COMPRESS_LEVEL', self.level)
+        self.metrics = metrics
+        app.after_request(self._compress)
+
+    def _count(self, encoding, source, size, cached):
+        if self.metrics is not None:
+            labels = (('encoding', encoding), ('cached', 'true' if cached else 'false'))
+            self.metrics.inc('undercover_compressed_responses_total', labels)
+            self.metrics.inc('undercover_compression_saved_bytes_total', labels, source - size)
+
+    def _compress(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or response.mimetype not in self.mimetypes):
+            return response
+        body = response.get_data()
+        if len(body) < self.min_bytes:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = negotiate(request.accept_encodings)
+        if encoding == 'identity':
+            return response
+        compressed = compress(body, encoding, self.level)
+        response.set_data(compressed)
+        response.content_encoding = encoding
+        self._count(encoding, len(body), len(compressed), cached=False)
+        return response
+
+    def page_response(self, page):
+        """Respuesta de una CachedPage: 304 si el cliente ya la tiene y si no la variante que acepte"""
+        compressible = len(page.body) >= self.min_bytes
+        encoding = negotiate(request.accept_encodings) if compressible else 'identity'
+        response = Response(page.variant(encoding, self.level), mimetype=page.mimetype)
+        if compressible:
+            response.vary.add('Accept-Encoding')
+        if encoding == 'identity':
+            response.set_etag(page.etag)
+        else:
+            # ETag fuerte: cada codificación es una representación distinta
+            response.content_encoding = encoding
+            response.set_etag(f'{page.etag}-{encoding}')
+        # Se puede guardar, pero hay que revalidar: la página cambia con el catálogo
+        response.headers['Cache-Control'] = 'no-cache'
+        response = response.make_conditional(request)
+        if response.status_code == 200 and encoding != 'identity':
+            self._count(encoding, len(page.body), len(page.variants[encoding]), cached=True)
+        return response
@@ -0,0 +1,57 @@
+"""
+Mazo de palabras sin repetición para un grupo que juega varias rondas seguidas.
+
+En lugar de guardar las palabras ya usadas, el mazo es una permutación
+pseudoaleatoria de las N palabras disponibles definida por una semilla: la
+ronda número k usa la palabra permute(k). Cada sorteo cuesta O(1) y en la
+sesión sólo se guardan la semilla, la posición y una huella de la selección.
+
+La permutación es una red de Feistel sobre el menor dominio 2^(2h) >= N con
+"cycle walking" (se reaplica hasta caer dentro de [0, N)); como el dominio es
+menor que 4N, en promedio hacen falta menos de 4 pasadas.
+"""
+import hashlib
+import random
+
+FEISTEL_ROUNDS = 4
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(value):
+    """Mezclador de 64 bits (splitmix64)"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+def permute(position, size, seed):
+    """Imagen de `position` en la permutación de range(size) definida por `seed`"""
+    half = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half) - 1
+    round_keys = [_mix(seed + r) for r in range(FEISTEL_ROUNDS)]
+    value = position
+    while True:
+        left, right = value >> half, value & mask
+        for key in round_keys:
+            left, right = right, left ^ (_mix(right ^ key) & mask)
+        value = (left << half) | right
+        if value < size:
+            return value
+
+
+def fingerprint(catalog_version, selected_categories):
+    """Huella corta de la selección: si cambia, el mazo se vuelve a barajar"""
+    text = f"{catalog_version}\x1f" + '\x1f'.join(sorted(set(selected_categories)))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def draw(state, key, size, rng=random):
+    """
+    Saca la siguiente carta del mazo. Devuelve (posición en [0, size), nuevo estado).
+    Se baraja de nuevo si no hay mazo, si se agotó o si cambió la selección (`key`).
+    """
+    if not state or state.get('key') != key or state.get('size') != size or state.get('pos', 0) >= size:
+        state = {'key': key, 'seed': rng.getrandbits(63), 'pos': 0, 'size': size}
+    position = permute(state['pos'], size, state['seed'])
+    return position, dict(state, pos=state['pos'] + 1)
@@ -0,0 +1,205 @@
+"""
+Puntuación de ambigüedad de las pistas y selección de pistas por dificultad.
+
+Trabajo por lotes (`flask score-hints`, requiere NumPy):
+
+    1. Cada pista distinta (normalizada) recibe un vector aleatorio de
+       dimensión DIMENSIONS y cada palabra el promedio normalizado de los de
+       sus pistas: una proyección aleatoria de la matriz palabra x pista que
+       conserva su similitud coseno.
+    2. El contexto de una pista es el promedio de las palabras que la usan.
+    3. Para cada par (palabra, pista) se calcula, con productos de matrices
+       por bloques, a qué fracción de una muestra de palabras del catálogo se
+       ajusta la pista al menos tan bien como a su propia palabra.
+
+Así "Trompa" (sólo la usa Elefante) queda cerca de 0: casi delata la palabra,
+y "Grande" (la usan muchas palabras distintas) queda cerca de 1: no sirve de
+mucho. Las pistas que contienen la palabra (ver text_index.leaks) valen 0.
+
+El resultado se guarda en un archivo de caché junto a los JSON. En cada
+petición `HintBands.choose()` sólo hace una búsqueda en un diccionario y un
+`random.choice` sobre las pistas de la banda pedida, ya separadas al cargar.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependencia opcional
+    np = None
+
+from text_index import normalize, normalized_leaks
+
+logger = logging.getLogger(__name__)
+
+SCORES_FILENAME = 'catalogo.pistas'
+SCORES_VERSION = 1
+DIMENSIONS = 32
+# Palabras de referencia con las que se compara cada pista
+REFERENCE_WORDS = 1024
+# Filas (pares palabra-pista) por bloque del producto de matrices
+BLOCK_ROWS = 16384
+# Bandas de dificultad para el impostor: una pista fácil casi le dice la palabra
+BANDS = ('facil', 'media', 'dificil')
+
+
+def scores_path(directory):
+    return os.path.join(directory, SCORES_FILENAME)
+
+
+def word_key(categoria, palabra):
+    return f'{categoria}\x1f{palabra}'
+
+
+def score_hints(records, seed=0):
+    """
+    Calcula la ambigüedad de cada pista de `records` (palabras {'categoria', 'palabra', 'pistas'}).
+    Devuelve (clave de palabra -> [(pista, puntuación)], umbrales de las bandas).
+    """
+    if np is None:
+        raise RuntimeError('El cálculo de puntuaciones necesita NumPy: pip install numpy')
+    rng = np.random.default_rng(seed)
+
+    # Matriz dispersa palabra x pista como lista de pares (fila, id de pista)
+    hint_ids, rows, cols, leaked = {}, [], [], []
+    normalized = {}
+    for position in range(len(records)):
+        record = records[position]
+        word = normalize(record['palabra'])
+        for hint in record['pistas']:
+            hint_normalized = normalized.get(hint)
+            if hint_normalized is None:
+                hint_normalized = normalized[hint] = normalize(hint)
+            rows.append(position)
+            cols.append(hint_ids.setdefault(hint_normalized, len(hint_ids)))
+            leaked.append(normalized_leaks(word, hint_normalized))
+    num_words = len(records)
+    if not rows or num_words < 2:
+        return {}, [0.0, 0.0]
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+
+    # 1. Vectores de palabra: suma de los vectores aleatorios de sus pistas
+    hint_vectors = rng.standard_normal((len(hint_ids), DIMENSIONS)).astype(np.float32)
+    word_vectors = np.zeros((num_words, DIMENSIONS), dtype=np.float32)
+    np.add.at(word_vectors, rows, hint_vectors[cols])
+    word_vectors /= np.maximum(np.linalg.norm(word_vectors, axis=1, keepdims=True), 1e-9)
+
+    # 2. Contexto de cada pista: suma de las palabras que la usan
+    contexts = np.zeros((len(hint_ids), DIMENSIONS), dtype=np.float32)
+    np.add.at(contexts, cols, word_vectors[rows])
+    contexts /= np.maximum(np.linalg.norm(contexts, axis=1, keepdims=True), 1e-9)
+
+    # 3. Fracción de la muestra a la que la pista se ajusta tanto como a su palabra
+    sample = rng.choice(num_words, size=min(REFERENCE_WORDS, num_words), replace=False)
+    reference = word_vectors[sample].T
+    ambiguity = np.empty(len(rows), dtype=np.float32)
+    for start in range(0, len(rows), BLOCK_ROWS):
+        block = slice(start, start + BLOCK_ROWS)
+        hint_context = contexts[cols[block]]
+        own = np.einsum('ij,ij->i', hint_context, word_vectors[rows[block]])
+        similarities = hint_context @ reference
+        ambiguity[block] = (similarities >= own[:, None] - 1e-6).mean(axis=1)
+
+    ambiguity[np.asarray(leaked, dtype=bool)] = 0.0
+    scores, i = {}, 0
+    rounded = np.round(ambiguity.astype(np.float64), 4).tolist()
+    for position in range(num_words):
+        record = records[position]
+        count = len(record['pistas'])
+        if count:
+            scores[word_key(record['categoria'], record['palabra'])] = list(zip(record['pistas'],
+                                                                                  rounded[i:i + count]))
+            i += count
+    thresholds = [float(t) for t in np.quantile(ambiguity, [1 / 3, 2 / 3])]
+    return scores, thresholds
+
+
+def save_scores(path, scores, thresholds):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': SCORES_VERSION, 'bands': list(BANDS), 'thresholds': thresholds, 'words': scores},
+                  f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _split_bands(hint_scores, thresholds):
+    """Reparte las pistas de una palabra en bandas; una banda vacía usa la más cercana con pistas"""
+    bands = [[], [], []]
+    for hint, score in hint_scores:
+        band = 0 if score <= thresholds[0] else 1 if score <= thresholds[1] else 2
+        bands[band].append(hint)
+    for band in range(len(bands)):
+        if not bands[band]:
+            for distance in (1, 2):
+                nearest = [b for b in (band - distance, band + distance) if 0 <= b < len(bands) and bands[b]]
+                if nearest:
+                    bands[band] = bands[nearest[0]]
+                    break
+    return {name: hints for name, hints in zip(BANDS, bands)}
+
+
+class HintBands:
+    """Pistas de cada palabra separadas por banda, leídas del archivo de caché (se recarga si cambia)"""
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._words = {}
+        self._signature = None
+        self._next_check = 0.0
+
+    def _refresh(self):
+        self._next_check = time.monotonic() + self.check_interval
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self._words, self._signature = {}, None
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SCORES_VERSION:
+                raise ValueError('versión no compatible')
+            thresholds = data['thresholds']
+            self._words = {key: _split_bands(hint_scores, thresholds) for key, hint_scores in data['words'].items()}
+        except Exception as e:
+            logger.error("Error cargando %s: %s", self.path, e)
+            self._words = {}
+        self._signature = signature
+
+    def reload(self):
+        """Relee el archivo de puntuaciones si cambió"""
+        with self._lock:
+            self._refresh()
+
+    def bands(self, categoria, palabra):
+        """Banda -> pistas de la palabra, o None si no tiene puntuaciones"""
+        if time.monotonic() >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._lock.release()
+        return self._words.get(word_key(categoria, palabra))
+
+    def choose(self, word_data, difficulty=None, rng=random):
+        """Elige una pista de la banda `difficulty` (o cualquiera si no hay puntuaciones o banda)"""
+        pistas = word_data['pistas']
+        if not pistas:
+            return None
+        if difficulty in BANDS:
+            bands = self.bands(word_data['categoria'], word_data['palabra'])
+            if bands:
+                hint = rng.choice(bands[difficulty])
+                # Si la palabra cambió desde el último cálculo, la pista puede ya no existir
+                if hint in pistas:
+                    return hint
+        return rng.choice(pistas)
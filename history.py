@@ -0,0 +1,225 @@
+"""
+Historial de rondas en SQLite con escritura diferida (write-behind).
+
+Las vistas sólo llaman a `record()`, que mete la ronda en una cola en memoria
+y vuelve enseguida: la petición nunca espera al disco. Un hilo de fondo saca
+las rondas de la cola y las escribe por lotes (hasta BATCH_SIZE rondas o
+FLUSH_INTERVAL segundos) en una sola transacción. Si la cola se llena (el disco
+no da abasto) las rondas nuevas se descartan y se cuentan en `dropped`.
+
+En la misma transacción se actualizan tablas de agregados (por palabra, por
+categoría y por hora) con índices propios, así que las estadísticas leen unas
+pocas filas aunque `rounds` tenga millones.
+
+Las rondas que llegan con su semilla sólo se guardan una vez (índice único
+sobre `seed`), aunque el mismo aviso llegue a varios procesos o después de un
+reinicio: las repetidas no cuentan en los agregados.
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Rondas en espera como máximo antes de empezar a descartar
+QUEUE_SIZE = 10000
+# Rondas por transacción
+BATCH_SIZE = 500
+# Segundos que espera el hilo de escritura a juntar un lote
+FLUSH_INTERVAL = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    palabra TEXT NOT NULL,
+    num_players INTEGER NOT NULL,
+    num_impostors INTEGER NOT NULL,
+    hints_enabled INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    completed_at REAL,
+    seed TEXT
+);
+CREATE INDEX IF NOT EXISTS rounds_started_at ON rounds (started_at);
+CREATE TABLE IF NOT EXISTS word_stats (
+    categoria TEXT NOT NULL,
+    palabra TEXT NOT NULL,
+    plays INTEGER NOT NULL,
+    last_played REAL NOT NULL,
+    PRIMARY KEY (categoria, palabra)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS word_stats_plays ON word_stats (plays DESC);
+CREATE TABLE IF NOT EXISTS category_stats (
+    categoria TEXT PRIMARY KEY,
+    plays INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    last_played REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hourly_stats (
+    hour INTEGER PRIMARY KEY,
+    rounds INTEGER NOT NULL
+);
+"""
+
+# Después de SCHEMA: los historiales anteriores no tienen la columna `seed`
+SEED_INDEX = 'CREATE UNIQUE INDEX IF NOT EXISTS rounds_seed ON rounds (seed)'
+
+ROUND_FIELDS = ('source', 'categoria', 'palabra', 'num_players', 'num_impostors', 'hints_enabled',
+                'started_at', 'completed_at', 'seed')
+INSERT_ROUND = f"INSERT OR IGNORE INTO rounds ({', '.join(ROUND_FIELDS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+class HistoryStore:
+    """Historial de rondas: `record()` encola y un hilo de fondo escribe por lotes"""
+
+    def __init__(self, path, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._local = threading.local()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.duplicates = 0
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            if 'seed' not in {row[1] for row in conn.execute('PRAGMA table_info(rounds)')}:
+                conn.execute('ALTER TABLE rounds ADD COLUMN seed TEXT')
+            conn.execute(SEED_INDEX)
+        self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # --- Escritura ---
+
+    def record(self, source, categoria, palabra, num_players, num_impostors, hints_enabled,
+               started_at, completed_at=None, seed=None):
+        """
+        Encola una ronda sin bloquear; devuelve False si la cola está llena y se descartó.
+        Con `seed`, una ronda ya guardada con la misma semilla se ignora al escribir.
+        """
+        try:
+            self._queue.put_nowait((source, categoria, palabra, num_players, num_impostors,
+                                    int(bool(hints_enabled)), started_at, completed_at,
+                                    None if seed is None else str(seed)))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def flush(self):
+        """Espera a que se escriban todas las rondas encoladas hasta ahora"""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0
+                                 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            if rows:
+                try:
+                    written = self._write(rows)
+                    self.written += written
+                    self.duplicates += len(rows) - written
+                except sqlite3.Error as e:
+                    self.failed += len(rows)
+                    logger.error("Error guardando %d rondas en %s: %s", len(rows), self.path, e)
+            for _ in batch:
+                self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+    def _write(self, rows):
+        """Escribe un lote en una transacción; devuelve cuántas rondas se guardaron (sin las repetidas)"""
+        conn = self._connect()
+        with conn:
+            # Las rondas sin semilla no pueden repetirse: de una vez. Las otras de una en una,
+            # para saber cuáles ignoró el índice único y no sumarlas a los agregados
+            unseeded = [row for row in rows if row[-1] is None]
+            conn.executemany(INSERT_ROUND, unseeded)
+            rows = unseeded + [row for row in rows if row[-1] is not None
+                               and conn.execute(INSERT_ROUND, row).rowcount == 1]
+            self._update_stats(conn, rows)
+        return len(rows)
+
+    def _update_stats(self, conn, rows):
+        # Los agregados del lote se suman primero en memoria: una sola fila por palabra/categoría/hora
+        words, categories, hours = Counter(), Counter(), Counter()
+        players, last_played = Counter(), {}
+        for _, categoria, palabra, num_players, _, _, started_at, _, _ in rows:
+            words[(categoria, palabra)] += 1
+            categories[categoria] += 1
+            players[categoria] += num_players
+            hours[int(started_at // 3600)] += 1
+            last_played[categoria] = max(last_played.get(categoria, 0.0), started_at)
+            last_played[(categoria, palabra)] = max(last_played.get((categoria, palabra), 0.0), started_at)
+        conn.executemany(
+            'INSERT INTO word_stats (categoria, palabra, plays, last_played) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (categoria, palabra) DO UPDATE SET plays = plays + excluded.plays, '
+            'last_played = max(last_played, excluded.last_played)',
+            [(categoria, palabra, count, last_played[(categoria, palabra)])
+             for (categoria, palabra), count in words.items()])
+        conn.executemany(
+            'INSERT INTO category_stats (categoria, plays, players, last_played) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (categoria) DO UPDATE SET plays = plays + excluded.plays, '
+            'players = players + excluded.players, last_played = max(last_played, excluded.last_played)',
+            [(categoria, count, players[categoria], last_played[categoria])
+             for categoria, count in categories.items()])
+        conn.executemany(
+            'INSERT INTO hourly_stats (hour, rounds) VALUES (?, ?) '
+            'ON CONFLICT (hour) DO UPDATE SET rounds = rounds + excluded.rounds',
+            list(hours.items()))
+
+    # --- Lectura ---
+
+    def stats(self, limit=20, hours=24, now=None):
+        """Palabras más jugadas, popularidad de las categorías y rondas por hora de las últimas `hours` horas"""
+        conn = self._connect()
+        first_hour = int((now or time.time()) // 3600) - hours + 1
+        words = conn.execute('SELECT categoria, palabra, plays, last_played FROM word_stats '
+                             'ORDER BY plays DESC LIMIT ?', (limit,)).fetchall()
+        categories = conn.execute('SELECT categoria, plays, players, last_played FROM category_stats '
+                                  'ORDER BY plays DESC').fetchall()
+        per_hour = conn.execute('SELECT hour, rounds FROM hourly_stats WHERE hour >= ? ORDER BY hour',
+                                (first_hour,)).fetchall()
+        return {
+            'total_rounds': sum(plays for _, plays, _, _ in categories),
+            'top_words': [{'categoria': c, 'palabra': p, 'plays': n, 'last_played': t} for c, p, n, t in words],
+            'categories': [{'categoria': c, 'plays': n, 'avg_players': round(players / n, 2), 'last_played': t}
+                           for c, n, players, t in categories],
+            'rounds_per_hour': [{'hour': hour * 3600, 'rounds': n} for hour, n in per_hour],
+        }
+
+    def collect(self):
+        """Colector para /metrics (ver Metrics.register_collector)"""
+        yield ('undercover_history_rounds_total', 'counter', 'Rondas del historial por resultado',
+               [((('result', 'written'),), self.written), ((('result', 'dropped'),), self.dropped),
+                ((('result', 'failed'),), self.failed), ((('result', 'duplicate'),), self.duplicates)])
+        yield ('undercover_history_queue', 'gauge', 'Rondas en espera de guardarse', [((), self.pending())])
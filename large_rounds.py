@@ -0,0 +1,108 @@
+"""
+Rondas grandes: de MAX_PLAYERS a LARGE_ROUND_MAX_PLAYERS jugadores (clases, directos).
+
+Una ronda normal guarda la lista de nombres en la sesión y recorre a los
+jugadores uno a uno con `current_player_index`. En una ronda grande el coste de
+cada petición no depende del número de jugadores:
+
+- La ronda se guarda en el almacén de rondas (el mismo backend que las
+  sesiones) y la sesión del anfitrión sólo lleva su id.
+- Los nombres se guardan por bloques de ROSTER_CHUNK: una tarjeta lee un solo
+  bloque. Sin nombres los jugadores son "Jugador 1", "Jugador 2"... y no se
+  guarda ninguno.
+- Los impostores son un mapa de bits (un bit por jugador): saber si alguien es
+  impostor es leer un bit, y listarlos es recorrer los bytes.
+- Cada jugador puede abrir su tarjeta en su teléfono con un enlace firmado
+  (reparto en paralelo) o pasarse un teléfono con el número en la URL.
+"""
+import hashlib
+import hmac
+import secrets
+
+LARGE_ROUND_MAX_PLAYERS = 1000
+# Nombres por bloque guardado
+ROSTER_CHUNK = 100
+# Jugadores por página en la vista del anfitrión
+PAGE_SIZE = 50
+
+
+def impostor_bitmap(indices, num_players):
+    bitmap = bytearray((num_players + 7) // 8)
+    for index in indices:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return bytes(bitmap)
+
+
+def is_impostor(bitmap, index):
+    return bool(bitmap[index >> 3] >> (index & 7) & 1)
+
+
+def impostor_positions(bitmap):
+    """Índices de los impostores en orden, saltando los bytes a cero"""
+    for byte_index, byte in enumerate(bitmap):
+        while byte:
+            low = byte & -byte
+            yield byte_index * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+def default_name(index):
+    return f'Jugador {index + 1}'
+
+
+class LargeRoundStore:
+    """Rondas grandes en un backend con get/set/delete (ver sessions.py): la ronda y sus bloques de nombres"""
+
+    def __init__(self, backend, ttl):
+        self.backend = backend
+        self.ttl = ttl
+
+    def create(self, round_data, names=None):
+        """Guarda la ronda (y los nombres, si los hay) y devuelve su id"""
+        round_id = secrets.token_urlsafe(16)
+        round_data = dict(round_data, named=bool(names))
+        if names:
+            for start in range(0, len(names), ROSTER_CHUNK):
+                self.backend.set(self._chunk_key(round_id, start // ROSTER_CHUNK),
+                                 {'names': names[start:start + ROSTER_CHUNK]}, self.ttl)
+        self.backend.set('large-round:' + round_id, round_data, self.ttl)
+        return round_id
+
+    def get(self, round_id):
+        return self.backend.get('large-round:' + round_id)
+
+    @staticmethod
+    def _chunk_key(round_id, chunk):
+        return f'large-round:{round_id}:names:{chunk}'
+
+    def _chunk(self, round_id, chunk):
+        data = self.backend.get(self._chunk_key(round_id, chunk))
+        return data['names'] if data else []
+
+    def name(self, round_id, round_data, index):
+        """Nombre del jugador `index` (base 0), leyendo sólo su bloque"""
+        if round_data['named']:
+            names = self._chunk(round_id, index // ROSTER_CHUNK)
+            if index % ROSTER_CHUNK < len(names):
+                return names[index % ROSTER_CHUNK]
+        return default_name(index)
+
+    def names(self, round_id, round_data, indices):
+        """Nombres de `indices` (ordenados), leyendo cada bloque una sola vez; generador"""
+        chunk, names = None, []
+        for index in indices:
+            if round_data['named'] and index // ROSTER_CHUNK != chunk:
+                chunk = index // ROSTER_CHUNK
+                names = self._chunk(round_id, chunk)
+            offset = index % ROSTER_CHUNK
+            yield names[offset] if round_data['named'] and offset < len(names) else default_name(index)
+
+
+def card_token(key, round_id, index):
+    """Firma del enlace a la tarjeta de un jugador: sin ella no se puede mirar la de otro"""
+    message = f'{round_id}\x1fcard\x1f{index}'.encode('utf-8')
+    return hmac.new(key, message, hashlib.sha256).hexdigest()[:16]
+
+
+def check_card_token(key, round_id, index, token):
+    return isinstance(token, str) and hmac.compare_digest(card_token(key, round_id, index), token)
@@ -0,0 +1,126 @@
+"""
+Catálogos por idioma.
+
+Cada idioma tiene su carpeta dentro de la de categorías (categorias/es,
+categorias/en, categorias/pt-BR...) con sus JSON, su paquete compilado y sus
+pistas puntuadas. Cada carpeta es un `LocaleShard` independiente: su propio
+catálogo con índice (ver catalog.py), sus bandas de pistas y su página de
+configuración en caché.
+
+Al arrancar sólo se carga el idioma por defecto; los demás se cargan la primera
+vez que alguien los pide, así que tener diez idiomas no alarga el arranque ni
+ocupa memoria en un despliegue que sólo sirve uno. Con la carga perezosa todos
+los idiomas comparten una sola caché de categorías (y su límite de memoria).
+
+Si la carpeta de categorías tiene los JSON directamente (sin subcarpetas de
+idioma), se usan como el idioma por defecto.
+"""
+import os
+import re
+import threading
+import time
+
+from catalog import CategoryCatalog
+from catalog_manifest import CategoryCache
+from hint_scores import HintBands, scores_path
+
+# Etiqueta de idioma BCP 47 simplificada: 'es', 'en', 'pt-BR', 'zh-Hant'
+LOCALE_PATTERN = re.compile(r'[a-z]{2,3}(-[A-Za-z0-9]{2,8})*')
+
+
+class LocaleShard:
+    """Catálogo, pistas puntuadas y página de configuración en caché de un idioma"""
+
+    def __init__(self, locale, directory, check_interval, lazy, cache):
+        self.locale = locale
+        self.directory = directory
+        self.catalog = CategoryCatalog(directory, check_interval=check_interval, lazy=lazy, cache=cache)
+        self.hint_bands = HintBands(scores_path(directory), check_interval=check_interval)
+        # Página de configuración sin error ya renderizada: (versión del catálogo, prefijo, idiomas) -> CachedPage
+        self.setup_pages = {}
+
+    def load(self):
+        self.catalog.reload()
+        self.hint_bands.reload()
+        return self
+
+
+class LocaleCatalogs:
+    """Idiomas disponibles en `root` y sus catálogos, cargados la primera vez que se piden"""
+
+    def __init__(self, root, default_locale='es', check_interval=2.0, lazy=False, cache_budget=64 * 1024 * 1024):
+        self.root = root
+        self.default_locale = default_locale
+        self.check_interval = check_interval
+        self.lazy = lazy
+        self.cache = CategoryCache(cache_budget) if lazy else None
+        self._lock = threading.Lock()
+        self._shards = {}
+        self._available = None
+        self._next_scan = 0.0
+
+    def directory(self, locale):
+        """Carpeta del idioma (la raíz misma para el idioma por defecto si no hay subcarpeta)"""
+        path = os.path.join(self.root, locale)
+        if locale == self.default_locale and not os.path.isdir(path):
+            return self.root
+        return path
+
+    def available(self):
+        """Idiomas con carpeta en la raíz (el de por defecto siempre está), revisados cada check_interval"""
+        if self._available is None or time.monotonic() >= self._next_scan:
+            locales = {self.default_locale}
+            try:
+                with os.scandir(self.root) as entries:
+                    locales.update(entry.name for entry in entries
+                                   if entry.is_dir() and LOCALE_PATTERN.fullmatch(entry.name))
+            except FileNotFoundError:
+                pass
+            self._available = sorted(locales)
+            self._next_scan = time.monotonic() + self.check_interval
+        return self._available
+
+    def shard(self, locale=None):
+        """LocaleShard del idioma (el de por defecto si no existe), cargándolo si es la primera vez"""
+        locale = locale or self.default_locale
+        shard = self._shards.get(locale)
+        if shard is None:
+            if locale != self.default_locale and locale not in self.available():
+                return self.shard(self.default_locale)
+            with self._lock:
+                shard = self._shards.get(locale)
+                if shard is None:
+                    shard = LocaleShard(locale, self.directory(locale), self.check_interval, self.lazy,
+                                        self.cache).load()
+                    self._shards[locale] = shard
+        return shard
+
+    def loaded(self):
+        """Idioma -> LocaleShard de los idiomas ya cargados"""
+        return dict(self._shards)
+
+    def negotiate(self, requested=None, accept_languages=None):
+        """
+        Elige el idioma: el pedido explícitamente (?lang=) si existe, si no el
+        mejor de Accept-Language (werkzeug LanguageAccept) y si no el de por defecto
+        """
+        available = self.available()
+        if requested:
+            match = _match(requested, available)
+            if match:
+                return match
+        if accept_languages:
+            match = accept_languages.best_match(available)
+            if match:
+                return match
+        return self.default_locale
+
+
+def _match(requested, available):
+    """'pt-br' -> 'pt-BR'; 'en-US' -> 'en' si no hay 'en-US'"""
+    requested = requested.strip().lower()
+    by_lower = {locale.lower(): locale for locale in available}
+    if requested in by_lower:
+        return by_lower[requested]
+    primary = requested.split('-', 1)[0]
+    return by_lower.get(primary)
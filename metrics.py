@@ -0,0 +1,239 @@
+"""
+Métricas internas con formato de texto de Prometheus.
+
+Cada hilo escribe en su propio fragmento (sin locks en la ruta caliente); al
+consultar /metrics se suman todos los fragmentos. Cuando un hilo termina, su
+fragmento se funde en uno acumulado para no perder datos ni acumular
+fragmentos de hilos muertos (el servidor de desarrollo crea un hilo por
+petición).
+"""
+import bisect
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from flask import before_render_template, request, template_rendered
+
+# Límites superiores (en segundos) de los buckets de los histogramas
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HELP = {
+    'undercover_request_duration_seconds': ('histogram', 'Duración de las peticiones por ruta'),
+    'undercover_phase_duration_seconds': ('histogram', 'Duración de las fases internas de una petición'),
+    'undercover_requests_total': ('counter', 'Peticiones atendidas por ruta y código de estado'),
+    'undercover_rate_limited_total': ('counter', 'Peticiones rechazadas con 429 por ruta y ámbito del límite'),
+    'undercover_compressed_responses_total': ('counter', 'Respuestas HTML comprimidas por codificación'),
+    'undercover_compression_saved_bytes_total': ('counter', 'Bytes ahorrados al comprimir las respuestas HTML'),
+}
+
+
+class _Shard:
+    """Contadores e histogramas de un solo hilo"""
+
+    __slots__ = ('counters', 'histograms')
+
+    def __init__(self):
+        # (nombre, etiquetas) -> valor
+        self.counters = {}
+        # (nombre, etiquetas) -> [cuenta por bucket..., cuenta +Inf, suma]
+        self.histograms = {}
+
+    def merge(self, other):
+        for key, value in list(other.counters.items()):
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, values in list(other.histograms.items()):
+            mine = self.histograms.setdefault(key, [0] * (len(BUCKETS) + 2))
+            for i, value in enumerate(values[:]):
+                mine[i] += value
+
+
+class _ThreadToken:
+    """Objeto guardado en el thread-local; al morir el hilo se retira su fragmento"""
+
+    __slots__ = ('__weakref__',)
+
+
+class Metrics:
+    """Registro de métricas con fragmentos por hilo que se fusionan al consultarlas"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = set()
+        self._retired = _Shard()
+        self._collectors = []
+
+    # --- Escritura (ruta caliente) ---
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard()
+            token = _ThreadToken()
+            with self._lock:
+                self._shards.add(shard)
+            weakref.finalize(token, self._retire, shard)
+            self._local.token = token
+            self._local.shard = shard
+        return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            self._shards.discard(shard)
+            self._retired.merge(shard)
+
+    def inc(self, name, labels=(), amount=1):
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, name, labels, seconds):
+        histograms = self._shard().histograms
+        key = (name, labels)
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0] * (len(BUCKETS) + 2)
+        values[bisect.bisect_left(BUCKETS, seconds)] += 1
+        values[-1] += seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Mide una fase interna de la petición (catálogo, selección, render, sesión...)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('undercover_phase_duration_seconds', (('phase', name),),
+                         time.perf_counter() - started)
+
+    def register_collector(self, collector):
+        """
+        Registra una función que se llama al consultar /metrics y devuelve
+        tuplas (nombre, tipo, ayuda, [(etiquetas, valor), ...]).
+        """
+        self._collectors.append(collector)
+
+    # --- Lectura (/metrics) ---
+
+    def _merged(self):
+        merged = _Shard()
+        with self._lock:
+            merged.merge(self._retired)
+            for shard in list(self._shards):
+                merged.merge(shard)
+        return merged
+
+    def render(self):
+        """Devuelve todas las métricas en formato de texto de Prometheus"""
+        merged = self._merged()
+        lines = []
+        described = set()
+
+        def describe(name, kind, help_text):
+            if name not in described:
+                described.add(name)
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} {kind}')
+
+        for (name, labels), value in sorted(merged.counters.items()):
+            kind, help_text = HELP.get(name, ('counter', name))
+            describe(name, kind, help_text)
+            lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        for (name, labels), values in sorted(merged.histograms.items()):
+            kind, help_text = HELP.get(name, ('histogram', name))
+            describe(name, kind, help_text)
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), values[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", str(bound)),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {values[-1]:.6f}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+
+        for collector in self._collectors:
+            for name, kind, help_text, samples in collector():
+                describe(name, kind, help_text)
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+    # --- Integración con Flask ---
+
+    def init_app(self, app):
+        """Instrumenta las peticiones, el renderizado de plantillas y la sesión de `app`"""
+        app.before_request(_remember_route)
+        app.wsgi_app = _TimingMiddleware(app.wsgi_app, self)
+        app.session_interface = _TimedSessionInterface(app.session_interface, self)
+
+        def render_started(sender, template, context, **extra):
+            self._local.render_started = time.perf_counter()
+
+        def render_finished(sender, template, context, **extra):
+            started = getattr(self._local, 'render_started', None)
+            if started is not None:
+                self.observe('undercover_phase_duration_seconds', (('phase', 'render'),),
+                             time.perf_counter() - started)
+
+        before_render_template.connect(render_started, app, weak=False)
+        template_rendered.connect(render_finished, app, weak=False)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    inner = ','.join('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                     for key, value in labels)
+    return '{' + inner + '}'
+
+
+def _remember_route():
+    """Guarda la regla de la ruta en el entorno WSGI para que la lea el middleware"""
+    rule = request.url_rule
+    request.environ['undercover.route'] = rule.rule if rule is not None else 'unmatched'
+
+
+class _TimingMiddleware:
+    """Mide la petición completa, incluido el guardado de la sesión"""
+
+    def __init__(self, wsgi_app, metrics):
+        self.wsgi_app = wsgi_app
+        self.metrics = metrics
+
+    def __call__(self, environ, start_response):
+        started = time.perf_counter()
+        status_holder = []
+
+        def _start_response(status, headers, exc_info=None):
+            status_holder.append(status.split(' ', 1)[0])
+            return start_response(status, headers, exc_info)
+
+        try:
+            return self.wsgi_app(environ, _start_response)
+        finally:
+            labels = (('route', environ.get('undercover.route', 'unmatched')),
+                      ('method', environ.get('REQUEST_METHOD', '')))
+            self.metrics.observe('undercover_request_duration_seconds', labels,
+                                 time.perf_counter() - started)
+            self.metrics.inc('undercover_requests_total',
+                             labels + (('status', status_holder[0] if status_holder else '500'),))
+
+
+class _TimedSessionInterface:
+    """Envuelve la SessionInterface real para medir la carga y el guardado de la sesión"""
+
+    def __init__(self, inner, metrics):
+        self.inner = inner
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self.inner, name)
+
+    def open_session(self, app, request):
+        with self.metrics.phase('session_open'):
+            return self.inner.open_session(app, request)
+
+    def save_session(self, app, session, response):
+        with self.metrics.phase('session_save'):
+            return self.inner.save_session(app, session, response)
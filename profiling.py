@@ -0,0 +1,206 @@
+"""
+Perfilado de peticiones bajo demanda con cProfile.
+
+Desactivado no cuesta nada: si no hay carpeta de perfiles o ningún disparador,
+`init_app` no instala nada. Activado, se perfila una petición cuando trae la
+cabecera X-Undercover-Profile con el secreto configurado o, al azar, una de
+cada 1/sample_rate. Se perfila la petición WSGI completa (vista, plantillas y
+guardado de la sesión), de una en una: si ya hay otra en curso la nueva no se
+perfila (desde Python 3.12 sólo puede haber un cProfile activo a la vez).
+
+Cada perfil se guarda en la carpeta como <id>.prof (formato pstats) y <id>.json
+(método, ruta, estado y duración). La carpeta es un búfer circular: al pasar
+de `keep` perfiles se borran los más antiguos. Los endpoints de administración
+los listan y los descargan en pstats, como texto o como pilas colapsadas para
+flamegraph.pl / speedscope.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import secrets
+import threading
+import time
+
+PROFILE_HEADER = 'HTTP_X_UNDERCOVER_PROFILE'
+# Perfiles que se conservan en la carpeta
+PROFILE_KEEP = 200
+# Profundidad máxima de las pilas colapsadas
+COLLAPSED_MAX_DEPTH = 64
+
+
+class RequestProfiler:
+    """Middleware WSGI que perfila las peticiones elegidas y guarda los perfiles en `directory`"""
+
+    def __init__(self, directory, secret=None, sample_rate=0.0, keep=PROFILE_KEEP):
+        self.directory = directory
+        self.secret = secret
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self.wsgi_app = None
+        self._busy = threading.Lock()
+        self._sequence = 0
+        self.profiled = 0
+        self.skipped = 0
+
+    @property
+    def enabled(self):
+        return bool(self.directory) and (bool(self.secret) or self.sample_rate > 0)
+
+    def init_app(self, app):
+        """Envuelve app.wsgi_app sólo si el perfilado está activado; devuelve si lo está"""
+        if not self.enabled:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        self.wsgi_app = app.wsgi_app
+        app.wsgi_app = self
+        return True
+
+    def _wanted(self, environ):
+        header = environ.get(PROFILE_HEADER)
+        if header is not None and self.secret and secrets.compare_digest(header, self.secret):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, environ, start_response):
+        if not self._wanted(environ):
+            return self.wsgi_app(environ, start_response)
+        if not self._busy.acquire(blocking=False):
+            self.skipped += 1
+            return self.wsgi_app(environ, start_response)
+        status_holder = []
+
+        def _start_response(status, headers, exc_info=None):
+            status_holder.append(int(status.split(' ', 1)[0]))
+            return start_response(status, headers, exc_info)
+
+        profile = cProfile.Profile()
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                return self.wsgi_app(environ, _start_response)
+            finally:
+                profile.disable()
+        finally:
+            try:
+                self._save(profile, {
+                    'method': environ.get('REQUEST_METHOD', ''),
+                    'path': environ.get('PATH_INFO', ''),
+                    'route': environ.get('undercover.route', 'unmatched'),
+                    'status': status_holder[0] if status_holder else 500,
+                    'duration': round(time.perf_counter() - started, 6),
+                    'started_at': started_at,
+                })
+            finally:
+                self._busy.release()
+
+    # --- Búfer circular en disco ---
+
+    def _save(self, profile, meta):
+        self._sequence += 1
+        # Ordenable por fecha y único entre procesos
+        profile_id = f'{int(meta["started_at"] * 1000):013d}-{os.getpid()}-{self._sequence}'
+        profile.dump_stats(os.path.join(self.directory, profile_id + '.prof'))
+        with open(os.path.join(self.directory, profile_id + '.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        self.profiled += 1
+        for old in self.ids()[self.keep:]:
+            for ext in ('.prof', '.json'):
+                try:
+                    os.remove(os.path.join(self.directory, old + ext))
+                except FileNotFoundError:
+                    pass
+
+    def ids(self):
+        """Ids de los perfiles guardados, del más reciente al más antiguo"""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted((name[:-5] for name in names if name.endswith('.prof')), reverse=True)
+
+    def path(self, profile_id):
+        """Ruta del .prof de `profile_id`, o None si no existe (o el id no es válido)"""
+        if not profile_id.replace('-', '').isdigit():
+            return None
+        path = os.path.join(self.directory, profile_id + '.prof')
+        return path if os.path.exists(path) else None
+
+    def list(self):
+        profiles = []
+        for profile_id in self.ids():
+            try:
+                with open(os.path.join(self.directory, profile_id + '.json'), encoding='utf-8') as f:
+                    meta = json.load(f)
+                size = os.path.getsize(os.path.join(self.directory, profile_id + '.prof'))
+            except (OSError, ValueError):
+                continue
+            profiles.append(dict(meta, id=profile_id, size=size))
+        return profiles
+
+    def collect(self):
+        """Colector para /metrics (ver Metrics.register_collector)"""
+        yield ('undercover_profiled_requests_total', 'counter', 'Peticiones perfiladas por resultado',
+               [((('result', 'saved'),), self.profiled), ((('result', 'busy'),), self.skipped)])
+
+
+# --- Formatos de descarga ---
+
+def stats_text(path, limit=50, sort='cumulative'):
+    """Informe de pstats con las `limit` funciones más costosas"""
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == '~':
+        return name
+    # Carpeta y archivo: distingue flask/app.py del app.py del juego
+    short = os.path.join(os.path.basename(os.path.dirname(filename)), os.path.basename(filename))
+    return f'{short}:{line}:{name}'
+
+
+def collapsed_stacks(path):
+    """
+    Pilas colapsadas ("a;b;c microsegundos" por línea) reconstruidas del grafo de
+    llamadas de cProfile. cProfile sólo guarda pares llamador -> llamado, así que el
+    tiempo de una función llamada desde varios sitios se reparte en proporción a lo
+    que costó desde cada uno: es una aproximación, exacta cuando cada función tiene
+    un solo llamador.
+    """
+    stats = pstats.Stats(path).stats
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, edge_ct) in callers.items():
+            callees.setdefault(caller, []).append((func, edge_ct))
+    lines = {}
+
+    def walk(func, stack, scale):
+        _, _, tt, ct, _ = stats[func]
+        # Ramas de menos de un microsegundo: no se verían y multiplican los caminos
+        if ct * scale < 1e-6:
+            return
+        stack = stack + (_label(func),)
+        self_time = int(tt * scale * 1e6)
+        if self_time > 0:
+            key = ';'.join(stack)
+            lines[key] = lines.get(key, 0) + self_time
+        if len(stack) >= COLLAPSED_MAX_DEPTH:
+            return
+        for callee, edge_ct in callees.get(func, ()):
+            callee_ct = stats[callee][3]
+            # Las llamadas recursivas ya están contadas en el tiempo de la función de más arriba
+            if callee_ct <= 0 or _label(callee) in stack:
+                continue
+            walk(callee, stack, scale * edge_ct / callee_ct)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, (), 1.0)
+    return ''.join(f'{stack} {value}\n' for stack, value in sorted(lines.items()))
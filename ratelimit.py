@@ -0,0 +1,151 @@
+"""
+Límite de peticiones en memoria con cubetas de fichas (token bucket).
+
+Cada ruta limitada tiene una regla "N/S": ráfagas de hasta N peticiones y N
+fichas nuevas cada S segundos. Se lleva una cubeta por IP y otra por sesión
+(si la sesión ya tiene id en el servidor, ver sessions.py); la petición pasa
+sólo si las dos tienen ficha. Si no, se responde 429 con Retry-After.
+
+Las cubetas se reparten en SHARDS fragmentos, cada uno con su propio lock y su
+tabla en orden de último uso: las peticiones de clientes distintos casi nunca
+esperan al mismo lock. Cada fragmento tiene un tamaño máximo y expulsa primero
+a los clientes que llevan más tiempo sin aparecer; una cubeta que ya se ha
+rellenado del todo se descarta sin perder nada (equivale a no tenerla).
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, jsonify, request, session
+
+# Número de fragmentos (potencia de 2)
+SHARDS = 32
+# Cubetas como máximo en memoria entre todos los fragmentos
+MAX_CLIENTS = 100000
+
+
+def parse_rule(text):
+    """'10/60' -> (10, 60.0): ráfaga de 10 peticiones, 10 fichas nuevas cada 60 segundos"""
+    count, _, seconds = text.partition('/')
+    count, seconds = int(count), float(seconds or 1)
+    if count < 1 or seconds <= 0:
+        raise ValueError(f'Regla de límite no válida: {text}')
+    return count, seconds
+
+
+def parse_rules(text):
+    """'POST /setup=10/60, POST /room/new=5/60' -> {('POST', '/setup'): (10, 60.0), ...}"""
+    rules = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        route, _, rule = item.rpartition('=')
+        method, _, path = route.strip().partition(' ')
+        rules[(method.upper(), path.strip())] = parse_rule(rule)
+    return rules
+
+
+class _Shard:
+    __slots__ = ('lock', 'buckets', 'evictions')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # clave -> [fichas, instante de la última actualización, periodo], en orden de último uso
+        self.buckets = OrderedDict()
+        self.evictions = 0
+
+
+class RateLimiter:
+    """Cubetas de fichas por clave, repartidas en fragmentos con lock propio"""
+
+    def __init__(self, max_clients=MAX_CLIENTS, shards=SHARDS, clock=time.monotonic):
+        self._shards = [_Shard() for _ in range(shards)]
+        self._mask = shards - 1
+        self._max_per_shard = max(1, max_clients // shards)
+        self._clock = clock
+        self.rules = {}
+        self.metrics = None
+
+    def __len__(self):
+        return sum(len(shard.buckets) for shard in self._shards)
+
+    @property
+    def evictions(self):
+        return sum(shard.evictions for shard in self._shards)
+
+    def hit(self, key, capacity, period):
+        """Consume una ficha de la cubeta `key`; devuelve 0 si había o los segundos hasta la siguiente"""
+        rate = capacity / period
+        shard = self._shards[hash(key) & self._mask]
+        now = self._clock()
+        with shard.lock:
+            buckets = shard.buckets
+            bucket = buckets.get(key)
+            if bucket is None:
+                self._evict(shard, now)
+                buckets[key] = [capacity - 1.0, now, period]
+                return 0.0
+            buckets.move_to_end(key)
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+            bucket[0] = tokens
+            return (1.0 - tokens) / rate
+
+    def _evict(self, shard, now):
+        """Antes de añadir una cubeta: descarta las ya rellenas y, si sigue lleno, la más antigua"""
+        buckets = shard.buckets
+        while buckets:
+            key, (_, updated, period) = next(iter(buckets.items()))
+            refilled = now - updated >= period
+            if not refilled and len(buckets) < self._max_per_shard:
+                break
+            del buckets[key]
+            if not refilled:
+                shard.evictions += 1
+
+    # --- Integración con Flask ---
+
+    def init_app(self, app, metrics=None):
+        """Aplica las reglas de app.config['RATE_LIMITS'] ({(método, ruta): (N, S)}) antes de cada petición"""
+        self.rules = app.config.get('RATE_LIMITS') or {}
+        self.metrics = metrics
+        app.before_request(self._check)
+
+    def _check(self):
+        rule = request.url_rule
+        limit = self.rules.get((request.method, rule.rule)) if rule is not None else None
+        if limit is None:
+            return None
+        keys = [('ip', request.remote_addr)]
+        sid = getattr(session, 'sid', None)
+        if sid is not None:
+            keys.append(('session', sid))
+        for scope, client in keys:
+            retry_after = self.hit((request.method, rule.rule, scope, client), *limit)
+            if retry_after:
+                if self.metrics is not None:
+                    self.metrics.inc('undercover_rate_limited_total',
+                                     (('route', rule.rule), ('method', request.method), ('scope', scope)))
+                return _too_many_requests(retry_after)
+        return None
+
+    def collect(self):
+        """Colector para /metrics (ver Metrics.register_collector)"""
+        yield ('undercover_rate_limit_clients', 'gauge', 'Cubetas del límite de peticiones en memoria',
+               [((), len(self))])
+        yield ('undercover_rate_limit_evictions_total', 'counter',
+               'Cubetas expulsadas antes de rellenarse por falta de espacio', [((), self.evictions)])
+
+
+def _too_many_requests(retry_after):
+    seconds = max(1, math.ceil(retry_after))
+    message = f"Demasiadas peticiones. Inténtalo de nuevo en {seconds} s."
+    if request.path.startswith('/api/'):
+        response = jsonify({'error': message})
+    else:
+        response = Response(message, mimetype='text/plain')
+    response.status_code = 429
+    response.headers['Retry-After'] = str(seconds)
+    return response
@@ -0,0 +1,313 @@
+"""
+Salas multijugador en tiempo real: cada jugador ve su tarjeta en su propio teléfono.
+
+El anfitrión crea la sala desde el formulario de configuración y los jugadores
+se unen con un código corto. Los cambios (jugadores que entran, nueva ronda,
+resultados) se envían a cada dispositivo con Server-Sent Events.
+
+Todo el estado de las salas vive en un `RoomHub` y sólo se modifica dentro de
+su bucle asyncio, así que no hace falta ningún lock. Las vistas de Flask (que
+corren en otros hilos) le piden operaciones con `hub.call()`. Nada que pueda
+bloquear se hace en el bucle (con asgi.py es el del servidor): la palabra de
+una ronda se sortea en la vista y el bucle sólo publica las tarjetas. Cada conexión SSE
+es un "suscriptor": una cola acotada con `put_nowait`, `qsize` y `maxsize`,
+como una `asyncio.Queue` (servidor ASGI) o una `queue.Queue` (servidor WSGI con
+hilos). Si un suscriptor se atrasa y llena su cola se le da de baja con un
+último evento DROPPED_EVENT, y su conexión se cierra para que el navegador
+vuelva a conectarse y reciba el estado actual.
+"""
+import asyncio
+import concurrent.futures
+import json
+import math
+import random
+import secrets
+import threading
+import time
+
+# Alfabeto sin caracteres ambiguos (0/O, 1/I/L) para los códigos de sala
+CODE_ALPHABET = 'ABCDEFGHJKMNPQRSTUVWXYZ23456789'
+CODE_LENGTH = 5
+# Segundos sin actividad tras los que se borra una sala
+ROOM_TTL = 2 * 60 * 60
+MAX_PLAYERS_PER_ROOM = 20
+# Duración máxima de la cuenta atrás del debate, en segundos
+MAX_TIMER_SECONDS = 15 * 60
+# Evento interno (no se envía al cliente): cierra la conexión de un suscriptor dado de baja
+DROPPED_EVENT = 'dropped'
+
+
+class RoomError(Exception):
+    """Error de uso de una sala (código inexistente, nombre repetido...), con mensaje para el usuario"""
+
+
+class RoomChanged(RoomError):
+    """La sala cambió (jugadores o mazo) mientras se preparaba la ronda; hay que volver a prepararla"""
+
+
+class Room:
+    __slots__ = ('code', 'host_token', 'settings', 'players', 'round', 'deck', 'deck_version', 'subscribers',
+                 'touched', 'timer', 'timer_ends')
+
+    def __init__(self, code, host_token, settings):
+        self.code = code
+        self.host_token = host_token
+        # num_impostors, selected_categories, hints_enabled, deck_mode
+        self.settings = settings
+        # token del jugador -> nombre, en orden de llegada
+        self.players = {}
+        # Ronda en curso: {'number', 'cards': {token: tarjeta}, 'results', 'revealed'}
+        self.round = None
+        self.deck = None
+        # Aumenta cada vez que una ronda cambia el mazo
+        self.deck_version = 0
+        # suscriptor -> token del jugador (None para el anfitrión)
+        self.subscribers = {}
+        self.touched = time.monotonic()
+        # Cuenta atrás en curso (tarea asyncio) y momento en que termina (reloj del bucle)
+        self.timer = None
+        self.timer_ends = None
+
+    def player_names(self):
+        return list(self.players.values())
+
+
+class RoomHub:
+    """Salas en memoria gestionadas desde un único bucle asyncio"""
+
+    def __init__(self):
+        self.rooms = {}
+        self.loop = None
+        self._lock = threading.Lock()
+
+    # --- Bucle de eventos ---
+
+    def attach(self, loop):
+        """Usa un bucle ya existente (p. ej. el del servidor ASGI)"""
+        with self._lock:
+            self.loop = loop
+        loop.call_soon_threadsafe(self._schedule_cleanup)
+
+    def _ensure_loop(self):
+        """Arranca un bucle propio en un hilo de fondo si nadie lo ha hecho"""
+        with self._lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='room-hub', daemon=True).start()
+                self.loop = loop
+                loop.call_soon_threadsafe(self._schedule_cleanup)
+            return self.loop
+
+    def call(self, func, *args):
+        """Ejecuta `func(*args)` dentro del bucle del hub y devuelve su resultado"""
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return func(*args)
+        future = concurrent.futures.Future()
+
+        def run():
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        loop.call_soon_threadsafe(run)
+        return future.result(timeout=10)
+
+    def call_soon(self, func, *args):
+        """Como call(), pero sin esperar el resultado"""
+        self._ensure_loop().call_soon_threadsafe(func, *args)
+
+    def _schedule_cleanup(self):
+        self.loop.call_later(60, self._cleanup)
+
+    def _cleanup(self):
+        limit = time.monotonic() - ROOM_TTL
+        for code in [code for code, room in self.rooms.items() if room.touched < limit]:
+            room = self.rooms.pop(code)
+            if room.timer is not None:
+                room.timer.cancel()
+            self._broadcast(room, 'closed', {})
+        self._schedule_cleanup()
+
+    # --- Operaciones (se ejecutan en el bucle) ---
+
+    def _room(self, code):
+        room = self.rooms.get((code or '').upper())
+        if room is None:
+            raise RoomError("La sala no existe o ya expiró")
+        room.touched = time.monotonic()
+        return room
+
+    def create_room(self, settings):
+        """Crea una sala y devuelve (código, token del anfitrión)"""
+        while True:
+            code = ''.join(random.choice(CODE_ALPHABET) for _ in range(CODE_LENGTH))
+            if code not in self.rooms:
+                break
+        host_token = secrets.token_urlsafe(16)
+        self.rooms[code] = Room(code, host_token, settings)
+        return code, host_token
+
+    def join(self, code, name):
+        """Une un jugador a la sala y devuelve su token"""
+        room = self._room(code)
+        name = name.strip()
+        if not name:
+            raise RoomError("Debes escribir tu nombre")
+        if name in room.players.values():
+            raise RoomError("Ya hay un jugador con ese nombre en la sala")
+        if len(room.players) >= MAX_PLAYERS_PER_ROOM:
+            raise RoomError(f"La sala ya tiene {MAX_PLAYERS_PER_ROOM} jugadores")
+        token = secrets.token_urlsafe(16)
+        room.players[token] = name
+        self._broadcast(room, 'players', {'players': room.player_names()})
+        return token
+
+    def room_info(self, code):
+        room = self._room(code)
+        return {'code': room.code, 'players': room.player_names(), 'settings': room.settings,
+                'round': room.round['number'] if room.round else 0}
+
+    def round_state(self, code, host_token):
+        """
+        (número de jugadores, mazo, versión del mazo) para preparar una ronda fuera
+        del bucle: sortear la palabra puede leer una categoría del disco
+        """
+        room = self._room(code)
+        if host_token != room.host_token:
+            raise RoomError("Sólo el anfitrión puede iniciar la ronda")
+        if len(room.players) < 3:
+            raise RoomError("Se necesitan al menos 3 jugadores en la sala")
+        return len(room.players), room.deck, room.deck_version
+
+    def start_round(self, code, host_token, num_players, deck_version, word_data, impostor_indices, hints, deck):
+        """
+        Publica una ronda preparada a partir de round_state(): datos de la palabra,
+        índices de impostores, pista por índice y mazo nuevo. Si desde entonces
+        entró un jugador o empezó otra ronda, lanza RoomChanged.
+        """
+        room = self._room(code)
+        if host_token != room.host_token:
+            raise RoomError("Sólo el anfitrión puede iniciar la ronda")
+        tokens = list(room.players)
+        if len(tokens) != num_players or room.deck_version != deck_version:
+            raise RoomChanged("La sala cambió mientras se preparaba la ronda; vuelve a intentarlo")
+        room.deck = deck
+        room.deck_version += 1
+        number = room.round['number'] + 1 if room.round else 1
+        impostors = set(impostor_indices)
+        cards = {}
+        for i, token in enumerate(tokens):
+            is_impostor = i in impostors
+            cards[token] = {'round': number, 'player': room.players[token], 'is_impostor': is_impostor,
+                            'palabra': None if is_impostor else word_data['palabra'],
+                            'hint': hints.get(i) if is_impostor else None}
+        room.round = {
+            'number': number,
+            'cards': cards,
+            'revealed': False,
+            'started_at': time.time(),
+            'results': {'round': number, 'palabra': word_data['palabra'], 'categoria': word_data['categoria'],
+                        'impostor_names': [room.players[tokens[i]] for i in impostor_indices],
+                        'jugador_inicial': room.players[random.choice(tokens)]},
+        }
+        self._broadcast(room, 'round', {'round': number, 'total_players': len(tokens)})
+        for subscriber, token in list(room.subscribers.items()):
+            if token in cards:
+                self._send(room, subscriber, 'card', cards[token])
+        return number
+
+    def reveal(self, code, host_token):
+        """
+        Muestra a todos los impostores y la palabra de la ronda en curso.
+        La primera vez devuelve la ronda terminada (para el historial); después, None.
+        """
+        room = self._room(code)
+        if host_token != room.host_token:
+            raise RoomError("Sólo el anfitrión puede mostrar los resultados")
+        if not room.round:
+            raise RoomError("Todavía no empezó ninguna ronda")
+        first_reveal = not room.round['revealed']
+        room.round['revealed'] = True
+        self._broadcast(room, 'results', room.round['results'])
+        if first_reveal:
+            results = room.round['results']
+            return {'categoria': results['categoria'], 'palabra': results['palabra'],
+                    'num_players': len(room.round['cards']), 'num_impostors': len(results['impostor_names']),
+                    'started_at': room.round['started_at']}
+        return None
+
+    def start_timer(self, code, host_token, seconds):
+        """Inicia (o reinicia) la cuenta atrás del debate; se envía un evento 'timer' por segundo"""
+        room = self._room(code)
+        if host_token != room.host_token:
+            raise RoomError("Sólo el anfitrión puede iniciar la cuenta atrás")
+        if not 1 <= seconds <= MAX_TIMER_SECONDS:
+            raise RoomError(f"La cuenta atrás debe durar entre 1 y {MAX_TIMER_SECONDS} segundos")
+        if room.timer is not None:
+            room.timer.cancel()
+        room.timer_ends = self.loop.time() + seconds
+        room.timer = self.loop.create_task(self._run_timer(room))
+
+    async def _run_timer(self, room):
+        try:
+            while True:
+                remaining = max(0, math.ceil(room.timer_ends - self.loop.time()))
+                self._broadcast(room, 'timer', {'remaining': remaining})
+                if remaining == 0:
+                    break
+                # Se duerme hasta el siguiente segundo exacto para no acumular desfase
+                await asyncio.sleep(room.timer_ends - self.loop.time() - (remaining - 1))
+        finally:
+            if room.timer is asyncio.current_task():
+                room.timer = room.timer_ends = None
+
+    def subscribe(self, code, token, subscriber):
+        """Registra una conexión SSE y le envía el estado actual de la sala"""
+        room = self._room(code)
+        if token not in room.players and token != room.host_token:
+            raise RoomError("No perteneces a esta sala")
+        room.subscribers[subscriber] = token if token in room.players else None
+        self._send(room, subscriber, 'players', {'players': room.player_names()})
+        if room.round:
+            self._send(room, subscriber, 'round', {'round': room.round['number'],
+                                                   'total_players': len(room.round['cards'])})
+            if token in room.round['cards']:
+                self._send(room, subscriber, 'card', room.round['cards'][token])
+            if room.round['revealed']:
+                self._send(room, subscriber, 'results', room.round['results'])
+        if room.timer is not None:
+            remaining = max(0, math.ceil(room.timer_ends - self.loop.time()))
+            self._send(room, subscriber, 'timer', {'remaining': remaining})
+
+    def unsubscribe(self, code, subscriber):
+        room = self.rooms.get(code)
+        if room is not None:
+            room.subscribers.pop(subscriber, None)
+
+    # --- Envío de eventos ---
+
+    def _send(self, room, subscriber, event, data):
+        # Cliente demasiado lento: el último hueco de la cola se reserva para avisarle de la baja
+        if 0 < subscriber.maxsize <= subscriber.qsize() + 1:
+            room.subscribers.pop(subscriber, None)
+            event, data = DROPPED_EVENT, {}
+        try:
+            subscriber.put_nowait((event, data))
+        except Exception:
+            # Desconectado
+            room.subscribers.pop(subscriber, None)
+
+    def _broadcast(self, room, event, data):
+        for subscriber in list(room.subscribers):
+            self._send(room, subscriber, event, data)
+
+
+def format_sse(event, data):
+    """Serializa un evento en el formato de Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
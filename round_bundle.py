@@ -0,0 +1,107 @@
+"""
+Ronda completa en una sola respuesta (modo una sola petición).
+
+`setup()` devuelve una página con toda la ronda en un paquete JSON y el
+navegador hace el resto sin volver a llamar al servidor: pasar el teléfono,
+colores, jugador inicial y cuenta atrás. Así una ronda cuesta una petición en
+lugar de 2N+2 y se puede jugar sin conexión una vez cargada.
+
+Cada tarjeta (y los resultados) va sellada por separado: el JSON de la tarjeta
+XOR una clave de un solo uso del mismo tamaño. El texto de las palabras no
+aparece en la página y el script sólo abre la tarjeta de quien mantiene
+pulsada la caja. Como la clave viaja en el mismo paquete, esto evita las miradas
+(ver el código fuente, un vistazo a la pantalla), no a quien depure el script.
+
+El paquete va firmado con HMAC-SHA256 (subclave propia derivada de la clave
+secreta de la aplicación): cuando el navegador avisa del final de la ronda
+reenvía el paquete y el servidor comprueba que lo emitió él, y que no es más
+antiguo que la duración de una sesión, antes de guardarlo en el historial.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import time
+
+BUNDLE_VERSION = 1
+# Margen para `started_at` en el futuro (relojes de varios servidores)
+CLOCK_SKEW = 60
+
+
+def bundle_key(secret_key):
+    """Subclave para firmar los paquetes, independiente de la que firma las cookies"""
+    if isinstance(secret_key, str):
+        secret_key = secret_key.encode('utf-8')
+    return hmac.new(secret_key, b'undercover-bundle', hashlib.sha256).digest()
+
+
+def _b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def seal(payload):
+    """{'data', 'pad'} en base64: el JSON de `payload` XOR una clave aleatoria del mismo tamaño"""
+    data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    pad = secrets.token_bytes(len(data))
+    return {'data': _b64(bytes(a ^ b for a, b in zip(data, pad))), 'pad': _b64(pad)}
+
+
+def unseal(sealed):
+    data, pad = base64.b64decode(sealed['data']), base64.b64decode(sealed['pad'])
+    return json.loads(bytes(a ^ b for a, b in zip(data, pad)).decode('utf-8'))
+
+
+def _canonical(bundle):
+    fields = {name: value for name, value in bundle.items() if name != 'signature'}
+    return json.dumps(fields, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def sign(key, bundle):
+    return dict(bundle, signature=hmac.new(key, _canonical(bundle), hashlib.sha256).hexdigest())
+
+
+def verify(key, bundle, max_age=None, now=None):
+    """Firma válida y, con `max_age`, `started_at` de hace como mucho `max_age` segundos"""
+    signature = bundle.get('signature') if isinstance(bundle, dict) else None
+    if not isinstance(signature, str):
+        return False
+    if not hmac.compare_digest(signature, hmac.new(key, _canonical(bundle), hashlib.sha256).hexdigest()):
+        return False
+    if max_age is None:
+        return True
+    started_at = bundle.get('started_at')
+    if not isinstance(started_at, int):
+        return False
+    age = (time.time() if now is None else now) - started_at
+    return -CLOCK_SKEW <= age <= max_age
+
+
+def build_bundle(key, seed, player_names, impostor_indices, word_data, hints, countdown, started_at,
+                 hints_enabled=False):
+    """
+    Paquete firmado de una ronda: una tarjeta sellada por jugador ({'is_impostor', 'palabra'
+    o 'hint'}) y los resultados sellados (impostores, categoría y palabra).
+    `hints` es índice del impostor -> pista.
+    """
+    impostors = set(impostor_indices)
+    cards = []
+    for index, name in enumerate(player_names):
+        if index in impostors:
+            card = {'is_impostor': True, 'hint': hints.get(index)}
+        else:
+            card = {'is_impostor': False, 'palabra': word_data['palabra']}
+        cards.append({'name': name, 'card': seal(card)})
+    results = {'impostor_names': [player_names[i] for i in sorted(impostors)],
+               'categoria': word_data['categoria'], 'palabra': word_data['palabra']}
+    return sign(key, {
+        'version': BUNDLE_VERSION,
+        # Como texto: JavaScript pierde precisión con enteros de 64 bits y rompería la firma
+        'seed': str(seed),
+        'started_at': int(started_at),
+        'hints_enabled': bool(hints_enabled),
+        'num_impostors': len(impostors),
+        'countdown': countdown,
+        'players': cards,
+        'results': seal(results),
+    })
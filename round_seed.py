@@ -0,0 +1,48 @@
+"""
+Rondas deterministas derivadas de una semilla.
+
+La sesión de una ronda local sólo guarda la semilla, los jugadores, la
+referencia de la palabra y las opciones; todo lo demás (impostores, pista de
+cada impostor, colores y jugador inicial) se vuelve a calcular en cada
+petición con un generador propio de la ronda. Así una recarga no cambia la
+pista, cualquier proceso con la misma clave secreta sirve cualquier petición
+y una ronda se puede reproducir exactamente (`flask replay-round`).
+
+Cada dato sale de un generador distinto, sembrado con
+HMAC-SHA256(clave, semilla + propósito): conocer la semilla (que viaja en la
+sesión) no basta para adivinar a los impostores sin la clave del servidor, y
+añadir un propósito nuevo no cambia los demás.
+"""
+import hashlib
+import hmac
+import random
+import secrets
+
+SEED_BITS = 64
+
+
+def new_seed():
+    return secrets.randbits(SEED_BITS)
+
+
+def round_key(secret_key):
+    """Subclave para las rondas, independiente de la que firma las cookies"""
+    if isinstance(secret_key, str):
+        secret_key = secret_key.encode('utf-8')
+    return hmac.new(secret_key, b'undercover-round', hashlib.sha256).digest()
+
+
+def round_rng(key, seed, purpose, *parts):
+    """Generador de la ronda `seed` para un propósito ('word', 'hint'...) y sus partes (p. ej. el jugador)"""
+    message = '\x1f'.join(str(part) for part in (seed, purpose) + parts).encode('utf-8')
+    return random.Random(int.from_bytes(hmac.new(key, message, hashlib.sha256).digest(), 'big'))
+
+
+def impostor_indices(key, seed, num_players, num_impostors):
+    """Índices (base 0) de los impostores; siempre queda al menos un civil"""
+    num_impostors = max(1, min(num_impostors, num_players - 1))
+    return round_rng(key, seed, 'impostors').sample(range(num_players), num_impostors)
+
+
+def starting_player(key, seed, num_players):
+    return round_rng(key, seed, 'start').randrange(num_players)
@@ -0,0 +1,208 @@
+"""
+Sesiones guardadas en el servidor.
+
+La cookie sólo lleva un identificador opaco; el estado de la ronda (jugadores,
+pistas, impostores, colores...) se guarda en un backend del servidor. Así la
+cookie tiene tamaño constante y no hay que serializarla ni firmarla en cada clic.
+
+Un backend es cualquier objeto con:
+    get(sid) -> dict o None
+    set(sid, data, ttl)
+    delete(sid)
+Aquí hay uno en memoria (LRU + TTL, para un solo proceso) y uno en SQLite
+(compartido entre procesos del mismo servidor). Un servicio tipo Redis puede
+añadirse implementando esos tres métodos.
+"""
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Sesión cuyo contenido vive en el servidor, identificada por `sid`"""
+
+    def __init__(self, initial=None, sid=None):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.modified = False
+        self.accessed = False
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+
+class MemorySessionBackend:
+    """Backend en memoria del proceso, con expiración deslizante y desalojo LRU"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # sid -> (expira, datos, ttl); el orden es el de expiración (el más viejo primero)
+        self._entries = OrderedDict()
+
+    def get(self, sid):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(sid)
+            if entry is None:
+                return None
+            expires, data, ttl = entry
+            if expires < now:
+                del self._entries[sid]
+                return None
+            self._entries[sid] = (now + ttl, data, ttl)
+            self._entries.move_to_end(sid)
+            return dict(data)
+
+    def set(self, sid, data, ttl):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[sid] = (now + ttl, dict(data), ttl)
+            self._entries.move_to_end(sid)
+            # Purga las expiradas y, si aún sobra, las menos usadas
+            while self._entries:
+                oldest_sid, (expires, _, _) = next(iter(self._entries.items()))
+                if expires >= now and len(self._entries) <= self.max_entries:
+                    break
+                del self._entries[oldest_sid]
+
+    def delete(self, sid):
+        with self._lock:
+            self._entries.pop(sid, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteSessionBackend:
+    """Backend en SQLite, compartido por todos los procesos que usen el mismo archivo"""
+
+    # Cada cuántas escrituras se borran las sesiones expiradas
+    PURGE_EVERY = 500
+
+    def __init__(self, path):
+        self.path = path
+        self.serializer = TaggedJSONSerializer()
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS sessions ('
+                         'sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid):
+        row = self._connect().execute('SELECT data, expires FROM sessions WHERE sid = ?', (sid,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return self.serializer.loads(row[0])
+
+    def set(self, sid, data, ttl):
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO sessions (sid, data, expires) VALUES (?, ?, ?)',
+                         (sid, self.serializer.dumps(dict(data)), now + ttl))
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                conn.execute('DELETE FROM sessions WHERE expires < ?', (now,))
+
+    def delete(self, sid):
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """SessionInterface de Flask que guarda los datos en `backend` y sólo el id en la cookie"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            data = self.backend.get(sid)
+            if data is not None:
+                return ServerSession(data, sid=sid)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        secure = self.get_cookie_secure(app)
+        samesite = self.get_cookie_samesite(app)
+        httponly = self.get_cookie_httponly(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        # Sesión vaciada (session.clear()): se borra en el servidor y en el navegador
+        if not session:
+            if session.modified and session.sid is not None:
+                self.backend.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=secure,
+                                       samesite=samesite, httponly=httponly)
+            return
+
+        if not self.should_set_cookie(app, session):
+            return
+
+        is_new = session.sid is None
+        if is_new:
+            session.sid = secrets.token_urlsafe(32)
+        ttl = app.permanent_session_lifetime.total_seconds()
+        self.backend.set(session.sid, session, ttl)
+        # El id no cambia entre clics: sólo hace falta reenviarlo si es nuevo o si renueva su expiración
+        if not is_new and not session.permanent:
+            return
+        response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session),
+                            httponly=httponly, domain=domain, path=path, secure=secure,
+                            samesite=samesite)
+
+
+def create_backend(app):
+    """Crea el backend indicado por app.config['SESSION_BACKEND'] (None si se usa la cookie de Flask)"""
+    backend = app.config.get('SESSION_BACKEND', 'memory')
+    if backend == 'cookie':
+        return None
+    if backend == 'memory':
+        return MemorySessionBackend(app.config.get('SESSION_MEMORY_MAX_ENTRIES', 10000))
+    if backend == 'sqlite':
+        path = app.config.get('SESSION_SQLITE_PATH') or os.path.join(app.instance_path, 'sessions.sqlite3')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        return SQLiteSessionBackend(path)
+    raise ValueError(f"SESSION_BACKEND desconocido: {backend!r}")
+
+
+def create_session_interface(app):
+    """Crea la SessionInterface indicada por app.config['SESSION_BACKEND']"""
+    backend = create_backend(app)
+    if backend is None:
+        return SecureCookieSessionInterface()
+    return ServerSideSessionInterface(backend)
@@ -0,0 +1,245 @@
+"""
+Simulador masivo de rondas e informe de equidad.
+
+Genera millones de rondas de una vez con muestreo vectorizado en NumPy
+(palabra, impostores y jugador inicial) y comprueba con pruebas chi-cuadrado
+que el sorteo es uniforme:
+
+    - frecuencia de impostor por asiento (random.sample de los índices)
+    - frecuencia por categoría (proporcional a su número de palabras)
+    - frecuencia por palabra (uniforme sobre todas las palabras seleccionadas)
+    - frecuencia de jugador inicial (jugador_inicial)
+
+Con --engine app se usa en su lugar el código real de la aplicación
+(WordIndex.position y los generadores por ronda de round_seed.py), ronda a
+ronda, para validar la implementación con una muestra más pequeña.
+
+También puede escribir un calendario de rondas para un torneo (--schedule).
+
+Requiere NumPy (pip install numpy), que no es necesario para servir el juego.
+
+Ejemplos:
+    python simulate.py --rounds 5000000 --players 8 --impostors 2
+    python simulate.py --engine app --rounds 200000 --categories Animales Comidas
+    python simulate.py --rounds 50 --players 10 --schedule torneo.jsonl
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependencia opcional
+    np = None
+
+from catalog import CategoryCatalog
+import round_seed
+
+# Rondas por bloque en el motor NumPy (acota la memoria)
+CHUNK_ROUNDS = 1_000_000
+
+
+def chi_square(observed, expected):
+    """Estadístico chi-cuadrado, grados de libertad y p-valor"""
+    observed = np.asarray(observed, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    mask = expected > 0
+    statistic = float((((observed - expected) ** 2)[mask] / expected[mask]).sum())
+    dof = int(mask.sum()) - 1
+    return statistic, dof, chi_square_pvalue(statistic, dof)
+
+
+def chi_square_pvalue(statistic, dof):
+    """P-valor de la cola superior; usa SciPy si está instalado y si no la aproximación de Wilson-Hilferty"""
+    if dof <= 0:
+        return 1.0
+    try:
+        from scipy.stats import chi2
+        return float(chi2.sf(statistic, dof))
+    except ImportError:
+        z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+        return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class Counts:
+    """Frecuencias acumuladas de una simulación"""
+
+    def __init__(self, num_players, num_words, num_categories):
+        self.rounds = 0
+        self.seats = np.zeros(num_players, dtype=np.int64)
+        self.starters = np.zeros(num_players, dtype=np.int64)
+        self.words = np.zeros(num_words, dtype=np.int64)
+        self.categories = np.zeros(num_categories, dtype=np.int64)
+
+
+def simulate_numpy(counts, cumulative, num_players, num_impostors, num_rounds, rng, schedule=None):
+    """Motor vectorizado: simula `num_rounds` rondas por bloques de CHUNK_ROUNDS"""
+    total_words = int(cumulative[-1])
+    remaining = num_rounds
+    while remaining > 0:
+        n = min(remaining, CHUNK_ROUNDS)
+        words = rng.integers(0, total_words, size=n)
+        categories = np.searchsorted(cumulative, words, side='right')
+        # Muestreo sin reemplazo por fila: los K menores de una fila de uniformes
+        impostors = np.argpartition(rng.random((n, num_players)), num_impostors - 1, axis=1)[:, :num_impostors]
+        starters = rng.integers(0, num_players, size=n)
+
+        counts.words += np.bincount(words, minlength=total_words)
+        counts.categories += np.bincount(categories, minlength=len(cumulative))
+        counts.seats += np.bincount(impostors.ravel(), minlength=num_players)
+        counts.starters += np.bincount(starters, minlength=num_players)
+        counts.rounds += n
+        if schedule is not None:
+            schedule.append((words, impostors, starters))
+        remaining -= n
+
+
+def simulate_app(counts, snapshot, selected, num_players, num_impostors, num_rounds, schedule=None):
+    """Motor de referencia: deriva cada ronda de una semilla como la aplicación (ver round_seed.py)"""
+    index = snapshot.index
+    cumulative = index._selection(selected)[1]
+    rows = []
+    key = round_seed.round_key(b'simulate')
+    for _ in range(num_rounds):
+        seed = random.getrandbits(round_seed.SEED_BITS)
+        # La misma posición que sortea WordIndex.choose: se cuenta sin pasar por el registro
+        position = index.position(selected, round_seed.round_rng(key, seed, 'word'))
+        impostors = round_seed.impostor_indices(key, seed, num_players, num_impostors)
+        starter = round_seed.starting_player(key, seed, num_players)
+        counts.words[position] += 1
+        counts.categories[int(np.searchsorted(cumulative, position, side='right'))] += 1
+        counts.seats[impostors] += 1
+        counts.starters[starter] += 1
+        if schedule is not None:
+            rows.append((position, impostors, starter))
+    counts.rounds += num_rounds
+    if schedule is not None and rows:
+        schedule.append((np.array([r[0] for r in rows]), np.array([r[1] for r in rows]),
+                         np.array([r[2] for r in rows])))
+
+
+def fairness_report(counts, category_names, category_sizes, num_players, num_impostors):
+    n = counts.rounds
+    total_words = int(sum(category_sizes))
+    seat_expected = np.full(num_players, n * num_impostors / num_players)
+    starter_expected = np.full(num_players, n / num_players)
+    category_expected = np.array(category_sizes, dtype=np.float64) * n / total_words
+    word_expected = np.full(total_words, n / total_words)
+
+    tests = {}
+    for name, observed, expected in (('impostor_por_asiento', counts.seats, seat_expected),
+                                     ('jugador_inicial', counts.starters, starter_expected),
+                                     ('categoria', counts.categories, category_expected),
+                                     ('palabra', counts.words, word_expected)):
+        statistic, dof, p_value = chi_square(observed, expected)
+        tests[name] = {'chi2': statistic, 'gl': dof, 'p_valor': p_value,
+                       'esperado_min': float(expected.min()) if len(expected) else 0.0}
+
+    return {
+        'rondas': n,
+        'jugadores': num_players,
+        'impostores': num_impostors,
+        'impostor_por_asiento': (counts.seats / n).tolist(),
+        'jugador_inicial': (counts.starters / n).tolist(),
+        'categorias': {name: {'palabras': size, 'frecuencia': int(observed), 'esperada': float(expected)}
+                       for name, size, observed, expected
+                       in zip(category_names, category_sizes, counts.categories, category_expected)},
+        'palabra_min': int(counts.words.min()),
+        'palabra_max': int(counts.words.max()),
+        'palabra_esperada': float(word_expected[0]),
+        'pruebas': tests,
+    }
+
+
+def print_report(report, elapsed, alpha):
+    n = report['rondas']
+    print(f"{n} rondas, {report['jugadores']} jugadores, {report['impostores']} impostor(es) "
+          f"en {elapsed:.2f} s ({n / elapsed:,.0f} rondas/s)")
+    print('\nFrecuencia de impostor por asiento (esperada '
+          f"{report['impostores'] / report['jugadores']:.4f}):")
+    print('  ' + ' '.join(f'{f:.4f}' for f in report['impostor_por_asiento']))
+    print(f"\nJugador inicial por asiento (esperada {1 / report['jugadores']:.4f}):")
+    print('  ' + ' '.join(f'{f:.4f}' for f in report['jugador_inicial']))
+    print('\nCategorías:')
+    for name, row in report['categorias'].items():
+        print(f"  {name:<50} {row['palabras']:>6} palabras {row['frecuencia']:>10} (esperada {row['esperada']:.0f})")
+    print(f"\nPalabras: mín {report['palabra_min']}, máx {report['palabra_max']}, "
+          f"esperada {report['palabra_esperada']:.1f}")
+    print('\nPruebas chi-cuadrado:')
+    for name, test in report['pruebas'].items():
+        verdict = 'OK' if test['p_valor'] >= alpha else 'NO UNIFORME'
+        warning = ' (esperado < 5 por celda: poco fiable)' if test['esperado_min'] < 5 else ''
+        print(f"  {name:<22} chi2={test['chi2']:.1f} gl={test['gl']} p={test['p_valor']:.4f} {verdict}{warning}")
+
+
+def write_schedule(path, schedule, records, num_rounds):
+    """Escribe el calendario simulado en JSON Lines (una ronda por línea)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        number = 0
+        for words, impostors, starters in schedule:
+            for word, seats, starter in zip(words.tolist(), impostors.tolist(), starters.tolist()):
+                number += 1
+                record = records[word]
+                f.write(json.dumps({'ronda': number, 'categoria': record['categoria'],
+                                    'palabra': record['palabra'], 'asientos_impostores': sorted(seats),
+                                    'asiento_inicial': starter}, ensure_ascii=False) + '\n')
+                if number >= num_rounds:
+                    return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--categories-dir', default='categorias/es')
+    parser.add_argument('--categories', nargs='*', help='categorías seleccionadas (por defecto todas)')
+    parser.add_argument('--players', type=int, default=8)
+    parser.add_argument('--impostors', type=int, default=1)
+    parser.add_argument('--rounds', type=int, default=1_000_000)
+    parser.add_argument('--engine', choices=('numpy', 'app'), default='numpy')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--alpha', type=float, default=0.001, help='nivel de significación de las pruebas')
+    parser.add_argument('--json', metavar='ARCHIVO', help='guarda el informe en JSON')
+    parser.add_argument('--schedule', metavar='ARCHIVO', help='escribe las rondas simuladas en JSON Lines')
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit('El simulador necesita NumPy: pip install numpy')
+
+    snapshot = CategoryCatalog(args.categories_dir).reload()
+    selected = args.categories or list(snapshot.word_counts)
+    cumulative = snapshot.index._selection(selected)[1]
+    if not cumulative:
+        sys.exit('No hay palabras disponibles en las categorías seleccionadas')
+    names = [name for name in sorted(set(selected)) if snapshot.word_counts.get(name)]
+    sizes = [snapshot.word_counts[name] for name in names]
+    # Registro de cada posición plana de la selección, para el calendario
+    records = [snapshot.index.record_at(selected, i) for i in range(cumulative[-1])] if args.schedule else None
+
+    num_impostors = max(1, min(args.impostors, args.players - 1))
+    counts = Counts(args.players, int(cumulative[-1]), len(cumulative))
+    schedule = [] if args.schedule else None
+
+    started = time.perf_counter()
+    if args.engine == 'numpy':
+        rng = np.random.default_rng(args.seed)
+        simulate_numpy(counts, np.array(cumulative), args.players, num_impostors, args.rounds, rng, schedule)
+    else:
+        if args.seed is not None:
+            random.seed(args.seed)
+        simulate_app(counts, snapshot, selected, args.players, num_impostors, args.rounds, schedule)
+    elapsed = time.perf_counter() - started
+
+    report = fairness_report(counts, names, sizes, args.players, num_impostors)
+    print_report(report, elapsed, args.alpha)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.schedule:
+        write_schedule(args.schedule, schedule, records, args.rounds)
+        print(f'\nCalendario escrito en {args.schedule}')
+
+
+if __name__ == '__main__':
+    main()
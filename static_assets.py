@@ -0,0 +1,147 @@
+"""
+Estilos y scripts estáticos con huella de contenido.
+
+Los CSS y JS de las plantillas viven en la carpeta `assets/`. Al arrancar se
+minifican, se les pone en el nombre un hash de su contenido
+(base.3f2a9c41d0e7.css) y se comprimen una sola vez con gzip y, si está
+instalado el paquete `brotli`, con brotli. Todas las variantes quedan en
+memoria y se sirven según Accept-Encoding con caché inmutable de un año: como
+el nombre cambia cuando cambia el contenido, el navegador no vuelve a pedirlos
+nunca y cada clic sólo descarga el HTML de la tarjeta.
+
+`flask build-assets` escribe los mismos archivos (con sus .gz y .br y un
+manifest.json) en `static/` para servirlos desde un proxy o una CDN
+(p. ej. nginx con gzip_static/brotli_static) sin pasar por la aplicación.
+"""
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+MANIFEST_FILENAME = 'manifest.json'
+HASH_LENGTH = 12
+# Un año: el contenido de un nombre con huella no cambia nunca
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+CONTENT_TYPES = {'.css': 'text/css; charset=utf-8', '.js': 'text/javascript; charset=utf-8'}
+
+
+def _strip_comments(text, line_comments):
+    """Quita los comentarios /* */ (y // si `line_comments`) respetando las cadenas entre comillas"""
+    out, i, n = [], 0, len(text)
+    while i < n:
+        c = text[i]
+        if c in '"\'`':
+            j = i + 1
+            while j < n and text[j] != c:
+                j += 2 if text[j] == '\\' else 1
+            out.append(text[i:j + 1])
+            i = j + 1
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif line_comments and text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        else:
+            out.append(c)
+            i += 1
+    return ''.join(out)
+
+
+def minify_css(text):
+    text = _strip_comments(text, line_comments=False)
+    out, i, n = [], 0, len(text)
+    # Mismo recorrido que _strip_comments para no tocar el interior de las cadenas
+    while i < n:
+        c = text[i]
+        if c in '"\'':
+            j = text.index(c, i + 1) + 1
+            out.append(text[i:j])
+            i = j
+        elif c.isspace():
+            while i < n and text[i].isspace():
+                i += 1
+            if out and out[-1][-1] not in '{};:,>(' and i < n and text[i] not in '{};,>)!':
+                out.append(' ')
+        else:
+            out.append(c)
+            i += 1
+    return ''.join(out).replace(';}', '}')
+
+
+def minify_js(text):
+    """Sin comentarios, sangría ni líneas vacías; se conservan los saltos de línea (inserción automática de ;)"""
+    lines = (line.strip() for line in _strip_comments(text, line_comments=True).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+class Asset:
+    """Un archivo estático ya minificado y comprimido: codificación -> bytes"""
+
+    def __init__(self, name, body):
+        stem, ext = os.path.splitext(name)
+        self.name = name
+        self.etag = hashlib.sha256(body).hexdigest()[:HASH_LENGTH]
+        self.filename = f'{stem}.{self.etag}{ext}'
+        self.content_type = CONTENT_TYPES.get(ext, 'application/octet-stream')
+        self.variants = {'identity': body, 'gzip': gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body, quality=11)
+
+    def negotiate(self, accept_encodings):
+        """Codificación más pequeña que acepta el cliente (werkzeug Accept de Accept-Encoding)"""
+        best = 'identity'
+        for encoding, body in self.variants.items():
+            if encoding != 'identity' and accept_encodings[encoding] > 0 \
+                    and len(body) < len(self.variants[best]):
+                best = encoding
+        return best
+
+
+class StaticAssets:
+    """Los archivos de `source_dir`, indexados por nombre original y por nombre con huella"""
+
+    def __init__(self, source_dir):
+        self.source_dir = source_dir
+        self.by_name = {}
+        self.by_filename = {}
+
+    def load(self):
+        by_name = {}
+        for name in sorted(os.listdir(self.source_dir)):
+            minify = MINIFIERS.get(os.path.splitext(name)[1])
+            if minify is None:
+                continue
+            with open(os.path.join(self.source_dir, name), encoding='utf-8') as f:
+                by_name[name] = Asset(name, minify(f.read()).encode('utf-8'))
+        self.by_name = by_name
+        self.by_filename = {asset.filename: asset for asset in by_name.values()}
+        return self
+
+    def filename(self, name):
+        """Nombre con huella de un archivo de `assets/` (KeyError si no existe)"""
+        return self.by_name[name].filename
+
+    def get(self, filename):
+        return self.by_filename.get(filename)
+
+    def write(self, output_dir):
+        """Escribe cada archivo con sus variantes comprimidas y un manifest.json nombre -> nombre con huella"""
+        os.makedirs(output_dir, exist_ok=True)
+        suffixes = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+        for asset in self.by_name.values():
+            for encoding, body in asset.variants.items():
+                with open(os.path.join(output_dir, asset.filename + suffixes[encoding]), 'wb') as f:
+                    f.write(body)
+        manifest = {name: asset.filename for name, asset in self.by_name.items()}
+        with open(os.path.join(output_dir, MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        return manifest
@@ -0,0 +1,30 @@
+import os
+import re
+import sys
+
+import pytest
+
+# Los módulos del juego están en la raíz del repositorio (igual que en benchmarks/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Antes de importar app: sin límite de peticiones ni historial en disco durante las pruebas
+os.environ['UNDERCOVER_RATE_LIMITS'] = ''
+os.environ['UNDERCOVER_HISTORY_DB'] = ''
+
+
+@pytest.fixture
+def app():
+    from app import app
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def category_names(client):
+    """Categorías que ofrece /setup con el catálogo por defecto"""
+    return re.findall(r'name="selected_categories" value="([^"]+)"', client.get('/setup').get_data(as_text=True))
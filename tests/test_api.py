@@ -0,0 +1,85 @@
+import json
+
+PLAYERS = ['Ana', 'Bruno', 'Carla', 'Diego', 'Eva']
+
+
+def test_round_rejects_more_than_max_impostors(client, category_names):
+    for path in ('/api/v1/rounds', '/api/v1/rounds/batch'):
+        response = client.post(path, json={'players': PLAYERS, 'categories': category_names[:1], 'num_impostors': 4})
+        assert response.status_code == 400
+        assert response.get_json() == {'error': "'num_impostors' no puede ser mayor que 3"}
+
+
+def test_categories_lists_word_counts(client, category_names):
+    data = client.get('/api/v1/categories').get_json()
+    assert [c['name'] for c in data['categories']] == category_names
+    assert all(c['words'] > 0 for c in data['categories'])
+    assert data['locale'] in data['locales']
+
+
+def test_round_cards_and_results(client, category_names):
+    response = client.post('/api/v1/rounds', json={'players': PLAYERS, 'categories': category_names,
+                                                   'num_impostors': 2})
+    assert response.status_code == 201
+    created = response.get_json()
+    assert created['players'] == PLAYERS and created['num_impostors'] == 2
+    cards = [client.get(url).get_json() for url in created['card_urls']]
+    results = client.get(created['results_url']).get_json()
+
+    impostors = [card['player'] for card in cards if card['is_impostor']]
+    assert sorted(impostors) == sorted(results['impostor_names'])
+    assert len(impostors) == 2
+    for card in cards:
+        assert card['palabra'] == (None if card['is_impostor'] else results['palabra'])
+    assert results['categoria'] in category_names
+    assert results['jugador_inicial'] in PLAYERS
+
+
+def test_round_accepts_comma_separated_players_and_clamps_impostors(client, category_names):
+    response = client.post('/api/v1/rounds', json={'players': 'Ana, Bruno,, Carla', 'categories': category_names,
+                                                   'num_impostors': 3})
+    created = response.get_json()
+    assert created['players'] == ['Ana', 'Bruno', 'Carla']
+    # Nunca más impostores que jugadores menos uno
+    assert created['num_impostors'] == 2
+
+
+def test_round_validation_errors(client, category_names):
+    cases = [
+        ({'players': PLAYERS[:2], 'categories': category_names}, 'Debes ingresar entre 3 y 20'),
+        ({'players': PLAYERS, 'categories': []}, 'categoría'),
+        ({'players': PLAYERS, 'categories': 'Animales'}, "'categories' debe ser una lista"),
+        ({'players': PLAYERS, 'categories': category_names, 'num_impostors': 'dos'}, "'num_impostors'"),
+        ({'players': PLAYERS, 'categories': category_names, 'hint_difficulty': 'imposible'}, "'hint_difficulty'"),
+        ({'players': PLAYERS, 'categories': ['No existe']}, 'No hay palabras disponibles'),
+    ]
+    for body, message in cases:
+        response = client.post('/api/v1/rounds', json=body)
+        assert response.status_code == 400, body
+        assert message in response.get_json()['error']
+
+
+def test_unknown_round_and_player(client, category_names):
+    assert client.get('/api/v1/rounds/no-existe/results').status_code == 404
+    created = client.post('/api/v1/rounds', json={'players': PLAYERS, 'categories': category_names}).get_json()
+    assert client.get(f"/api/v1/rounds/{created['round_id']}/players/6").status_code == 404
+
+
+def test_batch_streams_json_lines(client, category_names):
+    response = client.post('/api/v1/rounds/batch', json={'players': PLAYERS, 'categories': category_names,
+                                                         'count': 3})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 3
+    assert len({line['round_id'] for line in lines}) == 3
+    for line in lines:
+        assert [card['player_number'] for card in line['cards']] == [1, 2, 3, 4, 5]
+        # Cada ronda del lote también se puede consultar después
+        assert client.get(f"/api/v1/rounds/{line['round_id']}/results").get_json() == line['results']
+
+
+def test_batch_count_is_bounded(client, category_names):
+    for count in (0, 'muchas', 10 ** 6):
+        response = client.post('/api/v1/rounds/batch', json={'players': PLAYERS, 'categories': category_names,
+                                                             'count': count})
+        assert response.status_code == 400
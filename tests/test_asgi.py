@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+from asgi import UndercoverASGI
+from rooms import RoomHub
+
+
+def http_scope(method, path, headers=()):
+    return {'type': 'http', 'method': method, 'path': path, 'root_path': '', 'query_string': b'',
+            'headers': [(name.encode(), value.encode()) for name, value in headers],
+            'http_version': '1.1', 'scheme': 'http', 'server': ('testserver', 80), 'client': ('127.0.0.1', 5000)}
+
+
+async def call(server, scope, body_chunks=(b'',)):
+    """Ejecuta una petición completa; devuelve (estado, cabeceras, cuerpo)"""
+    incoming = [{'type': 'http.request', 'body': chunk, 'more_body': i < len(body_chunks) - 1}
+                for i, chunk in enumerate(body_chunks)]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0) if incoming else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    await server(scope, receive, send)
+    start = sent[0]
+    body = b''.join(m.get('body', b'') for m in sent[1:])
+    assert not sent[-1].get('more_body', False)
+    return start['status'], dict(start['headers']), body
+
+
+def test_wsgi_bridge_serves_flask_views(app, category_names):
+    server = UndercoverASGI(app.wsgi_app, RoomHub(), threads=2)
+
+    async def scenario():
+        status, headers, body = await call(server, http_scope('GET', '/healthz'))
+        assert status == 200 and json.loads(body)['status'] == 'ok'
+        # Cuerpo en varios mensajes http.request, leído bajo demanda desde el hilo de la vista
+        payload = json.dumps({'players': ['Ana', 'Bruno', 'Carla'], 'categories': category_names}).encode()
+        scope = http_scope('POST', '/api/v1/rounds', [('content-type', 'application/json'),
+                                                      ('content-length', str(len(payload)))])
+        status, headers, body = await call(server, scope, [payload[:10], payload[10:]])
+        assert status == 201 and len(json.loads(body)['card_urls']) == 3
+
+    asyncio.run(scenario())
+    server.executor.shutdown()
+
+
+def test_room_events_are_served_natively_from_the_hub_loop(app):
+    hub = RoomHub()
+    server = UndercoverASGI(app.wsgi_app, hub, threads=2)
+    code, host = hub.create_room({})
+    server._membership = lambda environ, room_code: {'code': room_code, 'host': host}
+
+    async def scenario():
+        disconnect = asyncio.Event()
+        sent = []
+
+        async def receive():
+            await disconnect.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+            if b'event: players' in message.get('body', b''):
+                # Un jugador entra: el evento llega por la misma conexión
+                if len(sent) == 2:
+                    hub.join(code, 'Ana')
+                else:
+                    disconnect.set()
+
+        await asyncio.wait_for(server(http_scope('GET', f'/room/{code.lower()}/events'), receive, send), 5)
+        assert hub.loop is asyncio.get_running_loop()
+        return sent
+
+    sent = asyncio.run(scenario())
+    server.executor.shutdown()
+    assert sent[0]['status'] == 200
+    assert [m['body'] for m in sent[1:3]] == [b'event: players\ndata: {"players": []}\n\n',
+                                              b'event: players\ndata: {"players": ["Ana"]}\n\n']
+    # Al desconectarse se da de baja el suscriptor
+    assert hub.rooms[code].subscribers == {}
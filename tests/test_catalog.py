@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from catalog import CategoryCatalog
+
+
+def write_category(directory, filename, name, words, mtime_ns=None):
+    path = os.path.join(directory, filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'categoria': name, 'palabras': [{'palabra': w, 'pistas': [w.lower()]} for w in words]}, f)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    write_category(tmp_path, 'animales.json', 'Animales', ['Gato', 'Perro'])
+    write_category(tmp_path, 'frutas.json', 'Frutas', ['Pera', 'Uva', 'Kiwi'])
+    return CategoryCatalog(str(tmp_path), check_interval=3600)
+
+
+def test_first_snapshot_loads_every_file(catalog):
+    snapshot = catalog.snapshot()
+    assert snapshot.version == 1
+    assert dict(snapshot.word_counts) == {'Animales': 2, 'Frutas': 3}
+    assert snapshot.word_count == 5
+
+
+def test_unchanged_files_are_not_reloaded(catalog):
+    first = catalog.snapshot()
+    assert catalog.reload() is first
+    assert catalog.reload_count == 1
+
+
+def test_only_the_changed_file_is_reparsed(catalog, tmp_path):
+    first = catalog.snapshot()
+    write_category(tmp_path, 'frutas.json', 'Frutas', ['Pera', 'Uva'], mtime_ns=10 ** 18)
+    second = catalog.reload()
+    assert second.version == 2
+    assert dict(second.word_counts) == {'Animales': 2, 'Frutas': 2}
+    # El archivo sin cambios conserva el mismo objeto del snapshot anterior
+    assert second.categories['Animales'] is first.categories['Animales']
+    # El snapshot anterior no se modifica
+    assert first.word_counts['Frutas'] == 3
+
+
+def test_check_interval_throttles_rescans(catalog, tmp_path):
+    first = catalog.snapshot()
+    write_category(tmp_path, 'verduras.json', 'Verduras', ['Col'])
+    assert catalog.snapshot() is first
+    catalog.check_interval = 0
+    catalog._next_check = 0.0
+    assert 'Verduras' in catalog.snapshot().categories
+
+
+def test_removed_and_broken_files(catalog, tmp_path):
+    catalog.snapshot()
+    os.remove(os.path.join(tmp_path, 'animales.json'))
+    with open(os.path.join(tmp_path, 'rota.json'), 'w', encoding='utf-8') as f:
+        f.write('{no es json')
+    snapshot = catalog.reload()
+    assert list(snapshot.categories) == ['Frutas']
+    assert catalog.parse_errors == 1
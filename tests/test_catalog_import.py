@@ -0,0 +1,96 @@
+import io
+import json
+import os
+
+import pytest
+
+import catalog_import
+
+
+def write_category(directory, filename, name, words):
+    with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+        json.dump({'categoria': name, 'palabras': [{'palabra': w, 'pistas': []} for w in words]}, f)
+
+
+def read_words(directory, filename):
+    with open(os.path.join(directory, filename), encoding='utf-8') as f:
+        return [word['palabra'] for word in json.load(f)['palabras']]
+
+
+def run(directory, text, fmt='csv', **kwargs):
+    files = {}
+    for filename in os.listdir(directory):
+        if filename.endswith('.json'):
+            with open(os.path.join(directory, filename), encoding='utf-8') as f:
+                files[json.load(f)['categoria']] = filename
+    return catalog_import.import_rows(catalog_import.iter_rows(io.StringIO(text), fmt), directory, files, **kwargs)
+
+
+@pytest.fixture
+def directory(tmp_path):
+    write_category(str(tmp_path), 'animales.json', 'Animales', ['Gato', 'Perro'])
+    return str(tmp_path)
+
+
+CSV = ('categoria,palabra,pistas\n'
+       'Animales,gato,felino\n'
+       'Animales,Loro,pluma|habla\n'
+       'Animales,LORO,\n'
+       'Frutas,Pera,\n')
+
+
+def test_dedupes_against_existing_and_new_words(directory):
+    result = run(directory, CSV)
+    assert result['error_count'] == 0
+    assert result['added'] == 2 and result['duplicates'] == 2
+    assert read_words(directory, 'animales.json') == ['Gato', 'Perro', 'Loro']
+    assert read_words(directory, 'frutas.json') == ['Pera']
+    assert not [name for name in os.listdir(directory) if name.endswith(('.tmp', '.bak'))]
+
+
+def test_dry_run_writes_nothing(directory):
+    result = run(directory, CSV, dry_run=True)
+    assert result['added'] == 2
+    assert sorted(os.listdir(directory)) == ['animales.json']
+
+
+def test_invalid_row_writes_nothing(directory):
+    result = run(directory, CSV + 'Frutas,,\n')
+    assert result['error_count'] == 1
+    assert 'fila 5' in result['errors'][0]
+    assert sorted(os.listdir(directory)) == ['animales.json']
+    assert read_words(directory, 'animales.json') == ['Gato', 'Perro']
+
+
+def test_unreadable_existing_file_leaves_every_category_untouched(directory):
+    with open(os.path.join(directory, 'zeta.json'), 'w', encoding='utf-8') as f:
+        f.write('{"categoria": "Zeta", "palabras": [')
+    rows = catalog_import.iter_rows(io.StringIO('categoria,palabra\nAnimales,Loro\nZeta,Algo\n'), 'csv')
+    result = catalog_import.import_rows(rows, directory, {'Animales': 'animales.json', 'Zeta': 'zeta.json'})
+    assert result['error_count'] == 1
+    assert read_words(directory, 'animales.json') == ['Gato', 'Perro']
+    assert sorted(os.listdir(directory)) == ['animales.json', 'zeta.json']
+
+
+def test_failed_replace_rolls_back_earlier_categories(directory, monkeypatch):
+    real_replace = os.replace
+
+    def flaky_replace(src, dst):
+        # Falla al sustituir la segunda categoría, cuando la primera ya está sustituida
+        if dst.endswith('frutas.json'):
+            raise OSError('disco lleno')
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(catalog_import.os, 'replace', flaky_replace)
+    result = run(directory, CSV)
+    monkeypatch.undo()
+    assert result['error_count'] == 1
+    assert read_words(directory, 'animales.json') == ['Gato', 'Perro']
+    assert sorted(os.listdir(directory)) == ['animales.json']
+
+
+def test_json_with_words_before_category(directory):
+    text = json.dumps({'palabras': ['Mango', {'palabra': 'Kiwi', 'pistas': ['verde']}], 'categoria': 'Frutas'})
+    result = run(directory, text, fmt='json')
+    assert result['added'] == 2
+    assert read_words(directory, 'frutas.json') == ['Mango', 'Kiwi']
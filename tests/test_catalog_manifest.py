@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from catalog import CategoryCatalog
+from catalog_manifest import CategoryCache, LazyRecords, StaleCatalogError, read_header
+
+
+def write_category(directory, filename, name, words):
+    path = os.path.join(directory, filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'categoria': name, 'palabras': [{'palabra': w, 'pistas': [w.lower()]} for w in words]}, f)
+    stat = os.stat(path)
+    return read_header(path, (stat.st_mtime_ns, stat.st_size))
+
+
+@pytest.fixture
+def lazy(tmp_path):
+    directory = str(tmp_path)
+    entries = [('Animales', 'animales.json', write_category(directory, 'animales.json', 'Animales', ['Gato', 'Perro'])),
+               ('Frutas', 'frutas.json', write_category(directory, 'frutas.json', 'Frutas', ['Pera', 'Uva', 'Kiwi']))]
+    stale = []
+    records = LazyRecords(directory, entries, CategoryCache(10 ** 6), on_stale=lambda: stale.append(True))
+    return directory, records, stale
+
+
+def test_loads_only_the_requested_category(lazy):
+    directory, records, stale = lazy
+    assert len(records) == 5
+    assert records[3] == {'categoria': 'Frutas', 'palabra': 'Uva', 'pistas': ['uva']}
+    assert len(records.cache) == 1
+    with pytest.raises(IndexError):
+        records[5]
+
+
+def test_resized_file_raises_stale_instead_of_wrapping(lazy):
+    directory, records, stale = lazy
+    write_category(directory, 'frutas.json', 'Frutas', ['Pera'])
+    with pytest.raises(StaleCatalogError):
+        records[4]
+    assert stale == [True]
+    # La carga fallida no se guarda en la caché
+    assert len(records.cache) == 0
+
+
+def test_edited_file_with_same_count_is_served_and_flagged(lazy):
+    directory, records, stale = lazy
+    write_category(directory, 'animales.json', 'Animales', ['Gato', 'Loro'])
+    assert records[1]['palabra'] == 'Loro'
+    assert stale == [True]
+
+
+def test_scan_reads_every_file_without_the_cache(lazy):
+    directory, records, stale = lazy
+    assert [r['palabra'] for r in records.scan()] == ['Gato', 'Perro', 'Pera', 'Uva', 'Kiwi']
+    assert len(records.cache) == 0
+
+
+def test_cache_evicts_least_recently_used_over_budget():
+    cache = CategoryCache(budget_bytes=100)
+    cache.get('a', 60, lambda: ['a'])
+    cache.get('b', 60, lambda: ['b'])
+    assert len(cache) == 1 and cache.evictions == 1
+    assert cache.get('b', 60, lambda: ['otra']) == ['b']
+    assert cache.hits == 1
+
+
+def test_catalog_reload_picks_up_the_resized_file(tmp_path):
+    directory = str(tmp_path)
+    write_category(directory, 'frutas.json', 'Frutas', ['Pera', 'Uva', 'Kiwi'])
+    catalog = CategoryCatalog(directory, check_interval=3600, lazy=True)
+    snapshot = catalog.reload()
+    write_category(directory, 'frutas.json', 'Frutas', ['Pera'])
+    with pytest.raises(StaleCatalogError):
+        snapshot.index.records[2]
+    # El error adelanta la siguiente revisión: el próximo snapshot ya tiene el tamaño nuevo
+    snapshot = catalog.snapshot()
+    assert len(snapshot.index) == 1
+    assert snapshot.index.records[0]['palabra'] == 'Pera'
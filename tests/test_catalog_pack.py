@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from catalog import CategoryCatalog
+from catalog_pack import CatalogPack, PackCategories, PackRecords, build_pack, pack_path
+
+CATEGORIES = {
+    'Animales': {'categoria': 'Animales', 'palabras': [{'palabra': 'Gato', 'pistas': ['felino', 'maúlla']},
+                                                      {'palabra': 'Perro', 'pistas': []}]},
+    'Vacía': {'categoria': 'Vacía', 'palabras': []},
+    'Frutas': {'categoria': 'Frutas', 'palabras': [{'palabra': 'Piña', 'pistas': ['tropical', 'felino']}]},
+}
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for name, data in CATEGORIES.items():
+        with open(tmp_path / f'{name.lower()}.json', 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    return str(tmp_path)
+
+
+def test_pack_round_trip(tmp_path):
+    path = str(tmp_path / 'catalogo.pack')
+    build_pack(CATEGORIES, ['b.json', 'a.json'], path)
+    pack = CatalogPack(path)
+    assert pack.metadata == {'sources': ['a.json', 'b.json']}
+    ranges = pack.ranges()
+    assert ranges == {'Animales': (0, 2), 'Vacía': (2, 2), 'Frutas': (2, 3)}
+    records = PackRecords(pack, ranges)
+    assert [records[i] for i in range(len(records))] == [
+        {'categoria': 'Animales', 'palabra': 'Gato', 'pistas': ['felino', 'maúlla']},
+        {'categoria': 'Animales', 'palabra': 'Perro', 'pistas': []},
+        {'categoria': 'Frutas', 'palabra': 'Piña', 'pistas': ['tropical', 'felino']},
+    ]
+    with pytest.raises(IndexError):
+        records[3]
+    assert dict(PackCategories(pack, ranges)) == CATEGORIES
+
+
+def test_rejects_files_that_are_not_packs(tmp_path):
+    path = tmp_path / 'catalogo.pack'
+    path.write_bytes(b'\0' * 128)
+    with pytest.raises(ValueError):
+        CatalogPack(str(path))
+
+
+def test_catalog_prefers_an_up_to_date_pack(directory):
+    build_pack(CATEGORIES, sorted(os.listdir(directory)), pack_path(directory))
+    catalog = CategoryCatalog(directory)
+    snapshot = catalog.reload()
+    assert catalog.source == 'pack'
+    assert snapshot.word_counts == {'Animales': 2, 'Vacía': 0, 'Frutas': 1}
+    assert snapshot.index.record_at(['Frutas'], 0)['palabra'] == 'Piña'
+
+
+def test_catalog_falls_back_to_json_when_the_pack_is_stale(directory):
+    build_pack(CATEGORIES, sorted(os.listdir(directory)), pack_path(directory))
+    # Un JSON que no está en el paquete, aunque sea más antiguo que él
+    with open(os.path.join(directory, 'colores.json'), 'w', encoding='utf-8') as f:
+        json.dump({'categoria': 'Colores', 'palabras': [{'palabra': 'Rojo', 'pistas': []}]}, f)
+    stat = os.stat(pack_path(directory))
+    os.utime(os.path.join(directory, 'colores.json'), ns=(stat.st_mtime_ns - 10 ** 9,) * 2)
+    catalog = CategoryCatalog(directory)
+    assert 'Colores' in catalog.reload().categories
+    assert catalog.source == 'json'
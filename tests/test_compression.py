@@ -0,0 +1,55 @@
+import gzip
+import zlib
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from compression import CachedPage, negotiate
+
+
+def accept(header):
+    return parse_accept_header(header, Accept)
+
+
+def test_negotiate_follows_the_client_quality():
+    assert negotiate(accept('gzip, deflate')) == 'gzip'
+    assert negotiate(accept('gzip;q=0.5, deflate')) == 'deflate'
+    assert negotiate(accept('br')) == 'identity'
+    assert negotiate(accept('')) == 'identity'
+
+
+def test_cached_page_compresses_each_encoding_once():
+    page = CachedPage(b'<p>hola</p>' * 200)
+    assert page.variant('gzip') is page.variant('gzip')
+    assert gzip.decompress(page.variant('gzip')) == page.body
+    assert zlib.decompress(page.variant('deflate')) == page.body
+    assert CachedPage(page.body).etag == page.etag
+
+
+def test_setup_page_etag_and_304(client):
+    plain = client.get('/setup')
+    assert plain.headers['Cache-Control'] == 'no-cache'
+    zipped = client.get('/setup', headers={'Accept-Encoding': 'gzip'})
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+    assert gzip.decompress(zipped.data) == plain.data
+    # Cada codificación es una representación distinta, con su propio ETag
+    assert zipped.headers['ETag'] != plain.headers['ETag']
+
+    again = client.get('/setup', headers={'Accept-Encoding': 'gzip', 'If-None-Match': zipped.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+    # Un ETag de otra codificación no vale
+    other = client.get('/setup', headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain.headers['ETag']})
+    assert other.status_code == 200
+
+
+def test_dynamic_pages_are_compressed_after_rendering(client, category_names):
+    client.post('/setup', data={'player_names': 'Ana, Bruno, Carla', 'selected_categories': category_names})
+    plain = client.get('/player')
+    zipped = client.get('/player', headers={'Accept-Encoding': 'deflate'})
+    assert zipped.headers['Content-Encoding'] == 'deflate'
+    assert zlib.decompress(zipped.data) == plain.data
+    # Sólo HTML: el JSON de la API no se toca
+    api = client.get('/api/v1/categories', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in api.headers
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+import deck
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 16, 17, 100, 1000, 4097])
+def test_permute_is_a_bijection(size):
+    for seed in (0, 1, 2 ** 62 + 12345):
+        images = [deck.permute(position, size, seed) for position in range(size)]
+        assert sorted(images) == list(range(size))
+
+
+def test_permute_depends_on_seed():
+    size = 200
+    first = [deck.permute(position, size, 1) for position in range(size)]
+    second = [deck.permute(position, size, 2) for position in range(size)]
+    assert first != second
+
+
+def test_draw_deals_every_word_once_then_reshuffles():
+    rng = random.Random(7)
+    state, drawn = None, []
+    for _ in range(50):
+        position, state = deck.draw(state, 'key', 50, rng)
+        drawn.append(position)
+    assert sorted(drawn) == list(range(50))
+    _, state = deck.draw(state, 'key', 50, rng)
+    assert state['pos'] == 1
+
+
+def test_draw_reshuffles_when_selection_changes():
+    rng = random.Random(7)
+    _, state = deck.draw(None, 'a', 10, rng)
+    _, state = deck.draw(state, 'a', 10, rng)
+    _, changed = deck.draw(state, 'b', 10, rng)
+    assert changed['key'] == 'b' and changed['pos'] == 1
+
+
+def test_fingerprint_ignores_category_order():
+    assert deck.fingerprint(3, ['b', 'a']) == deck.fingerprint(3, ['a', 'b', 'a'])
+    assert deck.fingerprint(3, ['a']) != deck.fingerprint(4, ['a'])
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+import hint_scores
+from hint_scores import HintBands, _split_bands, save_scores, word_key
+
+
+def record(categoria, palabra, pistas):
+    return {'categoria': categoria, 'palabra': palabra, 'pistas': pistas}
+
+
+def test_unique_hints_score_lower_than_shared_ones():
+    pytest.importorskip('numpy')
+    animals = ['Elefante', 'Ballena', 'Jirafa', 'Rinoceronte', 'Hipopótamo', 'Oso', 'Camello', 'Bisonte']
+    records = [record('Animales', name, [f'pista de {name}', 'grande', 'animal']) for name in animals]
+    records[0]['pistas'].append('elefantes')
+    scores, thresholds = hint_scores.score_hints(records, seed=3)
+    elefante = dict(scores[word_key('Animales', 'Elefante')])
+    # Una pista exclusiva casi delata la palabra; una que usan todas no
+    assert elefante['pista de Elefante'] < elefante['grande']
+    # La que contiene la palabra vale 0
+    assert elefante['elefantes'] == 0.0
+    assert thresholds[0] <= thresholds[1]
+
+
+def test_empty_bands_borrow_the_nearest_one():
+    bands = _split_bands([('a', 0.1), ('b', 0.9)], [0.3, 0.6])
+    assert bands == {'facil': ['a'], 'media': ['a'], 'dificil': ['b']}
+
+
+def test_choose_uses_the_band_and_falls_back_to_any_hint(tmp_path):
+    path = str(tmp_path / hint_scores.SCORES_FILENAME)
+    word = record('Animales', 'Gato', ['felino', 'mascota', 'bigotes'])
+    save_scores(path, {word_key('Animales', 'Gato'): [('felino', 0.1), ('mascota', 0.5), ('bigotes', 0.9)]},
+                [0.3, 0.6])
+    bands = HintBands(path)
+    rng = random.Random(0)
+    assert {bands.choose(word, 'facil', rng) for _ in range(20)} == {'felino'}
+    assert {bands.choose(word, 'dificil', rng) for _ in range(20)} == {'bigotes'}
+    # Sin banda, o sin puntuaciones para la palabra, cualquier pista vale
+    assert {bands.choose(word, None, rng) for _ in range(100)} == set(word['pistas'])
+    other = record('Animales', 'Perro', ['ladra'])
+    assert bands.choose(other, 'facil', rng) == 'ladra'
+    assert bands.choose(record('Animales', 'Pez', []), 'facil') is None
+
+
+def test_missing_or_incompatible_file_means_no_bands(tmp_path):
+    path = tmp_path / hint_scores.SCORES_FILENAME
+    assert HintBands(str(path)).bands('Animales', 'Gato') is None
+    path.write_text('{"version": 99}', encoding='utf-8')
+    assert HintBands(str(path)).bands('Animales', 'Gato') is None
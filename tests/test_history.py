@@ -0,0 +1,82 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from history import HistoryStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_history_is_off_unless_configured():
+    # Importar la aplicación (benchmarks, CLI) no debe crear la base ni el hilo de escritura
+    env = {k: v for k, v in os.environ.items() if k not in ('UNDERCOVER_HISTORY_DB', 'UNDERCOVER_RATE_LIMITS')}
+    result = subprocess.run([sys.executable, '-c', 'import app; print(app.history)'],
+                            cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'None'
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.sqlite3'), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_rounds_are_written_with_their_aggregates(store):
+    hour = 1_700_000_000 // 3600 * 3600
+    store.record('local', 'Animales', 'Gato', 5, 1, True, hour + 10, hour + 200)
+    store.record('room', 'Animales', 'Gato', 3, 1, False, hour + 20)
+    store.record('api', 'Frutas', 'Pera', 4, 1, True, hour + 30)
+    store.flush()
+    stats = store.stats(now=hour + 60)
+    assert store.written == 3 and store.pending() == 0
+    assert stats['total_rounds'] == 3
+    assert stats['top_words'][0] == {'categoria': 'Animales', 'palabra': 'Gato', 'plays': 2,
+                                     'last_played': hour + 20}
+    assert stats['categories'][0]['avg_players'] == 4.0
+    assert stats['rounds_per_hour'] == [{'hour': hour, 'rounds': 3}]
+    assert store.stats(hours=1, now=hour + 2 * 3600)['rounds_per_hour'] == []
+
+
+def test_seeded_rounds_are_written_once_across_restarts(store):
+    store.record('bundle', 'Animales', 'Gato', 5, 1, True, 100.0, seed=42)
+    store.record('bundle', 'Animales', 'Gato', 5, 1, True, 100.0, seed=42)
+    store.flush()
+    assert (store.written, store.duplicates) == (1, 1)
+    restarted = HistoryStore(store.path, flush_interval=0.01)
+    restarted.record('bundle', 'Animales', 'Gato', 5, 1, True, 100.0, seed=42)
+    restarted.flush()
+    restarted.close()
+    assert restarted.duplicates == 1
+    assert store.stats()['total_rounds'] == 1
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.sqlite3'), queue_size=2)
+    store.close()
+    # Sin hilo de escritura la cola no se vacía
+    assert [store.record('local', 'Animales', 'Gato', 3, 1, True, 0.0) for _ in range(3)] == [True, True, False]
+    assert store.dropped == 1
+
+
+def test_adds_the_seed_column_to_old_databases(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE rounds (id INTEGER PRIMARY KEY, source TEXT NOT NULL, categoria TEXT NOT NULL, '
+                     'palabra TEXT NOT NULL, num_players INTEGER NOT NULL, num_impostors INTEGER NOT NULL, '
+                     'hints_enabled INTEGER NOT NULL, started_at REAL NOT NULL, completed_at REAL)')
+    store = HistoryStore(path, flush_interval=0.01)
+    store.record('bundle', 'Animales', 'Gato', 5, 1, True, 100.0, seed=7)
+    store.flush()
+    store.close()
+    assert store.written == 1
+
+
+def test_stats_endpoint_is_404_while_history_is_off(client):
+    response = client.get('/api/v1/stats')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'El historial de rondas está desactivado'}
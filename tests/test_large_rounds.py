@@ -0,0 +1,73 @@
+import pytest
+
+import large_rounds
+from sessions import MemorySessionBackend
+
+
+@pytest.mark.parametrize('num_players', [3, 8, 9, 1000])
+def test_bitmap_set_and_test(num_players):
+    indices = sorted({0, num_players // 2, num_players - 1})
+    bitmap = large_rounds.impostor_bitmap(indices, num_players)
+    assert len(bitmap) == (num_players + 7) // 8
+    assert [i for i in range(num_players) if large_rounds.is_impostor(bitmap, i)] == indices
+    assert list(large_rounds.impostor_positions(bitmap)) == indices
+
+
+def test_bitmap_positions_are_sorted_for_unsorted_input():
+    bitmap = large_rounds.impostor_bitmap([999, 8, 7, 0], 1000)
+    assert list(large_rounds.impostor_positions(bitmap)) == [0, 7, 8, 999]
+
+
+class CountingBackend(MemorySessionBackend):
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+
+    def get(self, sid):
+        self.reads.append(sid)
+        return super().get(sid)
+
+
+@pytest.fixture
+def store():
+    return large_rounds.LargeRoundStore(CountingBackend(), ttl=60)
+
+
+def test_names_are_stored_in_chunks(store):
+    names = [f'N{i}' for i in range(250)]
+    round_id = store.create({'num_players': 250}, names)
+    round_data = store.get(round_id)
+    assert round_data['named']
+    chunks = [key for key in store.backend._entries if ':names:' in key]
+    assert len(chunks) == 3
+    store.backend.reads.clear()
+    assert store.name(round_id, round_data, 249) == 'N249'
+    assert store.backend.reads == [f'large-round:{round_id}:names:2']
+
+
+def test_names_read_each_chunk_once(store):
+    names = [f'N{i}' for i in range(250)]
+    round_id = store.create({'num_players': 250}, names)
+    round_data = store.get(round_id)
+    store.backend.reads.clear()
+    indices = [0, 5, 99, 100, 150, 249]
+    assert list(store.names(round_id, round_data, indices)) == [f'N{i}' for i in indices]
+    assert len(store.backend.reads) == 3
+
+
+def test_unnamed_rounds_store_no_chunks(store):
+    round_id = store.create({'num_players': 1000})
+    round_data = store.get(round_id)
+    assert not round_data['named']
+    assert len(store.backend) == 1
+    assert store.name(round_id, round_data, 999) == 'Jugador 1000'
+    assert list(store.names(round_id, round_data, range(2))) == ['Jugador 1', 'Jugador 2']
+
+
+def test_card_token():
+    key = b'k' * 32
+    token = large_rounds.card_token(key, 'abc', 4)
+    assert large_rounds.check_card_token(key, 'abc', 4, token)
+    assert not large_rounds.check_card_token(key, 'abc', 5, token)
+    assert not large_rounds.check_card_token(key, 'abd', 4, token)
+    assert not large_rounds.check_card_token(key, 'abc', 4, None)
@@ -0,0 +1,49 @@
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks import load_test
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_load_test_runs_past_setup_rate_limit():
+    # POST /setup=20/60 por IP por defecto: 25 rondas sólo terminan si el benchmark lo desactiva
+    env = {k: v for k, v in os.environ.items() if k != 'UNDERCOVER_RATE_LIMITS'}
+    result = subprocess.run(
+        [sys.executable, os.path.join('benchmarks', 'load_test.py'),
+         '--words', '100', '--categories', '5', '--players', '3', '--rounds', '25'],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert re.search(r'^POST /setup\s+25\s', result.stdout, re.M)
+
+
+def test_percentile_picks_the_nearest_rank():
+    values = [i / 1000 for i in range(1, 101)]
+    assert load_test.percentile(values, 0.50) == pytest.approx(0.051)
+    assert load_test.percentile(values, 0.99) == pytest.approx(0.099)
+    assert load_test.percentile([], 0.95) == 0.0
+
+
+def test_summarize_reports_every_route_in_milliseconds():
+    recorder = load_test.Recorder()
+    for ms in (1, 2, 3, 4):
+        recorder.add('GET /player', ms / 1000)
+    results = load_test.summarize(recorder, elapsed=2.0)
+    assert list(results) == list(load_test.ROUTES)
+    assert results['GET /player']['count'] == 4
+    assert results['GET /player']['throughput'] == 2.0
+    assert results['GET /player']['p95_ms'] == pytest.approx(4.0)
+    assert results['GET /setup']['count'] == 0
+
+
+def test_compare_with_baseline_flags_p95_regressions():
+    baseline = {'results': {'GET /setup': {'p95_ms': 2.0}, 'GET /player': {'p95_ms': 1.0},
+                            'POST /next': {'p95_ms': 0.0}}}
+    results = {'GET /setup': {'p95_ms': 2.4}, 'GET /player': {'p95_ms': 1.3},
+               'POST /next': {'p95_ms': 5.0}, 'GET /complete': {'p95_ms': 9.0}}
+    # Sólo GET /player empeora más del 25 %; sin línea base (o con p95 = 0) no se compara
+    assert load_test.compare_with_baseline(results, baseline, 0.25) == [('GET /player', 1.0, 1.3, 1.3)]
@@ -0,0 +1,54 @@
+import json
+import os
+
+import pytest
+from werkzeug.datastructures import LanguageAccept
+
+from locales import LocaleCatalogs
+
+
+def write_category(directory, name, words):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f'{name.lower()}.json'), 'w', encoding='utf-8') as f:
+        json.dump({'categoria': name, 'palabras': [{'palabra': w, 'pistas': []} for w in words]}, f)
+
+
+@pytest.fixture
+def root(tmp_path):
+    write_category(tmp_path / 'es', 'Animales', ['Gato', 'Perro'])
+    write_category(tmp_path / 'en', 'Animals', ['Cat'])
+    write_category(tmp_path / 'pt-BR', 'Animais', ['Gato', 'Cão', 'Pato'])
+    (tmp_path / '_copias').mkdir()
+    return str(tmp_path)
+
+
+def test_only_the_requested_locales_are_loaded(root):
+    locales = LocaleCatalogs(root)
+    assert locales.available() == ['en', 'es', 'pt-BR']
+    assert locales.loaded() == {}
+    assert dict(locales.shard().catalog.current.word_counts) == {'Animales': 2}
+    assert dict(locales.shard('pt-BR').catalog.current.word_counts) == {'Animais': 3}
+    assert sorted(locales.loaded()) == ['es', 'pt-BR']
+    # Un idioma desconocido usa el de por defecto sin crear otro catálogo
+    assert locales.shard('fr') is locales.shard('es')
+
+
+def test_negotiate_prefers_lang_then_accept_language(root):
+    locales = LocaleCatalogs(root)
+    assert locales.negotiate('pt-br') == 'pt-BR'
+    assert locales.negotiate('en-US') == 'en'
+    assert locales.negotiate('fr', LanguageAccept([('pt-BR', 1), ('en', 0.5)])) == 'pt-BR'
+    assert locales.negotiate(None, LanguageAccept([('de', 1)])) == 'es'
+
+
+def test_flat_directory_is_the_default_locale(tmp_path):
+    write_category(tmp_path, 'Colores', ['Rojo'])
+    locales = LocaleCatalogs(str(tmp_path), default_locale='es')
+    assert locales.available() == ['es']
+    assert 'Colores' in locales.shard().catalog.current.categories
+
+
+def test_lang_parameter_falls_back_to_the_default(client, category_names):
+    assert client.get('/api/v1/categories', query_string={'lang': 'xx'}).get_json()['locale'] == 'es'
+    response = client.get('/setup', headers={'Accept-Language': 'xx'})
+    assert 'Accept-Language' in response.headers['Vary']
@@ -0,0 +1,51 @@
+import threading
+
+from metrics import Metrics
+
+
+def test_counters_from_finished_threads_are_kept():
+    metrics = Metrics()
+    metrics.inc('hits', (('route', '/setup'),))
+
+    def worker():
+        for _ in range(3):
+            metrics.inc('hits', (('route', '/setup'),))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert 'hits{route="/setup"} 4' in metrics.render().splitlines()
+
+
+def test_histogram_buckets_are_cumulative():
+    metrics = Metrics()
+    for seconds in (0.0002, 0.003, 7.0):
+        metrics.observe('undercover_request_duration_seconds', (('route', '/player'),), seconds)
+    lines = metrics.render().splitlines()
+    assert '# TYPE undercover_request_duration_seconds histogram' in lines
+    assert 'undercover_request_duration_seconds_bucket{route="/player",le="0.0005"} 1' in lines
+    assert 'undercover_request_duration_seconds_bucket{route="/player",le="0.005"} 2' in lines
+    assert 'undercover_request_duration_seconds_bucket{route="/player",le="+Inf"} 3' in lines
+    assert 'undercover_request_duration_seconds_count{route="/player"} 3' in lines
+
+
+def test_collectors_and_label_escaping():
+    metrics = Metrics()
+    metrics.register_collector(lambda: [('catalog_words', 'gauge', 'Palabras', [((('name', 'a"b'),), 7)])])
+    lines = metrics.render().splitlines()
+    assert '# TYPE catalog_words gauge' in lines
+    assert 'catalog_words{name="a\\"b"} 7' in lines
+
+
+def test_metrics_endpoint_counts_requests_by_route(client):
+    client.get('/healthz')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'undercover_requests_total{route="/healthz",method="GET",status="200"}' in body
+    assert 'undercover_phase_duration_seconds_bucket{phase="session_open"' in body
+
+
+def test_healthz_reports_the_catalog(client):
+    data = client.get('/healthz').get_json()
+    assert data['status'] == 'ok'
+    assert data['categories'] > 0 and data['words'] > 0
+    assert data['default_locale'] in data['locales']
@@ -0,0 +1,64 @@
+import pytest
+from flask import Flask
+
+import profiling
+from profiling import RequestProfiler
+
+
+def busy_view():
+    return str(sum(i * i for i in range(20000)))
+
+
+@pytest.fixture
+def profiled(tmp_path):
+    app = Flask(__name__)
+    app.add_url_rule('/trabajo', 'trabajo', busy_view)
+    profiler = RequestProfiler(str(tmp_path / 'perfiles'), secret='s3creto', keep=2)
+    assert profiler.init_app(app)
+    return app.test_client(), profiler
+
+
+def test_disabled_profiler_installs_nothing(tmp_path):
+    app = Flask(__name__)
+    wsgi_app = app.wsgi_app
+    for profiler in (RequestProfiler(''), RequestProfiler(str(tmp_path), secret=None, sample_rate=0)):
+        assert not profiler.enabled
+        assert profiler.init_app(app) is False
+    assert app.wsgi_app == wsgi_app
+
+
+def test_only_requests_with_the_secret_are_profiled(profiled):
+    client, profiler = profiled
+    client.get('/trabajo')
+    client.get('/trabajo', headers={'X-Undercover-Profile': 'otro'})
+    assert profiler.ids() == []
+    assert client.get('/trabajo', headers={'X-Undercover-Profile': 's3creto'}).status_code == 200
+    [meta] = profiler.list()
+    assert (meta['method'], meta['path'], meta['status']) == ('GET', '/trabajo', 200)
+    assert meta['size'] > 0
+
+
+def test_ring_buffer_keeps_the_newest_profiles(profiled):
+    client, profiler = profiled
+    for _ in range(3):
+        client.get('/trabajo', headers={'X-Undercover-Profile': 's3creto'})
+    assert profiler.profiled == 3
+    assert len(profiler.ids()) == 2
+    assert profiler.ids() == sorted(profiler.ids(), reverse=True)
+
+
+def test_download_formats(profiled):
+    client, profiler = profiled
+    client.get('/trabajo', headers={'X-Undercover-Profile': 's3creto'})
+    path = profiler.path(profiler.ids()[0])
+    assert 'busy_view' in profiling.stats_text(path)
+    stacks = profiling.collapsed_stacks(path).splitlines()
+    assert any('busy_view' in line for line in stacks)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in stacks)
+    # Ids inventados o con rutas no se resuelven
+    assert profiler.path('../../etc/passwd') is None
+    assert profiler.path('123-456') is None
+
+
+def test_admin_endpoints_are_hidden_while_profiling_is_off(client):
+    assert client.get('/api/v1/admin/profiles').status_code == 404
@@ -0,0 +1,79 @@
+import pytest
+
+import ratelimit
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_burst_then_retry_after(clock):
+    limiter = ratelimit.RateLimiter(clock=clock)
+    assert [limiter.hit('ip', 3, 60) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 3 fichas cada 60 s: la siguiente llega en 20 s
+    assert limiter.hit('ip', 3, 60) == pytest.approx(20.0)
+
+
+def test_tokens_refill_over_time(clock):
+    limiter = ratelimit.RateLimiter(clock=clock)
+    for _ in range(3):
+        limiter.hit('ip', 3, 60)
+    clock.now += 20
+    assert limiter.hit('ip', 3, 60) == 0.0
+    assert limiter.hit('ip', 3, 60) > 0
+    # Nunca se acumulan más fichas que la ráfaga
+    clock.now += 3600
+    assert [limiter.hit('ip', 3, 60) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.hit('ip', 3, 60) > 0
+
+
+def test_keys_are_independent(clock):
+    limiter = ratelimit.RateLimiter(clock=clock)
+    assert limiter.hit('a', 1, 60) == 0.0
+    assert limiter.hit('a', 1, 60) > 0
+    assert limiter.hit('b', 1, 60) == 0.0
+
+
+def test_keys_are_spread_over_shards(clock):
+    limiter = ratelimit.RateLimiter(shards=4, clock=clock)
+    # hash(n) == n para enteros pequeños: fragmento n & 3
+    for key in range(8):
+        limiter.hit(key, 5, 60)
+    assert [len(shard.buckets) for shard in limiter._shards] == [2, 2, 2, 2]
+    assert len(limiter) == 8
+
+
+def test_full_shard_evicts_least_recently_used(clock):
+    limiter = ratelimit.RateLimiter(max_clients=8, shards=4, clock=clock)
+    for key in (0, 4, 8):
+        limiter.hit(key, 1, 60)
+    # Dos cubetas por fragmento: la 0 (la más antigua) se expulsa antes de tiempo
+    assert list(limiter._shards[0].buckets) == [4, 8]
+    assert limiter.evictions == 1
+    # Sin su cubeta, el cliente 0 vuelve a tener ráfaga completa
+    assert limiter.hit(0, 1, 60) == 0.0
+
+
+def test_refilled_buckets_are_dropped_without_counting_evictions(clock):
+    limiter = ratelimit.RateLimiter(shards=1, clock=clock)
+    limiter.hit('old', 1, 60)
+    clock.now += 61
+    limiter.hit('new', 1, 60)
+    assert list(limiter._shards[0].buckets) == ['new']
+    assert limiter.evictions == 0
+
+
+def test_parse_rules():
+    assert ratelimit.parse_rules('POST /setup=10/60, get /api/v1/rounds=5') == {
+        ('POST', '/setup'): (10, 60.0), ('GET', '/api/v1/rounds'): (5, 1.0)}
+    with pytest.raises(ValueError):
+        ratelimit.parse_rule('0/60')
@@ -0,0 +1,97 @@
+import queue
+
+import pytest
+
+from rooms import DROPPED_EVENT, RoomChanged, RoomError, RoomHub
+
+
+def test_create_room_rejects_non_numeric_impostors(client, category_names):
+    response = client.post('/room/new', data={'selected_categories': category_names[:1], 'num_impostors': 'dos'})
+    assert response.status_code == 200
+    assert 'El número de impostores debe ser un número' in response.get_data(as_text=True)
+    with client.session_transaction() as sess:
+        assert 'room' not in sess
+
+
+def test_create_room_enforces_max_impostors(client, category_names):
+    response = client.post('/room/new', data={'selected_categories': category_names[:1], 'num_impostors': '4'})
+    assert 'Como máximo 3 impostores por sala' in response.get_data(as_text=True)
+    with client.session_transaction() as sess:
+        assert 'room' not in sess
+
+
+def test_hub_round_deals_one_card_per_player():
+    hub = RoomHub()
+    code, host = hub.create_room({'num_impostors': 1})
+    tokens = [hub.join(code, name) for name in ('Ana', 'Bruno', 'Carla')]
+    with pytest.raises(RoomError):
+        hub.join(code.lower(), 'Ana')
+    subscriber = queue.Queue(maxsize=10)
+    hub.subscribe(code, tokens[1], subscriber)
+    assert subscriber.get_nowait() == ('players', {'players': ['Ana', 'Bruno', 'Carla']})
+
+    num_players, deck, version = hub.round_state(code, host)
+    word = {'palabra': 'Gato', 'categoria': 'Animales'}
+    hub.start_round(code, host, num_players, version, word, [1], {1: 'felino'}, deck)
+    assert subscriber.get_nowait() == ('round', {'round': 1, 'total_players': 3})
+    # Bruno es el impostor: recibe la pista, no la palabra
+    assert subscriber.get_nowait() == ('card', {'round': 1, 'player': 'Bruno', 'is_impostor': True,
+                                                'palabra': None, 'hint': 'felino'})
+    finished = hub.reveal(code, host)
+    assert finished['num_players'] == 3 and finished['num_impostors'] == 1
+    assert hub.reveal(code, host) is None
+    event, results = subscriber.get_nowait()
+    assert event == 'results' and results['impostor_names'] == ['Bruno']
+
+
+def test_hub_only_the_host_starts_rounds_and_stale_rounds_are_rejected():
+    hub = RoomHub()
+    code, host = hub.create_room({})
+    for name in ('Ana', 'Bruno', 'Carla'):
+        hub.join(code, name)
+    with pytest.raises(RoomError):
+        hub.round_state(code, 'no-soy-el-anfitrion')
+    num_players, deck, version = hub.round_state(code, host)
+    hub.join(code, 'Diego')
+    with pytest.raises(RoomChanged):
+        hub.start_round(code, host, num_players, version, {'palabra': 'Gato', 'categoria': 'Animales'}, [0], {}, deck)
+
+
+def test_hub_drops_a_slow_subscriber_with_a_final_event():
+    hub = RoomHub()
+    code, host = hub.create_room({})
+    slow = queue.Queue(maxsize=3)
+    hub.subscribe(code, host, slow)
+    hub.join(code, 'Ana')
+    hub.join(code, 'Bruno')
+    events = [slow.get_nowait()[0] for _ in range(slow.qsize())]
+    assert events == ['players', 'players', DROPPED_EVENT]
+    assert slow not in hub.rooms[code].subscribers
+
+
+def test_room_flow_over_http(app, client, category_names):
+    response = client.post('/room/new', data={'selected_categories': category_names[:1], 'num_impostors': '1'})
+    assert response.status_code == 302
+    code = response.headers['Location'].rsplit('/', 1)[-1]
+
+    players = []
+    for name in ('Ana', 'Bruno', 'Carla'):
+        player = app.test_client()
+        assert player.post('/room', data={'code': code.lower(), 'name': name}).status_code == 302
+        players.append(player)
+    assert 'Carla' in client.get(f'/room/{code}').get_data(as_text=True)
+
+    # Sólo el anfitrión puede empezar
+    assert 'Sólo el anfitrión' in players[0].post(f'/room/{code}/start').get_data(as_text=True)
+    assert client.post(f'/room/{code}/start').status_code == 302
+
+    events = players[0].get(f'/room/{code}/events')
+    assert events.mimetype == 'text/event-stream'
+    stream = events.response
+    chunks = [next(stream) for _ in range(3)]
+    events.close()
+    text = ''.join(chunk.decode() if isinstance(chunk, bytes) else chunk for chunk in chunks)
+    assert 'event: card' in text and '"player": "Ana"' in text
+
+    # Un dispositivo ajeno a la sala no recibe eventos
+    assert app.test_client().get(f'/room/{code}/events').status_code == 403
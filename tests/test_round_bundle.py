@@ -0,0 +1,59 @@
+import pytest
+
+import round_bundle
+
+KEY = round_bundle.bundle_key('secreto')
+WORD = {'categoria': 'Animales', 'palabra': 'Pingüino', 'pistas': ['Frío']}
+
+
+@pytest.fixture
+def bundle():
+    return round_bundle.build_bundle(KEY, 2 ** 63 + 5, ['Ana', 'Beto', 'Caro'], [1], WORD, {1: 'Frío'},
+                                     countdown=180, started_at=1000, hints_enabled=True)
+
+
+def test_seal_round_trip():
+    payload = {'is_impostor': False, 'palabra': 'Pingüino'}
+    sealed = round_bundle.seal(payload)
+    assert 'Ping' not in sealed['data']
+    assert round_bundle.unseal(sealed) == payload
+
+
+def test_cards_and_results(bundle):
+    cards = [round_bundle.unseal(player['card']) for player in bundle['players']]
+    assert cards == [{'is_impostor': False, 'palabra': 'Pingüino'}, {'is_impostor': True, 'hint': 'Frío'},
+                     {'is_impostor': False, 'palabra': 'Pingüino'}]
+    assert round_bundle.unseal(bundle['results']) == {'impostor_names': ['Beto'], 'categoria': 'Animales',
+                                                      'palabra': 'Pingüino'}
+    assert bundle['seed'] == str(2 ** 63 + 5)
+
+
+def test_verify_accepts_the_signed_bundle(bundle):
+    assert round_bundle.verify(KEY, bundle)
+
+
+@pytest.mark.parametrize('field, value', [('num_impostors', 2), ('seed', '1'), ('hints_enabled', False),
+                                          ('started_at', 2000)])
+def test_verify_rejects_tampered_fields(bundle, field, value):
+    assert not round_bundle.verify(KEY, dict(bundle, **{field: value}))
+
+
+def test_verify_rejects_tampered_card(bundle):
+    players = [dict(player) for player in bundle['players']]
+    players[0]['card'] = round_bundle.seal({'is_impostor': True, 'hint': None})
+    assert not round_bundle.verify(KEY, dict(bundle, players=players))
+
+
+def test_verify_rejects_other_key_and_garbage(bundle):
+    assert not round_bundle.verify(round_bundle.bundle_key('otra'), bundle)
+    assert not round_bundle.verify(KEY, dict(bundle, signature=None))
+    assert not round_bundle.verify(KEY, None)
+    assert not round_bundle.verify(KEY, [])
+
+
+def test_verify_max_age(bundle):
+    assert round_bundle.verify(KEY, bundle, max_age=600, now=1500)
+    assert not round_bundle.verify(KEY, bundle, max_age=600, now=1601)
+    # started_at en el futuro: sólo se admite el margen de reloj
+    assert round_bundle.verify(KEY, bundle, max_age=600, now=1000 - round_bundle.CLOCK_SKEW)
+    assert not round_bundle.verify(KEY, bundle, max_age=600, now=1000 - round_bundle.CLOCK_SKEW - 1)
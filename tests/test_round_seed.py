@@ -0,0 +1,75 @@
+import re
+
+import pytest
+
+import round_seed
+
+KEY = round_seed.round_key('clave de pruebas')
+PLAYERS = ['Ana', 'Bruno', 'Carla', 'Diego', 'Eva', 'Fede']
+
+
+def test_same_seed_same_round():
+    for seed in (0, 1, 2 ** 63 + 5):
+        assert round_seed.impostor_indices(KEY, seed, 8, 2) == round_seed.impostor_indices(KEY, seed, 8, 2)
+        assert round_seed.starting_player(KEY, seed, 8) == round_seed.starting_player(KEY, seed, 8)
+        assert round_seed.round_rng(KEY, seed, 'hint', 3).random() == round_seed.round_rng(KEY, seed, 'hint', 3).random()
+
+
+def test_rounds_differ_by_seed_key_and_purpose():
+    rounds = {tuple(sorted(round_seed.impostor_indices(KEY, seed, 8, 2))) for seed in range(200)}
+    # 28 combinaciones posibles: 200 semillas las recorren casi todas
+    assert len(rounds) > 20
+    other_key = round_seed.round_key('otra clave')
+    assert any(round_seed.impostor_indices(KEY, seed, 8, 2) != round_seed.impostor_indices(other_key, seed, 8, 2)
+               for seed in range(10))
+    # Cada propósito (y cada jugador) tiene su propio generador
+    values = {round_seed.round_rng(KEY, 7, purpose, *parts).random()
+              for purpose, parts in (('word', ()), ('hint', (0,)), ('hint', (1,)), ('color', (0,)))}
+    assert len(values) == 4
+
+
+def test_impostors_always_leave_a_civilian():
+    for seed in range(50):
+        impostors = round_seed.impostor_indices(KEY, seed, 3, 5)
+        assert len(impostors) == 2 and len(set(impostors)) == 2
+        assert all(0 <= i < 3 for i in impostors)
+    assert len(round_seed.impostor_indices(KEY, 1, 4, 0)) == 1
+
+
+@pytest.fixture
+def local_round(client, category_names):
+    response = client.post('/setup', data={'player_names': ', '.join(PLAYERS), 'num_impostors': '2',
+                                           'selected_categories': category_names, 'hints_enabled': 'on'})
+    assert response.status_code == 302
+    with client.session_transaction() as sess:
+        return dict(sess)
+
+
+def test_session_keeps_only_the_seed_and_reloads_are_stable(client, local_round):
+    assert 'impostor_indices' not in local_round and 'palabra' not in local_round
+    for _ in PLAYERS:
+        first = client.get('/player').get_data(as_text=True)
+        # Recargar la tarjeta no cambia el color, la pista ni el papel
+        assert client.get('/player').get_data(as_text=True) == first
+        client.post('/next')
+    complete = client.get('/complete').get_data(as_text=True)
+    assert client.get('/complete').get_data(as_text=True) == complete
+
+    key = round_seed.round_key(client.application.secret_key)
+    impostors = round_seed.impostor_indices(key, local_round['seed'], len(PLAYERS), 2)
+    assert ', '.join(PLAYERS[i] for i in impostors) in complete
+    assert PLAYERS[round_seed.starting_player(key, local_round['seed'], len(PLAYERS))] in complete
+
+
+def test_replay_round_reproduces_the_session_round(app, client, local_round):
+    ref = ':'.join(map(str, local_round['word_ref']))
+    result = app.test_cli_runner().invoke(args=['replay-round', str(local_round['seed']), '--players',
+                                                ','.join(PLAYERS), '--impostors', '2', '--word-ref', ref])
+    assert result.exit_code == 0, result.output
+    replayed = [line.split('. ', 1)[1].split()[0] for line in result.output.splitlines() if 'IMPOSTOR' in line]
+    starter = re.search(r'Empieza: (\S+)', result.output).group(1)
+
+    complete = client.get('/complete').get_data(as_text=True)
+    assert len(replayed) == 2
+    assert all(name in complete for name in replayed + [starter])
+    assert local_round['word_ref'][2] in result.output
@@ -0,0 +1,94 @@
+import pytest
+
+import sessions
+
+
+class FakeClock:
+    """Sustituye al módulo time de sessions.py: monotonic() y time() devuelven `now`"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(sessions, 'time', clock)
+    return clock
+
+
+def test_memory_get_returns_copy(clock):
+    backend = sessions.MemorySessionBackend()
+    backend.set('a', {'x': 1}, ttl=60)
+    data = backend.get('a')
+    data['x'] = 2
+    assert backend.get('a') == {'x': 1}
+
+
+def test_memory_ttl_expires(clock):
+    backend = sessions.MemorySessionBackend()
+    backend.set('a', {'x': 1}, ttl=60)
+    clock.now += 61
+    assert backend.get('a') is None
+    assert len(backend) == 0
+
+
+def test_memory_ttl_slides_on_read(clock):
+    backend = sessions.MemorySessionBackend()
+    backend.set('a', {'x': 1}, ttl=60)
+    clock.now += 50
+    assert backend.get('a') == {'x': 1}
+    clock.now += 50
+    assert backend.get('a') == {'x': 1}
+
+
+def test_memory_lru_evicts_least_recently_used(clock):
+    backend = sessions.MemorySessionBackend(max_entries=2)
+    backend.set('a', {'n': 1}, ttl=60)
+    backend.set('b', {'n': 2}, ttl=60)
+    backend.get('a')
+    backend.set('c', {'n': 3}, ttl=60)
+    assert backend.get('b') is None
+    assert backend.get('a') == {'n': 1}
+    assert backend.get('c') == {'n': 3}
+
+
+def test_memory_set_purges_expired(clock):
+    backend = sessions.MemorySessionBackend()
+    backend.set('a', {}, ttl=10)
+    clock.now += 11
+    backend.set('b', {}, ttl=10)
+    assert len(backend) == 1
+
+
+def test_sqlite_round_trip_and_delete(clock, tmp_path):
+    backend = sessions.SQLiteSessionBackend(str(tmp_path / 'sessions.sqlite3'))
+    backend.set('a', {'seed': 2 ** 63, 'ref': ('Animales', 3, 'Gato'), 'bits': b'\x01\x02'}, ttl=60)
+    assert backend.get('a') == {'seed': 2 ** 63, 'ref': ('Animales', 3, 'Gato'), 'bits': b'\x01\x02'}
+    backend.delete('a')
+    assert backend.get('a') is None
+
+
+def test_sqlite_ttl_expires(clock, tmp_path):
+    backend = sessions.SQLiteSessionBackend(str(tmp_path / 'sessions.sqlite3'))
+    backend.set('a', {'x': 1}, ttl=60)
+    clock.now += 59
+    assert backend.get('a') == {'x': 1}
+    clock.now += 2
+    assert backend.get('a') is None
+
+
+def test_sqlite_purges_expired_rows(clock, tmp_path, monkeypatch):
+    monkeypatch.setattr(sessions.SQLiteSessionBackend, 'PURGE_EVERY', 2)
+    backend = sessions.SQLiteSessionBackend(str(tmp_path / 'sessions.sqlite3'))
+    backend.set('old', {}, ttl=10)
+    clock.now += 11
+    backend.set('new', {}, ttl=10)
+    rows = backend._connect().execute('SELECT sid FROM sessions').fetchall()
+    assert rows == [('new',)]
@@ -0,0 +1,41 @@
+import pytest
+
+import app as game
+from catalog import CatalogSnapshot
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    render_setup = game.render_setup
+
+    def counting(shard, snapshot, error=None):
+        calls.append(error)
+        return render_setup(shard, snapshot, error)
+
+    monkeypatch.setattr(game, 'render_setup', counting)
+    game.locales.shard(game.DEFAULT_LOCALE).setup_pages.clear()
+    return calls
+
+
+def test_setup_page_is_rendered_once_per_catalog_version(client, renders, monkeypatch):
+    first = client.get('/setup')
+    second = client.get('/setup')
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert renders == [None]
+
+    # Una versión nueva del catálogo invalida la página en caché
+    catalog = game.locales.shard(game.DEFAULT_LOCALE).catalog
+    current = catalog.snapshot()
+    bumped = CatalogSnapshot(current.version + 1, dict(current.categories), current.loaded_at, 0.0, index=current.index)
+    monkeypatch.setattr(catalog, 'snapshot', lambda: bumped)
+    client.get('/setup')
+    assert renders == [None, None]
+
+
+def test_setup_errors_are_not_cached(client, renders):
+    response = client.post('/setup', data={'player_names': 'Ana, Bruno'})
+    assert 'Debes' in response.get_data(as_text=True)
+    client.get('/setup')
+    assert renders == ['Debes ingresar entre 3 y 20 nombres de jugadores.', None]
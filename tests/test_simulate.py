@@ -0,0 +1,43 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import simulate  # noqa: E402
+from catalog import CatalogSnapshot  # noqa: E402
+
+SIZES = [2, 5, 3]
+
+
+def test_numpy_engine_counts_every_draw():
+    counts = simulate.Counts(6, sum(SIZES), len(SIZES))
+    simulate.simulate_numpy(counts, np.cumsum(SIZES), 6, 2, 30000, np.random.default_rng(7))
+    assert counts.rounds == 30000
+    assert counts.seats.sum() == 2 * 30000
+    assert counts.starters.sum() == counts.words.sum() == counts.categories.sum() == 30000
+    report = simulate.fairness_report(counts, ['A', 'B', 'C'], SIZES, 6, 2)
+    assert report['categorias']['B']['esperada'] == pytest.approx(15000)
+    for name, test in report['pruebas'].items():
+        assert test['p_valor'] > 1e-4, name
+
+
+def test_app_engine_draws_like_the_application():
+    categories = {name: {'categoria': name, 'palabras': [{'palabra': f'{name}{i}'} for i in range(size)]}
+                  for name, size in zip('ABC', SIZES)}
+    snapshot = CatalogSnapshot(1, categories, 0.0, 0.0)
+    counts = simulate.Counts(4, sum(SIZES), len(SIZES))
+    schedule = []
+    simulate.simulate_app(counts, snapshot, ['A', 'B', 'C'], 4, 1, 2000, schedule)
+    assert counts.rounds == 2000 and counts.seats.sum() == 2000
+    words, impostors, starters = schedule[0]
+    assert len(words) == 2000 and impostors.shape == (2000, 1)
+    report = simulate.fairness_report(counts, ['A', 'B', 'C'], SIZES, 4, 1)
+    assert report['pruebas']['palabra']['p_valor'] > 1e-4
+
+
+def test_chi_square_detects_a_biased_draw():
+    statistic, dof, p_value = simulate.chi_square([900, 100], [500, 500])
+    assert dof == 1
+    assert statistic == pytest.approx(640.0)
+    assert p_value < 1e-10
+    assert simulate.chi_square([250, 250], [250, 250])[2] > 0.9
+    assert simulate.chi_square_pvalue(5.0, 0) == 1.0
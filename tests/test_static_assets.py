@@ -0,0 +1,55 @@
+import gzip
+import json
+import re
+
+import pytest
+
+import static_assets
+from static_assets import StaticAssets, minify_css, minify_js
+
+
+def test_minify_css_keeps_strings_intact():
+    css = '/* tema */\nbody {\n    font-family: "Open  Sans", sans-serif;\n    margin: 0 auto;\n}\n'
+    assert minify_css(css) == 'body{font-family:"Open  Sans",sans-serif;margin:0 auto}'
+
+
+def test_minify_js_drops_comments_but_not_urls_in_strings():
+    js = "// inicio\nconst url = 'http://ejemplo.com/a'; /* bloque */\n\n    go(url);\n"
+    assert minify_js(js) == "const url = 'http://ejemplo.com/a';\ngo(url);"
+
+
+@pytest.fixture
+def assets(tmp_path):
+    (tmp_path / 'base.css').write_text('body { color: red; }', encoding='utf-8')
+    (tmp_path / 'notas.txt').write_text('no es un asset', encoding='utf-8')
+    return StaticAssets(str(tmp_path)).load()
+
+
+def test_fingerprint_changes_with_the_content(assets, tmp_path):
+    filename = assets.filename('base.css')
+    assert re.fullmatch(r'base\.[0-9a-f]{12}\.css', filename)
+    assert assets.get(filename).content_type == 'text/css; charset=utf-8'
+    assert list(assets.by_name) == ['base.css']
+    (tmp_path / 'base.css').write_text('body { color: blue; }', encoding='utf-8')
+    assert assets.load().filename('base.css') != filename
+
+
+def test_write_outputs_variants_and_manifest(assets, tmp_path):
+    output = tmp_path / 'static'
+    manifest = assets.write(str(output))
+    filename = manifest['base.css']
+    assert json.loads((output / static_assets.MANIFEST_FILENAME).read_text()) == manifest
+    assert gzip.decompress((output / (filename + '.gz')).read_bytes()) == (output / filename).read_bytes()
+
+
+def test_served_with_immutable_cache_and_conditional_get(client):
+    page = client.get('/setup').get_data(as_text=True)
+    path = re.search(r'href="(/static/base\.[0-9a-f]{12}\.css)"', page).group(1)
+    response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Cache-Control'] == static_assets.CACHE_CONTROL
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    again = client.get(path, headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert again.status_code == 304
+    assert client.get(path).headers.get('Content-Encoding') is None
+    assert client.get('/static/base.000000000000.css').status_code == 404
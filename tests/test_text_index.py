@@ -0,0 +1,73 @@
+import itertools
+
+from text_index import TextIndex, dice, leaks, ngrams, normalize
+
+WORDS = ['Pingüino', 'pinguino', 'Pingüinos', 'Piña', 'Pina', 'Elefante', 'Elefantes', 'Gato', 'Gatos', 'Perro',
+         'Camión', 'Camiones', 'Niño', 'Nino', 'Tren', 'Trenes']
+
+
+def records(words, hints=None):
+    hints = hints or {}
+    return [{'categoria': 'Pruebas', 'palabra': w, 'pistas': hints.get(w, [])} for w in words]
+
+
+def test_normalize_strips_accents_but_keeps_enye():
+    assert normalize('¡Pingüino!') == 'pinguino'
+    assert normalize('  Camión  de BOMBEROS ') == 'camion de bomberos'
+    assert normalize('Piña') == 'piña' != normalize('Pina')
+
+
+def test_leaks_detects_the_word_and_shared_stems():
+    assert leaks('Pingüino', 'un pinguino pequeño')
+    assert leaks('Pingüinos', 'pingüino')
+    assert leaks('Elefante', 'elefantes grises')
+    assert not leaks('Gato', 'felino')
+    assert leaks('Sol', 'girasol')
+    assert not leaks('Ratón', 'rata')
+
+
+def test_duplicates_group_equal_normalized_words():
+    index = TextIndex(records(WORDS))
+    groups = [sorted(WORDS[p] for p in positions) for positions in index.duplicates()]
+    assert groups == [['Pingüino', 'pinguino']]
+
+
+def test_near_duplicates_match_brute_force():
+    index = TextIndex(records(WORDS))
+    for threshold in (0.5, 0.7, 0.8):
+        expected = []
+        for i, j in itertools.combinations(range(len(WORDS)), 2):
+            if index.normalized[i] == index.normalized[j]:
+                continue
+            score = dice(ngrams(index.normalized[i]), ngrams(index.normalized[j]))
+            if score >= threshold:
+                expected.append((score, i, j))
+        expected.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+        assert [(round(s, 9), i, j) for s, i, j in index.near_duplicates(threshold)] == \
+               [(round(s, 9), i, j) for s, i, j in expected]
+
+
+def test_lookup_ranks_exact_matches_first():
+    index = TextIndex(records(WORDS))
+    matches = index.lookup('PINGUINO', threshold=0.7)
+    assert [score for score, position in matches[:2]] == [1.0, 1.0]
+    assert WORDS[matches[2][1]] == 'Pingüinos'
+    assert index.lookup('   ') == []
+
+
+def test_rows_build_the_same_index():
+    rows = records(WORDS)
+    assert TextIndex(rows, rows=iter(rows)).normalized == TextIndex(rows).normalized
+
+
+def test_hint_leaks():
+    index = TextIndex(records(['Gato', 'Perro'], {'Gato': ['felino', 'gato montés'], 'Perro': ['ladra']}))
+    assert index.hint_leaks() == [(0, 'gato montés')]
+
+
+def test_lookup_endpoint(client):
+    data = client.get('/api/v1/words/lookup', query_string={'q': 'zzzz-no-existe', 'hints': 'zzzz, otra'}).get_json()
+    assert data['matches'] == []
+    assert data['leaking_hints'] == ['zzzz']
+    assert client.get('/api/v1/words/lookup').status_code == 400
+    assert client.get('/api/v1/words/lookup', query_string={'q': 'gato', 'threshold': '2'}).status_code == 400
@@ -0,0 +1,56 @@
+import random
+from collections import Counter
+
+import pytest
+
+from word_index import WordIndex
+
+
+def category(name, words):
+    return {'categoria': name, 'palabras': [{'palabra': w, 'pistas': [w.lower()]} for w in words]}
+
+
+@pytest.fixture
+def index():
+    return WordIndex({'Animales': category('Animales', ['Gato', 'Perro']),
+                      'Frutas': category('Frutas', ['Pera', 'Uva', 'Kiwi']),
+                      'Vacía': category('Vacía', [])})
+
+
+def test_positions_walk_the_union_of_selected_categories(index):
+    selected = ['Frutas', 'Animales', 'Vacía']
+    assert index.count(selected) == 5
+    # Las categorías se recorren en orden alfabético, sin importar el orden de la selección
+    assert [index.record_at(selected, p)['palabra'] for p in range(5)] == ['Gato', 'Perro', 'Pera', 'Uva', 'Kiwi']
+    assert index.record_at(['Frutas'], 1) == {'categoria': 'Frutas', 'palabra': 'Uva', 'pistas': ['uva']}
+
+
+def test_empty_or_unknown_selection(index):
+    assert index.count(['Vacía', 'No existe']) == 0
+    assert index.choose(['Vacía']) is None
+    assert index.position([]) is None
+
+
+def test_choose_is_uniform_over_words(index):
+    rng = random.Random(1)
+    counts = Counter(index.choose(['Animales', 'Frutas'], rng)['palabra'] for _ in range(5000))
+    assert set(counts) == {'Gato', 'Perro', 'Pera', 'Uva', 'Kiwi'}
+    # Uniforme por palabra, no por categoría: Gato no sale más que Uva aunque su categoría sea más pequeña
+    assert max(counts.values()) - min(counts.values()) < 250
+
+
+def test_updated_reuses_unchanged_records(index):
+    categories = {'Animales': category('Animales', ['Gato', 'Perro']),
+                  'Frutas': category('Frutas', ['Pera'])}
+    updated = index.updated(categories, changed={'Frutas'})
+    assert updated.word_counts() == {'Animales': 2, 'Frutas': 1}
+    assert updated.records[0] is index.records[0]
+    assert updated.record_at(['Frutas'], 0)['palabra'] == 'Pera'
+
+
+def test_word_ref_resolves_after_the_catalog_moves(index):
+    ref = index.word_ref(index.global_position(['Frutas'], 2))
+    assert ref == ['Frutas', 2, 'Kiwi']
+    moved = WordIndex({'Frutas': category('Frutas', ['Kiwi', 'Pera'])})
+    assert moved.resolve(ref)['palabra'] == 'Kiwi'
+    assert WordIndex({}).resolve(ref) is None
@@ -0,0 +1,165 @@
+"""
+Índice de texto normalizado para encontrar palabras repetidas y pistas que delatan la palabra.
+
+Cada palabra se normaliza (sin tildes, en minúsculas y con la puntuación
+reducida a espacios: "Pingüino" y "pinguino" quedan iguales) y se descompone en
+trigramas de caracteres, que se guardan en un índice invertido.
+
+Para buscar palabras parecidas sólo se consultan los trigramas más raros de la
+consulta: si dos palabras tienen una similitud de Dice >= t, comparten al menos
+ceil(t·|A| / (2 - t)) trigramas, así que alguno de ellos está entre los
+|A| - ese mínimo + 1 más raros (filtro de prefijo). Eso evita comparar cada
+palabra con todas las demás: el informe completo no es cuadrático.
+"""
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+NGRAM_SIZE = 3
+# Similitud de Dice mínima para considerar dos palabras "casi iguales"
+NEAR_DUPLICATE_THRESHOLD = 0.8
+# Una palabra de la pista con al menos esta longitud cuenta como raíz compartida
+MIN_STEM_LENGTH = 4
+
+_NON_ALNUM = re.compile(r'[^0-9a-zñ]+')
+
+
+def normalize(text):
+    """'¡Pingüino!' -> 'pinguino' (sin tildes ni mayúsculas; la ñ se conserva)"""
+    if text.isascii():
+        return _NON_ALNUM.sub(' ', text.lower()).strip()
+    text = text.casefold().replace('ñ', '\0')
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(' ', text.replace('\0', 'ñ')).strip()
+
+
+def ngrams(normalized):
+    padded = f' {normalized} '
+    return frozenset(padded[i:i + NGRAM_SIZE] for i in range(max(1, len(padded) - NGRAM_SIZE + 1)))
+
+
+def dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 1.0
+
+
+def leaks(word, hint):
+    """True si la pista contiene la palabra (o comparten raíz: 'Pingüino' / 'Pingüinos')"""
+    return normalized_leaks(normalize(word), normalize(hint))
+
+
+def normalized_leaks(word, hint):
+    """Como leaks(), con la palabra y la pista ya normalizadas"""
+    if not word or not hint:
+        return False
+    if word in hint or hint in word:
+        return True
+    hint_tokens = hint.split()
+    for token in word.split():
+        if len(token) < MIN_STEM_LENGTH:
+            continue
+        stem = token[:max(MIN_STEM_LENGTH, len(token) - 2)]
+        if any(h.startswith(stem) or (len(h) >= MIN_STEM_LENGTH and token.startswith(h)) for h in hint_tokens):
+            return True
+    return False
+
+
+class TextIndex:
+    """Índice invertido de trigramas sobre las palabras de un snapshot del catálogo"""
+
+    def __init__(self, records, rows=None):
+        # Registros {'categoria', 'palabra', 'pistas'} (cualquier secuencia indexable). `rows` son
+        # los mismos registros en orden para construir el índice de una pasada (p. ej. LazyRecords.scan())
+        self.records = records
+        self.normalized = []
+        self.grams = []
+        # Forma normalizada -> posiciones con esa forma
+        self.exact = defaultdict(list)
+        # Trigrama -> posiciones que lo contienen
+        self.postings = defaultdict(list)
+        if rows is None:
+            rows = (records[position] for position in range(len(records)))
+        for position, record in enumerate(rows):
+            normalized = normalize(record['palabra'])
+            grams = ngrams(normalized)
+            self.normalized.append(normalized)
+            self.grams.append(grams)
+            self.exact[normalized].append(position)
+            for gram in grams:
+                self.postings[gram].append(position)
+
+    def __len__(self):
+        return len(self.normalized)
+
+    def _candidates(self, grams, threshold):
+        """Posiciones que podrían tener similitud >= threshold con `grams` (filtro de prefijo)"""
+        min_overlap = max(1, math.ceil(threshold * len(grams) / (2 - threshold)))
+        rare_first = sorted(grams, key=lambda g: len(self.postings.get(g, ())))
+        candidates = set()
+        for gram in rare_first[:len(grams) - min_overlap + 1]:
+            candidates.update(self.postings.get(gram, ()))
+        return candidates
+
+    def lookup(self, text, threshold=NEAR_DUPLICATE_THRESHOLD, limit=20):
+        """Palabras iguales o parecidas a `text`: [(similitud, posición)] de mayor a menor"""
+        normalized = normalize(text)
+        if not normalized:
+            return []
+        grams = ngrams(normalized)
+        matches = []
+        for position in self._candidates(grams, threshold):
+            score = 1.0 if self.normalized[position] == normalized else dice(grams, self.grams[position])
+            if score >= threshold:
+                matches.append((score, position))
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return matches[:limit]
+
+    def duplicates(self):
+        """Grupos de posiciones con la misma forma normalizada"""
+        return [positions for positions in self.exact.values() if len(positions) > 1]
+
+    def near_duplicates(self, threshold=NEAR_DUPLICATE_THRESHOLD):
+        """
+        Pares (similitud, i, j) de palabras parecidas pero no idénticas una vez
+        normalizadas. Filtro de prefijo por los dos lados: con los trigramas
+        ordenados de más raro a más común, dos palabras parecidas comparten
+        alguno de los primeros de cada una, así que sólo se indexan esos (PPJoin).
+        """
+        def rarity(gram):
+            return len(self.postings[gram]), gram
+
+        all_grams, normalized = self.grams, self.normalized
+        sizes = [len(grams) for grams in all_grams]
+        order = sorted(range(len(all_grams)), key=sizes.__getitem__)
+        # Trigrama -> [(palabra, posición del trigrama en su orden de rareza)]
+        prefix_postings = defaultdict(list)
+        pairs = []
+        for i in order:
+            grams, size = all_grams[i], sizes[i]
+            min_overlap = max(1, math.ceil(threshold * size / (2 - threshold)))
+            prefix = sorted(grams, key=rarity)[:size - min_overlap + 1]
+            seen = set()
+            for my_pos, gram in enumerate(prefix):
+                my_rest = size - my_pos
+                for j, other_pos in prefix_postings[gram]:
+                    if j in seen:
+                        continue
+                    seen.add(j)
+                    other_size = sizes[j]
+                    # Filtro de longitud (las palabras ya indexadas son más cortas o iguales) y de
+                    # posición: éste es el primer trigrama común, así que como mucho comparten
+                    # éste y todos los que quedan detrás en las dos palabras
+                    required = threshold * (size + other_size) / 2
+                    if other_size < min_overlap or min(my_rest, other_size - other_pos) < required:
+                        continue
+                    shared = len(grams & all_grams[j])
+                    if shared >= required and normalized[j] != normalized[i]:
+                        pairs.append((2 * shared / (size + other_size), min(i, j), max(i, j)))
+                prefix_postings[gram].append((i, my_pos))
+        pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+        return pairs
+
+    def hint_leaks(self):
+        """Pares (posición, pista) en los que la pista delata su propia palabra"""
+        return [(position, hint) for position in range(len(self.records))
+                for hint in self.records[position]['pistas'] if normalized_leaks(self.normalized[position], normalize(hint))]
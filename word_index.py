@@ -0,0 +1,136 @@
+"""
+Índice plano de palabras para sortear sin recorrer el catálogo en cada ronda.
+
+Todas las palabras del catálogo se guardan una sola vez en un arreglo plano,
+agrupadas por categoría, junto con el rango (inicio, fin) de cada categoría.
+Para sortear sobre un subconjunto de categorías basta con sus conteos
+acumulados: un entero aleatorio y una búsqueda binaria dan la palabra, sin
+construir listas por petición.
+"""
+import bisect
+import random
+
+# Cuántas combinaciones distintas de categorías se recuerdan por índice
+SELECTION_CACHE_SIZE = 256
+
+
+class WordIndex:
+    """Arreglo plano de palabras con rangos y conteos acumulados por categoría"""
+
+    def __init__(self, categories):
+        # Registros compartidos {'categoria', 'palabra', 'pistas'}: no modificarlos.
+        # Puede ser cualquier secuencia indexable (ver catalog_pack.PackRecords)
+        self.records = []
+        # Categoría -> (inicio, fin) dentro de `records`
+        self.ranges = {}
+        for cat_name, cat in categories.items():
+            self._add_category(cat_name, cat)
+        self._selections = {}
+
+    def _add_category(self, cat_name, cat):
+        start = len(self.records)
+        for word_data in cat.get('palabras', []):
+            self.records.append({
+                'categoria': cat_name,
+                'palabra': word_data['palabra'],
+                'pistas': word_data.get('pistas', [])
+            })
+        self.ranges[cat_name] = (start, len(self.records))
+
+    def updated(self, categories, changed):
+        """
+        Índice para `categories` que reutiliza los registros de este índice para
+        las categorías que no están en `changed` (sólo se recorren las palabras nuevas)
+        """
+        index = WordIndex({})
+        for cat_name, cat in categories.items():
+            if cat_name in changed or cat_name not in self.ranges:
+                index._add_category(cat_name, cat)
+                continue
+            old_start, old_end = self.ranges[cat_name]
+            start = len(index.records)
+            index.records.extend(self.records[old_start:old_end])
+            index.ranges[cat_name] = (start, len(index.records))
+        return index
+
+    @classmethod
+    def from_records(cls, records, ranges):
+        """Crea el índice sobre registros ya agrupados por categoría (p. ej. los del paquete compilado)"""
+        index = cls({})
+        index.records = records
+        index.ranges = ranges
+        return index
+
+    def word_counts(self):
+        """Categoría -> número de palabras"""
+        return {cat_name: end - start for cat_name, (start, end) in self.ranges.items()}
+
+    def __len__(self):
+        return len(self.records)
+
+    def _selection(self, selected_categories):
+        """Devuelve (inicios, acumulados) de las categorías seleccionadas"""
+        key = frozenset(selected_categories)
+        plan = self._selections.get(key)
+        if plan is None:
+            starts, cumulative, total = [], [], 0
+            for cat_name in sorted(key):
+                if cat_name in self.ranges:
+                    start, end = self.ranges[cat_name]
+                    if end > start:
+                        total += end - start
+                        starts.append(start)
+                        cumulative.append(total)
+            plan = (starts, cumulative)
+            if len(self._selections) >= SELECTION_CACHE_SIZE:
+                self._selections.clear()
+            self._selections[key] = plan
+        return plan
+
+    def count(self, selected_categories):
+        """Número de palabras disponibles en las categorías seleccionadas"""
+        cumulative = self._selection(selected_categories)[1]
+        return cumulative[-1] if cumulative else 0
+
+    def global_position(self, selected_categories, position):
+        """Posición en `records` de la palabra número `position` de la unión de categorías seleccionadas"""
+        starts, cumulative = self._selection(selected_categories)
+        slot = bisect.bisect_right(cumulative, position)
+        return starts[slot] + position - (cumulative[slot - 1] if slot else 0)
+
+    def record_at(self, selected_categories, position):
+        """Devuelve la palabra número `position` de la unión de categorías seleccionadas"""
+        return self.records[self.global_position(selected_categories, position)]
+
+    def word_ref(self, position):
+        """Referencia corta y estable entre procesos de la palabra en `position`: [categoría, posición, palabra]"""
+        record = self.records[position]
+        return [record['categoria'], position - self.ranges[record['categoria']][0], record['palabra']]
+
+    def resolve(self, word_ref):
+        """
+        Palabra de una referencia de word_ref(). Si el catálogo cambió y la
+        posición ya no corresponde, se busca por nombre dentro de la categoría (o None)
+        """
+        categoria, offset, palabra = word_ref
+        start, end = self.ranges.get(categoria, (0, 0))
+        if 0 <= offset < end - start and self.records[start + offset]['palabra'] == palabra:
+            return self.records[start + offset]
+        for position in range(start, end):
+            if self.records[position]['palabra'] == palabra:
+                return self.records[position]
+        return None
+
+    def position(self, selected_categories, rng=random):
+        """Posición al azar (uniforme) en la unión de categorías seleccionadas, o None si no hay palabras"""
+        total = self.count(selected_categories)
+        if not total:
+            return None
+        return rng.randrange(total)
+
+    def choose(self, selected_categories, rng=random):
+        """Selecciona una palabra al azar (uniforme) de las categorías seleccionadas"""
+        position = self.position(selected_categories, rng)
+        if position is None:
+            return None
+        return self.record_at(selected_categories, position)